@@ -15,6 +15,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
 try:
+    from omega_zsh.core.commands import find_command
     from omega_zsh.core.doctor import run_doctor, run_doctor_fix
     from omega_zsh.core.system_info import (
         get_active_items,
@@ -24,6 +25,7 @@ try:
         inspect_plugin as inspect_plugin_core,
     )
 except ImportError:
+    find_command = which
 
     def run_doctor():
         return {"overall": "missing", "checks": []}
@@ -72,7 +74,7 @@ def get_app_version() -> str:
 
 
 def require_command(command: str, install_hint: str | None = None) -> str | None:
-    path = which(command)
+    path = find_command(command)
     if path:
         return path
 
@@ -1,14 +1,32 @@
+import hashlib
+import json
+import shlex
 from dataclasses import dataclass, field
 from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from typing import Any
 
-from .constants import is_binary_tool, unknown_plugin_ids, valid_selected_plugins
+from .banner import BANNER_HEADERS, banner_path, write_banner
+from .compdump import compdump_path, refresh_compdump
+from .constants import (
+    LOAD_LAST_PLUGINS,
+    PLUGIN_ENTRY_COMMANDS,
+    is_binary_tool,
+    load_strategy,
+    unknown_plugin_ids,
+    valid_selected_plugins,
+)
+from .direct_load import resolve_direct_load
 from .figlet import FigletManager
+from .fork_budget import analyze_fork_budget, format_fork_budget
 from .generator import ConfigGenerator
-from .manifest import record_managed_file, require_managed_or_absent
+from .header_cache import FASTFETCH_SNAPSHOT_COMMAND, header_cache_path, refresh_header_cache
+from .manifest import ManifestTransaction
 from .operations import write_operation_log
+from .precompile import zcompile_targets
+from .shell import zcompile_files
 from .state import AppState, is_safe_minimal_state
+from .tool_init import refresh_tool_init_cache, tool_init_hooks
 
 
 @dataclass
@@ -20,6 +38,8 @@ class ApplyResult:
     errors: list[str] = field(default_factory=list)
     dry_run: bool = False
     preview: str = ""
+    unchanged: bool = False
+    fork_budget: dict[str, Any] = field(default_factory=dict)
 
 
 def get_app_version() -> str:
@@ -39,18 +59,81 @@ def build_header_command(state: AppState) -> str:
     return ""
 
 
-def build_config_context(context: Any, state: AppState) -> dict[str, Any]:
+def split_config_paths(context: Any) -> list[Path]:
+    """.zshenv and .zprofile next to the managed .zshrc, in write order."""
+    return [context.zshrc_path.with_name(".zshenv"), context.zshrc_path.with_name(".zprofile")]
+
+
+def build_config_context(
+    context: Any, state: AppState, split_env: bool | None = None
+) -> dict[str, Any]:
+    """Template context for the config files.
+
+    `split_env` overrides `state.split_config`; apply turns it off when
+    .zshenv/.zprofile belong to the user, so the environment stays in .zshrc.
+    """
     selected_plugins = valid_selected_plugins(state.selected_plugins, state.allowed_custom_plugins)
     safe_minimal = is_safe_minimal_state(state)
+    active_tools = [] if safe_minimal else [p for p in selected_plugins if is_binary_tool(p)]
+    header_cmd = "" if safe_minimal else build_header_command(state)
+    header_cache = None
+    if header_cmd and state.selected_header == "fastfetch" and state.header_cache_ttl > 0:
+        # Snapshot ANSI: el arranque solo lo imprime; fastfetch corre desacoplado.
+        header_cache = {
+            "path": str(header_cache_path(context.home / ".omega-zsh")),
+            "ttl": state.header_cache_ttl,
+            "command": shlex.join(FASTFETCH_SNAPSHOT_COMMAND),
+            "refresh": not state.zero_fork,
+        }
+    header_banner = None
+    if header_cmd and state.selected_header in BANNER_HEADERS:
+        # Banner pre-renderizado en apply; el comando en vivo queda como respaldo.
+        header_banner = str(banner_path(context.home / ".omega-zsh"))
+    # Solo fastfetch en vivo (TTL 0) ejecuta un binario externo en cada arranque.
+    header_skipped = (
+        bool(header_cmd) and state.zero_fork and header_cache is None and header_banner is None
+    )
+    plugins = [] if safe_minimal else [p for p in selected_plugins if not is_binary_tool(p)]
+    strategies = {p: load_strategy(p, state.plugin_load_strategies) for p in plugins}
+    deferred = sorted(
+        (p for p in plugins if strategies[p] == "deferred"), key=lambda p: p in LOAD_LAST_PLUGINS
+    )
+    on_first_use = [
+        {"plugin": p, "commands": PLUGIN_ENTRY_COMMANDS[p]}
+        for p in plugins
+        if strategies[p] == "on-first-use"
+    ]
+    lazy = [p for p in plugins if strategies[p] != "eager"]
+    direct_load = None
+    if state.direct_load and not safe_minimal and (context.omz_dir / "oh-my-zsh.sh").is_file():
+        direct_load = resolve_direct_load(
+            context.omz_dir,
+            plugins,
+            [state.selected_theme, state.selected_root_theme],
+            [Path(link) for link, _ in theme_link_plan(context.assets_dir, context.omz_dir)],
+            lazy=lazy,
+        )
     return {
         "version": get_app_version(),
         "omz_dir": str(context.omz_dir),
         "user_theme": state.selected_theme,
         "root_theme": state.selected_root_theme,
-        "plugins": [] if safe_minimal else [p for p in selected_plugins if not is_binary_tool(p)],
-        "header_cmd": "" if safe_minimal else build_header_command(state),
+        "plugins": plugins,
+        "eager_plugins": [p for p in plugins if strategies[p] == "eager"],
+        "lazy_plugins": lazy,
+        "deferred_plugins": deferred,
+        "on_first_use_plugins": on_first_use,
+        "direct_load": direct_load,
+        "compdump": str(compdump_path(context.home / ".omega-zsh")),
+        "header_cmd": "" if header_skipped else header_cmd,
+        "header_skipped": header_skipped,
+        "header_cache": header_cache,
+        "header_banner": header_banner,
+        "zero_fork": state.zero_fork,
+        "split_env": state.split_config if split_env is None else split_env,
         "is_termux": context.is_termux,
-        "active_tools": [] if safe_minimal else [p for p in selected_plugins if is_binary_tool(p)],
+        "active_tools": active_tools,
+        "tool_inits": tool_init_hooks(context.home / ".omega-zsh", active_tools),
         "safe_minimal": safe_minimal,
         "default_user": "",
         "personal_zsh": str(context.home / ".omega-zsh" / "personal.zsh"),
@@ -59,8 +142,15 @@ def build_config_context(context: Any, state: AppState) -> dict[str, Any]:
 
 
 def link_omega_themes(
-    assets_dir: Path, omz_dir: Path, manifest_path: Path | None = None
+    assets_dir: Path,
+    omz_dir: Path,
+    manifest_path: Path | None = None,
+    manifest: ManifestTransaction | None = None,
 ) -> list[str]:
+    if manifest is None and manifest_path is not None:
+        with ManifestTransaction(manifest_path) as own:
+            return link_omega_themes(assets_dir, omz_dir, manifest=own)
+
     omega_themes_dir = assets_dir / "themes"
     warnings: list[str] = []
     if not (omz_dir / "oh-my-zsh.sh").exists():
@@ -75,8 +165,7 @@ def link_omega_themes(
         link = custom_themes / theme_file.name
         metadata = {"source": str(theme_file)}
         try:
-            if manifest_path and not require_managed_or_absent(
-                manifest_path,
+            if manifest and not manifest.require_managed_or_absent(
                 link,
                 "theme_symlink",
                 metadata,
@@ -85,36 +174,121 @@ def link_omega_themes(
                 continue
             if link.is_symlink():
                 if link.resolve(strict=False) == theme_file.resolve(strict=False):
-                    if manifest_path:
-                        record_managed_file(
-                            manifest_path,
-                            link,
-                            "theme_symlink",
-                            "verified",
-                            metadata,
-                        )
+                    if manifest:
+                        manifest.record(link, "theme_symlink", "verified", metadata)
                     continue
                 link.unlink()
             link.symlink_to(theme_file)
-            if manifest_path:
-                record_managed_file(
-                    manifest_path,
-                    link,
-                    "theme_symlink",
-                    "created",
-                    metadata,
-                )
+            if manifest:
+                manifest.record(link, "theme_symlink", "created", metadata)
         except Exception as exc:
             warnings.append(f"No se pudo crear symlink para {theme_file.name}: {exc}")
     return warnings
 
 
+def theme_link_plan(assets_dir: Path, omz_dir: Path) -> list[tuple[str, str]]:
+    """Return the (link, target) pairs that link_omega_themes would manage."""
+    omega_themes_dir = assets_dir / "themes"
+    if not (omz_dir / "oh-my-zsh.sh").exists() or not omega_themes_dir.exists():
+        return []
+    custom_themes = omz_dir / "custom" / "themes"
+    return sorted(
+        (str(custom_themes / theme_file.name), str(theme_file))
+        for theme_file in omega_themes_dir.glob("*.zsh-theme")
+    )
+
+
+def config_fingerprint(
+    content: str,
+    link_plan: list[tuple[str, str]],
+    split_files: dict[Path, str] | None = None,
+) -> str:
+    """Hash the rendered .zshrc together with the theme symlink plan.
+
+    `split_files` (.zshenv/.zprofile) are folded in only when present, so
+    fingerprints of non-split applies stay the same.
+    """
+    digest = hashlib.sha256(content.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(link_plan).encode("utf-8"))
+    for path, split_content in sorted((split_files or {}).items()):
+        digest.update(b"\0")
+        digest.update(f"{path}\0{split_content}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _links_in_place(link_plan: list[tuple[str, str]]) -> bool:
+    for link, target in link_plan:
+        link_path = Path(link)
+        if not link_path.is_symlink():
+            return False
+        if link_path.resolve(strict=False) != Path(target).resolve(strict=False):
+            return False
+    return True
+
+
+def config_unchanged(
+    context: Any,
+    fingerprint: str,
+    link_plan: list[tuple[str, str]],
+    manifest: ManifestTransaction | None = None,
+    split_files: dict[Path, str] | None = None,
+) -> bool:
+    """True when ~/.zshrc, the split files and theme links match a previous apply."""
+    if manifest is None:
+        manifest = ManifestTransaction(context.omega_dir / "manifest.json")
+        manifest.load()
+    entry = manifest.get(context.zshrc_path)
+    if entry is None or entry.get("kind") != "config":
+        return False
+    metadata = entry.get("metadata") if isinstance(entry.get("metadata"), dict) else {}
+    if metadata.get("fingerprint") != fingerprint:
+        return False
+    try:
+        current = context.zshrc_path.read_bytes()
+    except OSError:
+        return False
+    if hashlib.sha256(current).hexdigest() != metadata.get("sha256"):
+        return False
+    for path, split_content in (split_files or {}).items():
+        try:
+            if path.read_bytes() != split_content.encode("utf-8"):
+                return False
+        except OSError:
+            return False
+    return _links_in_place(link_plan)
+
+
 def render_config(context: Any, state: AppState) -> str:
     """Render .zshrc content without touching the filesystem."""
     generator = ConfigGenerator(context.assets_dir / "templates")
     return generator.render_zshrc(build_config_context(context, state))
 
 
+def render_split_config(
+    generator: ConfigGenerator, config_context: dict[str, Any], paths: list[Path]
+) -> dict[Path, str]:
+    """Render .zshenv and .zprofile for `paths`, as returned by split_config_paths."""
+    if not config_context["split_env"]:
+        return {}
+    zshenv, zprofile = paths
+    return {
+        zshenv: generator.render_zshenv(config_context),
+        zprofile: generator.render_zprofile(config_context),
+    }
+
+
+def _split_config_owner_warning(context: Any, manifest: ManifestTransaction) -> str:
+    foreign = [
+        str(path)
+        for path in split_config_paths(context)
+        if not manifest.require_managed_or_absent(path, "config")
+    ]
+    if not foreign:
+        return ""
+    return "Archivos no gestionados por Omega; el entorno sigue en .zshrc: " + ", ".join(foreign)
+
+
 def preview_config(context: Any, state: AppState) -> ApplyResult:
     """Return the rendered config and planned paths without writing files."""
     warnings = []
@@ -125,15 +299,20 @@ def preview_config(context: Any, state: AppState) -> ApplyResult:
         warnings.append(f"Oh My Zsh no encontrado en {context.omz_dir}; se omitió el link de temas")
     content = render_config(context, state)
     planned = [str(context.zshrc_path)]
+    if state.split_config:
+        planned.extend(str(path) for path in split_config_paths(context))
     if not warnings:
         planned.append(str(context.omz_dir / "custom" / "themes"))
+    fork_budget = analyze_fork_budget(content)
     return ApplyResult(
         True,
-        f"Preview apply: se renderizarían {len(content)} bytes hacia {context.zshrc_path}.",
+        f"Preview apply: se renderizarían {len(content)} bytes hacia {context.zshrc_path} "
+        f"({format_fork_budget(fork_budget)} al iniciar).",
         changed=planned,
         warnings=warnings,
         dry_run=True,
         preview=content,
+        fork_budget=fork_budget,
     )
 
 
@@ -152,13 +331,81 @@ def apply_config(context: Any, state: AppState, dry_run: bool = False) -> ApplyR
         if dry_run:
             return preview_config(context, state)
 
-        if not warnings:
-            warnings = link_omega_themes(
-                context.assets_dir,
-                context.omz_dir,
-                context.omega_dir / "manifest.json",
+        link_plan = [] if warnings else theme_link_plan(context.assets_dir, context.omz_dir)
+        with ManifestTransaction(context.omega_dir / "manifest.json") as manifest:
+            split_warning = ""
+            if state.split_config:
+                # Nunca se pisa un .zshenv/.zprofile del usuario.
+                split_warning = _split_config_owner_warning(context, manifest)
+            config_context = build_config_context(
+                context, state, split_env=state.split_config and not split_warning
+            )
+            content = generator.render_zshrc(config_context)
+            split_files = render_split_config(
+                generator, config_context, split_config_paths(context)
+            )
+            if config_context["direct_load"]:
+                # Antes del atajo sin cambios: el fpath puede cambiar sin tocar el .zshrc.
+                dump = refresh_compdump(context.omega_dir, config_context["direct_load"]["fpath"])
+                if dump is not None:
+                    manifest.record(dump, "compdump", "generated")
+                    for compiled in zcompile_files([dump]):
+                        manifest.record(compiled, "zcompile", "generated")
+            if config_context["header_cache"]:
+                # Con TTL; en zero-fork solo apply lo renueva, también sin cambios de config.
+                header = refresh_header_cache(context.omega_dir, state.header_cache_ttl)
+                if header is not None:
+                    manifest.record(header, "header_cache", "generated")
+            if config_context["header_banner"]:
+                # El .zshrc zero-fork no lleva texto ni fuente: el banner cambia sin tocarlo.
+                banner = write_banner(context.omega_dir, state)
+                if banner is not None:
+                    manifest.record(banner, "header_banner", "generated")
+            fingerprint = config_fingerprint(content, link_plan, split_files)
+            if config_unchanged(context, fingerprint, link_plan, manifest, split_files):
+                # No-op: sin escrituras, sin backups y sin lanzar `zsh -n`.
+                return ApplyResult(
+                    True,
+                    "Configuración sin cambios; no se escribió nada.",
+                    warnings=(warnings + [split_warning]) if split_warning else warnings,
+                    unchanged=True,
+                )
+
+            if not warnings:
+                warnings = link_omega_themes(context.assets_dir, context.omz_dir, manifest=manifest)
+            if split_warning:
+                warnings.append(split_warning)
+            if config_context["direct_load"]:
+                # oh-my-zsh.sh crea este directorio al arrancar; en carga directa lo hace apply.
+                cache_dir = Path(config_context["direct_load"]["cache_dir"])
+                (cache_dir / "completions").mkdir(parents=True, exist_ok=True)
+            for cache in refresh_tool_init_cache(context.omega_dir, config_context["active_tools"]):
+                manifest.record(cache, "tool_init_cache", "generated")
+            # .zshenv/.zprofile primero: si fallan, .zshrc sigue con el entorno anterior.
+            ok = all(
+                generator.generate_config_file(
+                    path,
+                    split_content,
+                    {"sha256": hashlib.sha256(split_content.encode("utf-8")).hexdigest()},
+                    manifest,
+                    context.omega_dir,
+                )
+                for path, split_content in split_files.items()
+            ) and generator.generate_zshrc(
+                context.zshrc_path,
+                config_context,
+                content=content,
+                metadata={
+                    "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                    "fingerprint": fingerprint,
+                },
+                manifest=manifest,
+                omega_dir=context.omega_dir,
             )
-        ok = generator.generate_zshrc(context.zshrc_path, build_config_context(context, state))
+            if ok:
+                # Compilado fuera del arranque: el .zshrc ya no lleva lógica de zcompile.
+                for compiled in zcompile_files(zcompile_targets(context, state)):
+                    manifest.record(compiled, "zcompile", "generated")
         if not ok:
             result = ApplyResult(
                 False,
@@ -168,18 +415,17 @@ def apply_config(context: Any, state: AppState, dry_run: bool = False) -> ApplyR
             )
             _log_apply(context, result)
             return result
+        changed = [*(str(path) for path in split_files), str(context.zshrc_path)]
         if warnings:
             result = ApplyResult(
                 True,
                 "Configuración actualizada con advertencias: " + "; ".join(warnings),
-                changed=[str(context.zshrc_path)],
+                changed=changed,
                 warnings=warnings,
             )
             _log_apply(context, result)
             return result
-        result = ApplyResult(
-            True, "Configuración actualizada con éxito.", changed=[str(context.zshrc_path)]
-        )
+        result = ApplyResult(True, "Configuración actualizada con éxito.", changed=changed)
         _log_apply(context, result)
         return result
     except Exception as exc:
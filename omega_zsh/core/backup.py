@@ -1,47 +1,460 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
+from fnmatch import fnmatchcase
 from pathlib import Path
-from shutil import copy2
+from shutil import copy2, copystat
+from typing import Callable, Iterator
 
+from .shell import zsh_identity, zwc_path
 
-def create_backup(path: Path, backup_dir: Path | None = None) -> Path | None:
-    """Create a timestamped backup for an existing file."""
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plataformas sin fcntl
+    fcntl = None
+
+HASH_CHUNK_BYTES = 1024 * 1024
+OBJECTS_DIR_NAME = "objects"
+# Directorios de backups que apuntan a un almacén; el GC los recorre todos.
+ROOTS_FILE_NAME = "roots"
+LOCK_FILE_NAME = ".lock"
+INDEX_FILE_NAME = "index.jsonl"
+# Se compacta cuando las líneas muertas superan a las vivas más este margen.
+INDEX_COMPACT_SLACK = 64
+# ioctl FICLONE de Linux (_IOW(0x94, 9, int)): reflink en btrfs, xfs, bcachefs...
+FICLONE = 0x40049409
+COPY_RANGE_CHUNK_BYTES = 64 * 1024 * 1024
+# Los blobs se comparten entre backups: nunca deben poder editarse en sitio.
+BLOB_MODE = 0o444
+RESTORE_MODE = 0o644
+BACKUP_STAMP_RE = re.compile(r"\.(\d{8}-\d{6})(?:\.\d+)?\.bak$")
+
+
+@dataclass
+class BackupRecord:
+    path: Path
+    source: str
+    timestamp: float
+    size: int
+    sha256: str
+    validated: bool | None = None
+    validated_with: str = ""
+    # Cómo llegó el contenido: "dedup" (blob ya existente) o el método de copy_file.
+    copy_method: str = ""
+
+
+def object_store_dir(backup_dir: Path) -> Path:
+    return backup_dir / OBJECTS_DIR_NAME
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    if fcntl is None:
+        return False
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            # Sin CoW (ext4, tmpfs, otro sistema de archivos): el destino queda vacío.
+            return False
+    return True
+
+
+def _copy_range(source: Path, target: Path) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        return False
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            while os.copy_file_range(src.fileno(), dst.fileno(), COPY_RANGE_CHUNK_BYTES):
+                pass
+        except OSError:
+            return False
+    return True
+
+
+def copy_file(source: Path, target: Path) -> str:
+    """Copy content and metadata with the cheapest mechanism available.
+
+    Tries a `FICLONE` reflink (shared extents, constant time on CoW
+    filesystems), then `os.copy_file_range` (in-kernel copy, server-side
+    on NFS), then `shutil.copy2`. Returns the name of the path used:
+    "reflink", "copy_file_range" or "copy2".
+    """
+    for method, copier in (("reflink", _reflink), ("copy_file_range", _copy_range)):
+        try:
+            copied = copier(source, target)
+        except OSError:
+            copied = False
+        if copied:
+            copystat(source, target)
+            break
+    else:
+        method = "copy2"
+        copy2(source, target)
+    logging.debug("Copiado %s -> %s con %s", source, target, method)
+    return method
+
+
+def _blob_path(store: Path, digest: str) -> Path:
+    return store / digest[:2] / digest
+
+
+def _register_root(store: Path, backup_dir: Path) -> None:
+    root = os.path.relpath(backup_dir, store)
+    roots_file = store / ROOTS_FILE_NAME
+    try:
+        roots = roots_file.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        roots = []
+    if root not in roots:
+        with open(roots_file, "a", encoding="utf-8") as handle:
+            handle.write(root + "\n")
+
+
+@contextmanager
+def _store_lock(store: Path) -> Iterator[None]:
+    """Serialize writers and GC of a store across processes (flock)."""
+    store.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(store / LOCK_FILE_NAME, "a", encoding="utf-8") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def store_blob(path: Path, store: Path) -> tuple[Path, str]:
+    """Put `path` in the content-addressed store; identical content is stored once.
+
+    Hashing is the only work when the blob already exists. A new blob is
+    copied to a temporary file and named after the hash of that copy, so it
+    always matches its name even if `path` changes meanwhile. Returns the
+    blob and "dedup" or the `copy_file` method that wrote it.
+    """
+    blob = _blob_path(store, file_sha256(path))
+    if blob.is_file():
+        return blob, "dedup"
+    store.mkdir(parents=True, exist_ok=True)
+    temp_path = store / f".{os.getpid()}.{blob.name}.tmp"
+    try:
+        method = copy_file(path, temp_path)
+        temp_path.chmod(BLOB_MODE)
+        blob = _blob_path(store, file_sha256(temp_path))
+        blob.parent.mkdir(exist_ok=True)
+        temp_path.replace(blob)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return blob, method
+
+
+def backup_index_path(backup_dir: Path) -> Path:
+    return backup_dir / INDEX_FILE_NAME
+
+
+def _append_index(backup_dir: Path, *entries: dict) -> None:
+    lines = "".join(json.dumps(entry, sort_keys=True) + "\n" for entry in entries)
+    try:
+        with open(backup_index_path(backup_dir), "a", encoding="utf-8") as handle:
+            handle.write(lines)
+    except OSError as exc:
+        logging.warning("No se pudo actualizar el índice de backups: %s", exc)
+
+
+def _add_entry(record: BackupRecord) -> dict:
+    return {
+        "op": "add",
+        "name": record.path.name,
+        "source": record.source,
+        "timestamp": record.timestamp,
+        "size": record.size,
+        "sha256": record.sha256,
+        "copy": record.copy_method,
+    }
+
+
+def _validated_entry(record: BackupRecord) -> dict:
+    return {
+        "op": "validated",
+        "name": record.path.name,
+        "valid": record.validated,
+        "zsh": record.validated_with,
+    }
+
+
+def _scan_record(path: Path) -> BackupRecord:
+    match = BACKUP_STAMP_RE.search(path.name)
+    try:
+        timestamp = datetime.strptime(match.group(1), "%Y%m%d-%H%M%S").timestamp()
+    except (AttributeError, ValueError):
+        timestamp = path.lstat().st_mtime
+    link = os.readlink(path) if path.is_symlink() else ""
+    digest = Path(link).name if re.fullmatch(r"[0-9a-f]{64}", Path(link).name) else ""
+    return BackupRecord(
+        path=path,
+        source="",
+        timestamp=timestamp,
+        size=path.stat().st_size,
+        sha256=digest or file_sha256(path),
+    )
+
+
+def _write_index(backup_dir: Path, records: list[BackupRecord]) -> None:
+    index = backup_index_path(backup_dir)
+    temp_path = index.with_suffix(".tmp")
+    entries = []
+    for record in records:
+        entries.append(_add_entry(record))
+        if record.validated is not None:
+            entries.append(_validated_entry(record))
+    try:
+        temp_path.write_text(
+            "".join(json.dumps(entry, sort_keys=True) + "\n" for entry in entries),
+            encoding="utf-8",
+        )
+        temp_path.replace(index)
+    except OSError as exc:
+        temp_path.unlink(missing_ok=True)
+        logging.warning("No se pudo reescribir el índice de backups: %s", exc)
+
+
+def _rescan_index(backup_dir: Path) -> list[BackupRecord]:
+    records = []
+    for path in backup_dir.glob("*.bak"):
+        try:
+            records.append(_scan_record(path))
+        except OSError:
+            continue
+    records.sort(key=lambda record: record.timestamp)
+    _write_index(backup_dir, records)
+    return records
+
+
+def read_backup_index(backup_dir: Path) -> list[BackupRecord]:
+    """Replay the append-only index of a backup directory, oldest entry first.
+
+    A directory without index (older versions, hand-made copies) is scanned
+    once and the index is written from the result; after that no listing
+    touches the directory entries.
+    """
+    index = backup_index_path(backup_dir)
+    try:
+        lines = index.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return _rescan_index(backup_dir) if backup_dir.is_dir() else []
+    except OSError:
+        return []
+    records: dict[str, BackupRecord] = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            name = entry["name"]
+            if entry["op"] == "add":
+                records[name] = BackupRecord(
+                    path=backup_dir / name,
+                    source=str(entry.get("source", "")),
+                    timestamp=float(entry["timestamp"]),
+                    size=int(entry.get("size", 0)),
+                    sha256=str(entry.get("sha256", "")),
+                    copy_method=str(entry.get("copy", "")),
+                )
+            elif entry["op"] == "remove":
+                records.pop(name, None)
+            elif entry["op"] == "validated" and name in records:
+                records[name].validated = bool(entry["valid"])
+                records[name].validated_with = str(entry.get("zsh", ""))
+        except (ValueError, KeyError, TypeError):
+            # Una línea truncada (corte a mitad de escritura) no invalida el resto.
+            continue
+    live = list(records.values())
+    if len(lines) > 2 * len(live) + INDEX_COMPACT_SLACK:
+        _write_index(backup_dir, live)
+    return live
+
+
+def list_backups(backup_dir: Path, file_name: str) -> list[BackupRecord]:
+    """Indexed backups of `file_name` in `backup_dir`, newest first."""
+    pattern = f"{file_name}.*.bak"
+    records = [
+        record for record in read_backup_index(backup_dir) if fnmatchcase(record.path.name, pattern)
+    ]
+    records.reverse()
+    records.sort(key=lambda record: record.timestamp, reverse=True)
+    return records
+
+
+def existing_backups(records: list[BackupRecord]) -> list[BackupRecord]:
+    """Drop records whose file disappeared, logging a `remove` for each one."""
+    existing = []
+    for record in records:
+        if os.path.exists(record.path):
+            existing.append(record)
+        else:
+            _append_index(record.path.parent, {"op": "remove", "name": record.path.name})
+    return existing
+
+
+def iter_valid_backups(
+    records: list[BackupRecord], validator: Callable[[Path], tuple[bool, str]]
+) -> Iterator[BackupRecord]:
+    """Yield the records whose content passes `validator`, in the given order.
+
+    The verdict is appended to the index together with the zsh build that
+    produced it, so each backup is parsed once per zsh binary. Entries whose
+    file disappeared are dropped from the index on the way.
+    """
+    identity = zsh_identity()
+    for record in existing_backups(records):
+        if identity is not None and record.validated_with == identity:
+            valid = bool(record.validated)
+        else:
+            valid, _ = validator(record.path)
+            if identity is not None:
+                record.validated, record.validated_with = valid, identity
+                _append_index(record.path.parent, _validated_entry(record))
+        if valid:
+            yield record
+
+
+def create_backup(
+    path: Path, backup_dir: Path | None = None, store: Path | None = None
+) -> Path | None:
+    """Create a timestamped backup for an existing file and return its path."""
+    record = backup_file(path, backup_dir, store)
+    return record.path if record else None
+
+
+def backup_file(
+    path: Path, backup_dir: Path | None = None, store: Path | None = None
+) -> BackupRecord | None:
+    """Create a timestamped backup and return its index record.
+
+    The backup is a relative symlink into a content-addressed object store
+    (`<backup_dir>/objects` unless `store` is shared between directories),
+    so readers see a regular file and unchanged content is never rewritten.
+    `copy_method` in the record tells how the content was stored.
+    """
     if not path.exists() or not path.is_file():
         return None
 
     target_dir = backup_dir or path.parent / ".omega-backups"
     target_dir.mkdir(parents=True, exist_ok=True)
+    if not backup_index_path(target_dir).exists():
+        _rescan_index(target_dir)
+    store = store or object_store_dir(target_dir)
     stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     backup_path = target_dir / f"{path.name}.{stamp}.bak"
     counter = 1
-    while backup_path.exists():
+    while os.path.lexists(backup_path):
         backup_path = target_dir / f"{path.name}.{stamp}.{counter}.bak"
         counter += 1
 
-    copy2(path, backup_path)
-    return backup_path
+    # Bajo el lock, el GC no puede borrar el blob antes de que exista el enlace.
+    with _store_lock(store):
+        blob, method = store_blob(path, store)
+        _register_root(store, target_dir)
+        try:
+            backup_path.symlink_to(os.path.relpath(blob, target_dir))
+        except OSError:
+            # Sin symlinks (p. ej. almacenamiento compartido de Android): copia completa.
+            method = copy_file(blob, backup_path)
+    record = BackupRecord(
+        path=backup_path,
+        source=str(path),
+        timestamp=time.time(),
+        size=blob.stat().st_size,
+        sha256=blob.name,
+        copy_method=method,
+    )
+    _append_index(target_dir, _add_entry(record))
+    return record
+
+
+def collect_garbage(store: Path) -> list[Path]:
+    """Remove blobs no backup symlink in any registered directory points to."""
+    if not store.is_dir():
+        return []
+    with _store_lock(store):
+        return _collect_garbage(store)
+
 
+def _collect_garbage(store: Path) -> list[Path]:
+    try:
+        roots = (store / ROOTS_FILE_NAME).read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        # Sin la lista de raíces no se sabe qué blobs siguen en uso: no se borra nada.
+        logging.warning("GC de backups omitido, no se pudo leer %s: %s", ROOTS_FILE_NAME, exc)
+        return []
+    referenced = set()
+    for root in {os.pardir, *roots}:
+        root_dir = Path(os.path.normpath(store / root))
+        if not root_dir.is_dir():
+            continue
+        for entry in root_dir.glob("*.bak"):
+            if entry.is_symlink():
+                referenced.add(Path(os.path.normpath(entry.parent / os.readlink(entry))))
+    removed = []
+    for blob in store.glob("??/*"):
+        if blob.is_file() and Path(os.path.normpath(blob)) not in referenced:
+            blob.unlink(missing_ok=True)
+            removed.append(blob)
+    return removed
 
-def prune_backups(backup_dir: Path, file_name: str, keep: int = 10) -> list[Path]:
-    """Keep the newest N backups for a file and remove older ones."""
+
+def prune_backups(
+    backup_dir: Path, file_name: str, keep: int = 10, store: Path | None = None
+) -> list[Path]:
+    """Keep the newest N indexed backups for a file, then drop unreferenced blobs."""
     if keep < 1 or not backup_dir.exists():
         return []
 
-    backups = sorted(
-        backup_dir.glob(f"{file_name}.*.bak"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
     removed = []
-    for old_backup in backups[keep:]:
-        old_backup.unlink(missing_ok=True)
-        removed.append(old_backup)
+    for record in existing_backups(list_backups(backup_dir, file_name))[keep:]:
+        record.path.unlink(missing_ok=True)
+        removed.append(record.path)
+    if removed:
+        _append_index(backup_dir, *({"op": "remove", "name": path.name} for path in removed))
+        collect_garbage(store or object_store_dir(backup_dir))
     return removed
 
 
-def restore_backup(backup_path: Path | None, target_path: Path) -> bool:
-    """Restore a backup over the target path when a backup exists."""
+def restore_backup(backup_path: Path | None, target_path: Path) -> str | None:
+    """Restore a backup over the target path when a backup exists.
+
+    The copy gets the target's current mode (or 0644), not the read-only
+    mode of the shared blob, and replaces the target atomically. A compiled
+    `<target>.zwc` is dropped: the copy keeps the backup's older mtime, so zsh
+    would keep loading the replaced config from it. Returns the `copy_file`
+    method used, or None when there was nothing to restore.
+    """
     if backup_path is None or not backup_path.exists():
-        return False
+        return None
     target_path.parent.mkdir(parents=True, exist_ok=True)
-    copy2(backup_path, target_path)
-    return True
+    try:
+        mode = target_path.stat().st_mode & 0o777
+    except OSError:
+        mode = RESTORE_MODE
+    temp_path = target_path.with_name(f".{target_path.name}.{os.getpid()}.restore")
+    try:
+        method = copy_file(backup_path, temp_path)
+        temp_path.chmod(mode)
+        temp_path.replace(target_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    zwc_path(target_path).unlink(missing_ok=True)
+    return method
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+from pathlib import Path
+
+from .commands import find_command
+from .figlet import FigletManager, rainbow
+from .state import AppState
+
+BANNER_HEADERS = {"figlet", "cowsay"}
+COWSAY_TEXT = "Omega-ZSH"
+BANNER_TIMEOUT_SECONDS = 10
+
+
+def banner_path(omega_dir: Path) -> Path:
+    return omega_dir / "cache" / "banner.ansi"
+
+
+def render_banner(state: AppState) -> str | None:
+    """Render the figlet (rainbow-coloured) or cowsay header once, as ANSI text.
+
+    Returns None when the header is not a static banner or the binary is
+    missing or fails; the .zshrc then keeps its live command as fallback.
+    """
+    try:
+        if state.selected_header == "figlet":
+            figlet = FigletManager()
+            return rainbow(figlet.render_strict(state.header_text, state.header_font))
+        if state.selected_header == "cowsay":
+            cowsay = find_command("cowsay")
+            if cowsay is None:
+                return None
+            result = subprocess.run(
+                [cowsay, COWSAY_TEXT],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=BANNER_TIMEOUT_SECONDS,
+            )
+            return result.stdout
+    except (OSError, subprocess.SubprocessError) as exc:
+        logging.warning("No se pudo pre-renderizar el header %s: %s", state.selected_header, exc)
+    return None
+
+
+def write_banner(omega_dir: Path, state: AppState) -> Path | None:
+    """Store the rendered banner; drop a stale one when rendering is not possible.
+
+    Returns the banner path when it was (re)written and None when it already
+    held this content or could not be rendered, so apply only records changes.
+    """
+    path = banner_path(omega_dir)
+    content = render_banner(state)
+    if not content:
+        path.unlink(missing_ok=True)
+        return None
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return None
+    except (OSError, UnicodeDecodeError):
+        pass
+    temp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(content, encoding="utf-8")
+        temp_path.replace(path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        return None
+    return path
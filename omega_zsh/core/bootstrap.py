@@ -7,12 +7,10 @@ from pathlib import Path
 # Importaciones core
 from omega_zsh.core.apply import apply_config, link_omega_themes
 from omega_zsh.core.context import SystemContext
-from omega_zsh.core.installer import PluginInstaller
+from omega_zsh.core.installer import DEFAULT_INSTALL_JOBS, PluginInstaller
 from omega_zsh.core.manifest import default_manifest_path
 from omega_zsh.core.state import StateManager
-from omega_zsh.platforms.arch import ArchPlatform
-from omega_zsh.platforms.debian import DebianPlatform
-from omega_zsh.platforms.termux import TermuxPlatform
+from omega_zsh.platforms import make_platform
 
 # Definimos paquetes base por sistema
 CORE_PACKAGES = {
@@ -55,16 +53,6 @@ def setup_venv(project_dir: Path):
     return venv_dir
 
 
-def make_platform(ctx: SystemContext):
-    if ctx.is_termux:
-        return TermuxPlatform()
-    if ctx.package_manager_type in {"apt", "nala"}:
-        return DebianPlatform(use_nala=ctx.package_manager_type == "nala")
-    if ctx.package_manager_type == "pacman":
-        return ArchPlatform()
-    raise RuntimeError(f"Package manager no soportado: {ctx.package_manager_type}")
-
-
 def main():
     import argparse
 
@@ -73,6 +61,18 @@ def main():
     parser.add_argument("--apply-config", action="store_true")
     parser.add_argument("--sync-themes", action="store_true")
     parser.add_argument("--separation-smoke", action="store_true")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_INSTALL_JOBS,
+        help="clones Git simultáneos al instalar plugins (1 = secuencial)",
+    )
+    parser.add_argument(
+        "--repo-ttl",
+        type=int,
+        default=None,
+        help="segundos durante los que no se refrescan las listas de paquetes",
+    )
     args = parser.parse_args()
 
     if args.separation_smoke:
@@ -95,9 +95,9 @@ def main():
         subprocess.run([str(pip_bin), "install", "-e", str(project_dir), "--quiet"], check=True)
 
         # Orquestación de instalación
-        ctx = SystemContext()
+        ctx = SystemContext.cached()
         plat = make_platform(ctx)
-        inst = PluginInstaller(plat, ctx.home)
+        inst = PluginInstaller(plat, ctx.home, jobs=args.jobs, repo_ttl=args.repo_ttl)
         sm = StateManager(ctx.omega_dir)
 
         state = sm.load()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from typing import Iterable
+
+
+def _path_directories(path: str) -> list[str]:
+    directories = []
+    seen = set()
+    for directory in path.split(os.pathsep):
+        if not directory or directory in seen:
+            continue
+        directories.append(directory)
+        seen.add(directory)
+    return directories
+
+
+def _directory_mtime(directory: str) -> int:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return -1
+
+
+class CommandIndex:
+    """Executable lookup table built from a single `os.scandir` pass over $PATH.
+
+    Each PATH entry is keyed by its mtime, so installing or removing a binary
+    marks the index stale and `get_command_index()` rebuilds it.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = os.environ.get("PATH", os.defpath) if path is None else path
+        self.directories = _path_directories(self.path)
+        self.stamps = tuple(_directory_mtime(directory) for directory in self.directories)
+        self._entries: dict[str, list[str]] = {}
+        self._resolved: dict[str, str | None] = {}
+        self._scan()
+
+    def _scan(self) -> None:
+        for directory, stamp in zip(self.directories, self.stamps):
+            if stamp < 0:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        self._entries.setdefault(entry.name, []).append(entry.path)
+            except OSError:
+                continue
+
+    def is_stale(self) -> bool:
+        """True when any PATH directory changed since the index was built."""
+        return self.stamps != tuple(_directory_mtime(directory) for directory in self.directories)
+
+    def which(self, command: str) -> str | None:
+        """Return the first executable for `command`, mirroring `shutil.which`."""
+        if os.sep in command:
+            return shutil.which(command)
+        if command in self._resolved:
+            return self._resolved[command]
+        resolved = None
+        for candidate in self._entries.get(command, []):
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                resolved = candidate
+                break
+        self._resolved[command] = resolved
+        return resolved
+
+    def has(self, command: str) -> bool:
+        return self.which(command) is not None
+
+    def any_available(self, commands: Iterable[str]) -> bool:
+        return any(self.has(command) for command in commands)
+
+    def __contains__(self, command: object) -> bool:
+        return isinstance(command, str) and self.has(command)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Re-stat PATH dirs at most this often so per-item lookups in a loop stay O(1).
+STALE_CHECK_INTERVAL_SECONDS = 1.0
+
+_SHARED_INDEX: CommandIndex | None = None
+_SHARED_CHECKED_AT = 0.0
+
+
+def get_command_index(path: str | None = None) -> CommandIndex:
+    """Return the process-wide index, rebuilding it when $PATH or its dirs change."""
+    global _SHARED_INDEX, _SHARED_CHECKED_AT
+    path = os.environ.get("PATH", os.defpath) if path is None else path
+    now = time.monotonic()
+    if _SHARED_INDEX is None or _SHARED_INDEX.path != path:
+        _SHARED_INDEX = CommandIndex(path)
+        _SHARED_CHECKED_AT = now
+    elif now - _SHARED_CHECKED_AT >= STALE_CHECK_INTERVAL_SECONDS:
+        if _SHARED_INDEX.is_stale():
+            _SHARED_INDEX = CommandIndex(path)
+        _SHARED_CHECKED_AT = now
+    return _SHARED_INDEX
+
+
+def find_command(command: str) -> str | None:
+    """Shared replacement for `shutil.which` backed by the process-wide index."""
+    return get_command_index().which(command)
+
+
+def any_command_available(commands: Iterable[str]) -> bool:
+    return get_command_index().any_available(commands)
+
+
+def benchmark_lookups(
+    commands: Iterable[str], path: str | None = None, rounds: int = 20
+) -> dict[str, float]:
+    """Compare per-call `shutil.which` with a `CommandIndex` over the same PATH.
+
+    `cold_index_seconds` rebuilds the index every round (first draw of a new
+    process); `index_seconds` reuses one index, like `get_command_index()` does.
+    """
+    path = os.environ.get("PATH", os.defpath) if path is None else path
+    commands = list(commands)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in commands:
+            shutil.which(command, path=path)
+    which_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        index = CommandIndex(path)
+        for command in commands:
+            index.which(command)
+    cold_index_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = CommandIndex(path)
+    for _ in range(rounds):
+        for command in commands:
+            index.which(command)
+    index_seconds = time.perf_counter() - start
+
+    return {
+        "directories": float(len(_path_directories(path))),
+        "lookups": float(len(commands) * rounds),
+        "which_seconds": which_seconds,
+        "cold_index_seconds": cold_index_seconds,
+        "index_seconds": index_seconds,
+    }
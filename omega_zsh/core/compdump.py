@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .shell import build_compdump, zsh_fpath
+
+
+def compdump_path(omega_dir: Path) -> Path:
+    return omega_dir / "cache" / "zcompdump"
+
+
+def _stamp_path(dump: Path) -> Path:
+    return dump.with_name(dump.name + ".json")
+
+
+def fpath_hash(fpath: Iterable[str]) -> str:
+    """Hash the fpath directories and the names of the files they hold.
+
+    Names are what compinit indexes, so adding or removing a completion
+    changes the hash; editing one in place does not.
+    """
+    digest = hashlib.sha256()
+    for directory in fpath:
+        try:
+            names = sorted(entry.name for entry in os.scandir(directory))
+        except OSError:
+            names = []
+        digest.update(directory.encode("utf-8") + b"\0")
+        digest.update("\0".join(names).encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def _read_stamp(dump: Path) -> dict:
+    try:
+        stamp = json.loads(_stamp_path(dump).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return stamp if isinstance(stamp, dict) else {}
+
+
+def compdump_is_fresh(dump: Path, fpath: list[str]) -> bool:
+    """True when `dump` was built for `fpath` plus the zsh default fpath it saw.
+
+    The stored default fpath is re-hashed in Python, so a fresh dump costs
+    no zsh process; a zsh upgrade shows up as a changed directory listing.
+    """
+    stamp = _read_stamp(dump)
+    system_fpath = stamp.get("system_fpath")
+    if not dump.is_file() or not isinstance(system_fpath, list):
+        return False
+    return stamp.get("sha256") == fpath_hash([*fpath, *system_fpath])
+
+
+def refresh_compdump(omega_dir: Path, fpath: list[str]) -> Path | None:
+    """Rebuild the completion dump when the effective fpath hash changed.
+
+    `fpath` holds the directories the generated config prepends; zsh's own
+    default fpath is appended. Returns the dump path when it was rebuilt;
+    None when it was still fresh, zsh is missing or compinit failed.
+    """
+    dump = compdump_path(omega_dir)
+    if compdump_is_fresh(dump, fpath):
+        return None
+    system_fpath = zsh_fpath()
+    if system_fpath is None:
+        return None
+    effective = [*fpath, *system_fpath]
+    temp_path = dump.with_name(dump.name + ".tmp")
+    try:
+        dump.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.unlink(missing_ok=True)
+        if not build_compdump(temp_path, effective):
+            temp_path.unlink(missing_ok=True)
+            return None
+        temp_path.replace(dump)
+        _stamp_path(dump).write_text(
+            json.dumps({"sha256": fpath_hash(effective), "system_fpath": system_fpath}),
+            encoding="utf-8",
+        )
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        return None
+    return dump
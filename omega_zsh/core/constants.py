@@ -274,6 +274,63 @@ def startup_impact(plugin_id: str) -> str:
     return STARTUP_IMPACT.get(plugin_id, "low")
 
 
+# Cómo se carga cada plugin: antes del primer prompt, justo después de
+# dibujarlo, o al ejecutar por primera vez uno de sus comandos.
+LOAD_STRATEGIES = ("eager", "deferred", "on-first-use")
+
+# Solo aportan fpath: deben estar cargados antes de compinit.
+EAGER_ONLY_PLUGINS = {"zsh-completions"}
+
+# Deben ir al final para envolver los widgets definidos por los demás.
+LOAD_LAST_PLUGINS = {"zsh-syntax-highlighting", "fast-syntax-highlighting"}
+
+# Comandos que disparan la carga de un plugin "on-first-use".
+PLUGIN_ENTRY_COMMANDS: Dict[str, List[str]] = {
+    "k": ["k"],
+    "zsh-navigation-tools": [
+        "n-aliases",
+        "n-cd",
+        "n-env",
+        "n-functions",
+        "n-help",
+        "n-history",
+        "n-kill",
+        "n-options",
+        "n-panelize",
+    ],
+}
+
+
+def default_load_strategy(plugin_id: str) -> str:
+    # Solo "high" se difiere por defecto: el cargador diferido hace `source` dentro
+    # de una función, y los `typeset`/`local` sin -g o `setopt localoptions` de
+    # nivel superior de un plugin quedarían limitados a ella.
+    if plugin_id in EAGER_ONLY_PLUGINS or startup_impact(plugin_id) != "high":
+        return "eager"
+    return "deferred"
+
+
+def load_strategy(plugin_id: str, overrides: Dict[str, str] | None = None) -> str:
+    """Effective strategy: a valid override from AppState, else the STARTUP_IMPACT default."""
+    strategy = (overrides or {}).get(plugin_id) or default_load_strategy(plugin_id)
+    if strategy not in LOAD_STRATEGIES or plugin_id in EAGER_ONLY_PLUGINS:
+        return "eager"
+    if strategy == "on-first-use" and plugin_id not in PLUGIN_ENTRY_COMMANDS:
+        return "deferred"
+    return strategy
+
+
+# Antigüedad máxima (s) del snapshot de fastfetch antes de refrescarlo en segundo
+# plano; 0 ejecuta fastfetch en vivo en cada arranque.
+DEFAULT_HEADER_CACHE_TTL = 3600
+
+
+# Hooks `eval "$(tool init)"` que se generan una vez y se cachean en disco.
+TOOL_INIT_COMMANDS: Dict[str, List[str]] = {
+    "zoxide": ["zoxide", "init", "zsh"],
+}
+
+
 THEMES_OMZ_BUILTIN: List[ThemeDef] = [
     ThemeDef("robbyrussell", "Clásico (Default)"),
     ThemeDef("agnoster", "Powerline Style"),
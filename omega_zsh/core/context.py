@@ -1,36 +1,131 @@
+import hashlib
+import json
 import os
 import platform
 import shlex
 import subprocess
 from pathlib import Path
 from shutil import which
+from typing import Any
+
+OS_RELEASE_PATH = Path("/etc/os-release")
+CONTEXT_CACHE_VERSION = 1
+
+# Sondeos caros: se calculan al primer acceso y se pueden persistir en caché.
+_PROBED_FACTS = {
+    "distro": ("distro_id", "distro_version"),
+    "gsi": ("is_gsi",),
+    "package_manager": ("package_manager_type",),
+}
+
+
+def _os_release_mtime() -> int | None:
+    try:
+        return OS_RELEASE_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def context_cache_key(env: Any) -> dict[str, Any]:
+    """Inputs that invalidate cached probe results when any of them changes."""
+    return {
+        "version": CONTEXT_CACHE_VERSION,
+        "os_release_mtime": _os_release_mtime(),
+        "path_sha256": hashlib.sha256(env.get("PATH", "").encode("utf-8")).hexdigest(),
+        "zsh": env.get("ZSH", ""),
+        "prefix": env.get("PREFIX", ""),
+        "android": "ANDROID_ROOT" in env or "ANDROID_DATA" in env,
+    }
+
+
+def _fact_property(name: str, probe: str) -> property:
+    def getter(self):
+        if name not in self._facts:
+            self._run_probe(probe)
+        return self._facts[name]
+
+    def setter(self, value):
+        self._facts[name] = value
+
+    return property(getter, setter)
 
 
 class SystemContext:
+    distro_id = _fact_property("distro_id", "distro")
+    distro_version = _fact_property("distro_version", "distro")
+    is_gsi = _fact_property("is_gsi", "gsi")
+    package_manager_type = _fact_property("package_manager_type", "package_manager")
+
     def __init__(self, home: Path | None = None, env: dict[str, str] | None = None):
         self._home_override = home
         self._env = env if env is not None else os.environ
+        self._facts: dict[str, Any] = {}
+        self._cache_path: Path | None = None
+        self._cache_key: dict[str, Any] | None = None
         self._detect()
 
+    @classmethod
+    def cached(cls, home: Path | None = None, env: dict[str, str] | None = None):
+        """Build a context reusing probe results from ~/.omega-zsh/cache/context.json.
+
+        The cache is keyed by the os-release mtime, a hash of $PATH and the
+        $ZSH/$PREFIX values; a mismatch discards it. New probe results are
+        written back only when the Omega directory already exists.
+        """
+        context = cls(home=home, env=env)
+        context._cache_path = context.omega_dir / "cache" / "context.json"
+        context._cache_key = context_cache_key(context._env)
+        context._load_cached_facts()
+        return context
+
     def _detect(self):
         """Analiza el sistema para determinar el entorno operativo."""
         self.os_type = platform.system().lower()
         self.home = self._home_override or Path.home()
         self.is_android = "ANDROID_ROOT" in self._env or "ANDROID_DATA" in self._env
         self.is_termux = "com.termux" in self._env.get("PREFIX", "")
-        self.distro_id = "unknown"
-        self.distro_version = ""
-        self.is_gsi = False
-        self.package_manager_type = "unknown"
-
-        if self.is_android:
-            self._detect_android_context()
-        elif self.os_type == "linux":
-            self._detect_linux_distro()
 
         # Rutas del proyecto y del entorno
         self._detect_paths()
 
+    def _run_probe(self, probe: str) -> None:
+        if probe == "distro":
+            facts = self._detect_distro()
+        elif probe == "gsi":
+            facts = {"is_gsi": self._detect_gsi()}
+        else:
+            facts = {"package_manager_type": self._detect_package_manager()}
+        self._facts.update(facts)
+        self._store_cached_facts()
+
+    def _load_cached_facts(self) -> None:
+        if self._cache_path is None or not self._cache_path.exists():
+            return
+        try:
+            data = json.loads(self._cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if not isinstance(data, dict) or data.get("key") != self._cache_key:
+            return
+        facts = data.get("facts")
+        if not isinstance(facts, dict):
+            return
+        for names in _PROBED_FACTS.values():
+            if all(name in facts for name in names):
+                self._facts.update({name: facts[name] for name in names})
+
+    def _store_cached_facts(self) -> None:
+        if self._cache_path is None or not self.omega_dir.is_dir():
+            return
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._cache_path.with_suffix(".tmp")
+            payload = {"key": self._cache_key, "facts": self._facts}
+            temp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            temp_path.replace(self._cache_path)
+        except Exception:
+            pass  # La caché es opcional; un fallo nunca debe romper la detección
+
     def _detect_paths(self):
         """Calcula rutas críticas del proyecto y del entorno del usuario."""
         # Raíz del paquete (vía __file__ del paquete para máxima compatibilidad)
@@ -52,11 +147,17 @@ class SystemContext:
         # Ruta al .zshrc del usuario
         self.zshrc_path = self.home / ".zshrc"
 
-    def _detect_android_context(self):
-        """Detección específica para entornos Android/Termux."""
-        self.distro_id = "android"
+    def _detect_distro(self) -> dict[str, str]:
+        if self.is_android:
+            return {"distro_id": "android", "distro_version": ""}
+        if self.os_type == "linux":
+            return self._detect_linux_distro()
+        return {"distro_id": "unknown", "distro_version": ""}
 
-        # Detectar si es GSI (Generic System Image)
+    def _detect_gsi(self) -> bool:
+        """Detecta si Android corre sobre una GSI (Generic System Image)."""
+        if not self.is_android:
+            return False
         # Usamos getprop para buscar huellas comunes de GSI
         try:
             # Treble / GSI suelen tener ro.build.flavor o descripciones genéricas
@@ -64,69 +165,76 @@ class SystemContext:
             build_flavor = self._run_cmd("getprop ro.build.flavor")
             product_name = self._run_cmd("getprop ro.product.name")
 
-            if (
+            return (
                 "aosp" in build_flavor.lower()
                 or "gsi" in product_name.lower()
                 or "treble" in product_name.lower()
-            ):
-                self.is_gsi = True
+            )
         except Exception:
-            pass  # Si falla getprop, asumimos no GSI o no tenemos acceso
+            return False  # Si falla getprop, asumimos no GSI o no tenemos acceso
 
-        # Determinar gestor de paquetes en Termux
+    def _detect_package_manager(self) -> str:
+        if self.is_android:
+            return self._detect_android_package_manager()
+        if self.os_type == "linux":
+            return self._detect_linux_package_manager()
+        return "unknown"
+
+    def _detect_android_package_manager(self) -> str:
+        """Determina el gestor de paquetes en Termux."""
         if self.is_termux:
             if self._command_exists("nala"):
-                self.package_manager_type = "nala"
-            else:
-                self.package_manager_type = "pkg"
-        else:
-            # Android puro (adb shell) sin Termux environment es raro para esta app,
-            # pero asumimos 'toybox' o herramientas limitadas.
-            pass
+                return "nala"
+            return "pkg"
+        # Android puro (adb shell) sin Termux environment es raro para esta app,
+        # pero asumimos 'toybox' o herramientas limitadas.
+        return "unknown"
 
-    def _detect_linux_distro(self):
+    def _detect_linux_distro(self) -> dict[str, str]:
         """Lee /etc/os-release para identificar la distribución Linux."""
-        os_release = Path("/etc/os-release")
-        if os_release.exists():
+        facts = {"distro_id": "unknown", "distro_version": ""}
+        if OS_RELEASE_PATH.exists():
             try:
-                with open(os_release, encoding="utf-8") as f:
+                with open(OS_RELEASE_PATH, encoding="utf-8") as f:
                     data = {}
                     for line in f:
                         if "=" in line:
                             k, v = line.strip().split("=", 1)
                             data[k] = v.strip('"')
 
-                    self.distro_id = data.get("ID", "linux").lower()
-                    self.distro_version = data.get("VERSION_ID", "")
+                    facts["distro_id"] = data.get("ID", "linux").lower()
+                    facts["distro_version"] = data.get("VERSION_ID", "")
             except Exception:
                 pass
+        return facts
 
-        # Mapeo de Distro a Gestor de Paquetes
-        if self.distro_id in ["debian", "ubuntu", "kali", "pop", "linuxmint", "parrot"]:
+    def _detect_linux_package_manager(self) -> str:
+        """Mapeo de Distro a Gestor de Paquetes."""
+        distro_id = self.distro_id
+        if distro_id in ["debian", "ubuntu", "kali", "pop", "linuxmint", "parrot"]:
             if self._command_exists("nala"):
-                self.package_manager_type = "nala"
-            else:
-                self.package_manager_type = "apt"
-        elif self.distro_id in ["arch", "manjaro", "endeavouros"]:
-            self.package_manager_type = "pacman"
-        elif self.distro_id in ["fedora", "rhel", "centos", "almalinux"]:
-            self.package_manager_type = "dnf"
-        elif self.distro_id in ["alpine"]:
-            self.package_manager_type = "apk"
-        elif self.distro_id in ["opensuse", "sles"]:
-            self.package_manager_type = "zypper"
-        elif self.distro_id in ["void"]:
-            self.package_manager_type = "xbps"
-        else:
-            # Fallback por detección de binario
-            if self._command_exists("apt-get"):
-                self.package_manager_type = "apt"
-            elif self._command_exists("pacman"):
-                self.package_manager_type = "pacman"
-            elif self._command_exists("dnf"):
-                self.package_manager_type = "dnf"
-            elif self._command_exists("apk"):
-                self.package_manager_type = "apk"
+                return "nala"
+            return "apt"
+        if distro_id in ["arch", "manjaro", "endeavouros"]:
+            return "pacman"
+        if distro_id in ["fedora", "rhel", "centos", "almalinux"]:
+            return "dnf"
+        if distro_id in ["alpine"]:
+            return "apk"
+        if distro_id in ["opensuse", "sles"]:
+            return "zypper"
+        if distro_id in ["void"]:
+            return "xbps"
+        # Fallback por detección de binario
+        if self._command_exists("apt-get"):
+            return "apt"
+        if self._command_exists("pacman"):
+            return "pacman"
+        if self._command_exists("dnf"):
+            return "dnf"
+        if self._command_exists("apk"):
+            return "apk"
+        return "unknown"
 
     def _command_exists(self, cmd: str) -> bool:
         """Verifica si un comando existe en el PATH."""
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import copy
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from shutil import which
+from typing import Any, Iterable
+
+from .state import PRESETS, AppState, apply_preset
+
+BENCHMARK_TIMEOUT_SECONDS = 30
+
+
+def _lib_files(omz_dir: Path) -> list[Path]:
+    # Igual que oh-my-zsh.sh: un lib/x.zsh en custom/lib reemplaza al original.
+    custom = omz_dir / "custom"
+    libs = []
+    for lib in sorted((omz_dir / "lib").glob("*.zsh")):
+        override = custom / "lib" / lib.name
+        libs.append(override if override.is_file() else lib)
+    return libs
+
+
+def _plugin_dir(omz_dir: Path, plugin_id: str) -> Path | None:
+    for base in (omz_dir / "custom" / "plugins", omz_dir / "plugins"):
+        candidate = base / plugin_id
+        if (candidate / f"{plugin_id}.plugin.zsh").is_file() or (
+            candidate / f"_{plugin_id}"
+        ).is_file():
+            return candidate
+    return None
+
+
+def _theme_file(omz_dir: Path, theme: str, planned: set[Path]) -> Path | None:
+    for base in (omz_dir / "custom", omz_dir / "custom" / "themes", omz_dir / "themes"):
+        candidate = base / f"{theme}.zsh-theme"
+        if candidate in planned or candidate.is_file():
+            return candidate
+    return None
+
+
+def resolve_direct_load(
+    omz_dir: Path,
+    plugins: Iterable[str],
+    themes: Iterable[str],
+    planned_themes: Iterable[Path] = (),
+    lazy: Iterable[str] = (),
+) -> dict:
+    """Static load plan replacing `source $ZSH/oh-my-zsh.sh` for a fixed config.
+
+    Mirrors the order oh-my-zsh.sh uses: fpath first, then compinit (in the
+    template), lib files, plugin entry points, `custom/*.zsh` and finally the
+    theme picked by `$ZSH_THEME`. The auto-update check is not replicated.
+    `planned_themes` are theme links the same apply is about to create.
+    `lazy` plugins only get their fpath entry; the template sources them later.
+    Plugins or themes that cannot be found are listed under `missing`.
+    """
+    custom = omz_dir / "custom"
+    fpath = [omz_dir / "cache" / "completions", omz_dir / "functions", omz_dir / "completions"]
+    entries = []
+    missing = []
+    lazy = set(lazy)
+    for plugin_id in plugins:
+        plugin_dir = _plugin_dir(omz_dir, plugin_id)
+        if plugin_dir is None:
+            missing.append(plugin_id)
+            continue
+        # oh-my-zsh.sh antepone cada plugin, así que el último queda primero.
+        fpath.insert(0, plugin_dir)
+        if any((plugin_dir / "src").glob("_*")):
+            # zsh-completions guarda sus funciones en src/ y solo lo añade al cargarse,
+            # ya después de compinit.
+            fpath.insert(0, plugin_dir / "src")
+        entry = plugin_dir / f"{plugin_id}.plugin.zsh"
+        if entry.is_file() and plugin_id not in lazy:
+            entries.append(entry)
+    planned = set(planned_themes)
+    themes_plan = []
+    for theme in dict.fromkeys(themes):
+        theme_file = _theme_file(omz_dir, theme, planned)
+        if theme_file is None:
+            missing.append(theme)
+        else:
+            themes_plan.append({"name": theme, "path": str(theme_file)})
+    return {
+        "custom_dir": str(custom),
+        "cache_dir": str(omz_dir / "cache"),
+        "fpath": [str(path) for path in fpath],
+        "libs": [str(path) for path in _lib_files(omz_dir)],
+        "plugins": [str(path) for path in entries],
+        "custom_files": [str(path) for path in sorted(custom.glob("*.zsh"))],
+        "themes": themes_plan,
+        "missing": missing,
+    }
+
+
+def _benchmark_context(context: Any, home: Path) -> Any:
+    # Mismo Oh My Zsh, pero el compdump y demás rutas de ~/.omega-zsh van al temporal.
+    scratch = copy.copy(context)
+    scratch.home = home
+    scratch.omega_dir = home / ".omega-zsh"
+    scratch.zshrc_path = home / ".zshrc"
+    return scratch
+
+
+def _time_startup(zsh_bin: str, zdotdir: Path, runs: int) -> float:
+    # HOME apunta al directorio temporal, igual que las rutas absolutas del .zshrc.
+    env = {**os.environ, "ZDOTDIR": str(zdotdir), "HOME": str(zdotdir)}
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [zsh_bin, "-i", "-c", "exit"],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=BENCHMARK_TIMEOUT_SECONDS,
+        )
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def benchmark_direct_load(context: Any, runs: int = 5) -> dict[str, dict[str, float]]:
+    """Median `zsh -i -c exit` time per preset, through oh-my-zsh.sh vs direct load.
+
+    Each preset is rendered twice into temporary ZDOTDIRs that also serve as
+    HOME, and with a context rooted there, so the real `.zshrc` and compdump
+    are left alone. Requires zsh and an installed Oh My Zsh.
+    """
+    from .apply import render_config
+
+    zsh_bin = which("zsh")
+    if not zsh_bin:
+        raise RuntimeError("zsh no está en PATH")
+    if not (context.omz_dir / "oh-my-zsh.sh").is_file():
+        raise RuntimeError(f"Oh My Zsh no encontrado en {context.omz_dir}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="omega-bench-") as tmp:
+        for preset_id in PRESETS:
+            state = replace(apply_preset(preset_id, AppState()), selected_header="none")
+            timings = {}
+            for mode, direct in (("standard", False), ("direct", True)):
+                zdotdir = Path(tmp) / preset_id / mode
+                zdotdir.mkdir(parents=True)
+                content = render_config(
+                    _benchmark_context(context, zdotdir), replace(state, direct_load=direct)
+                )
+                (zdotdir / ".zshrc").write_text(content, encoding="utf-8")
+                # Primera ejecución fuera de la medición: genera el compdump.
+                _time_startup(zsh_bin, zdotdir, 1)
+                timings[f"{mode}_seconds"] = _time_startup(zsh_bin, zdotdir, runs)
+            results[preset_id] = timings
+    return results
@@ -4,7 +4,8 @@ from pathlib import Path
 from shutil import which
 from typing import Any
 
-from .backup import create_backup, restore_backup
+from .apply import render_config
+from .backup import backup_file, iter_valid_backups, list_backups, restore_backup
 from .constants import (
     EXTERNAL_URLS,
     THEMES_OMZ_BUILTIN,
@@ -18,10 +19,13 @@ from .constants import (
     valid_selected_plugins,
 )
 from .context import SystemContext
-from .manifest import load_manifest, record_managed_file, save_manifest
+from .fork_budget import analyze_fork_budget, format_fork_budget
+from .installer import binary_available, installed_packages_for
+from .manifest import ManifestTransaction
 from .operations import write_operation_log
 from .shell import validate_zsh_syntax
 from .state import AppState, StateManager
+from .validation_cache import ValidationCache
 
 
 def _check(check_id: str, status: str, severity: str, message: str, detail: str) -> dict[str, str]:
@@ -135,10 +139,6 @@ def _omz_status(context: SystemContext) -> tuple[dict[str, str], dict[str, str]]
     return zsh_check, omz_check
 
 
-def _binary_available(plugin_id: str) -> bool:
-    return any(which(command) for command in binary_commands(plugin_id))
-
-
 def _binary_detail(context: SystemContext, missing_tools: list[str]) -> str:
     if not missing_tools:
         return "herramientas seleccionadas disponibles"
@@ -163,20 +163,43 @@ def _external_plugin_detail(context: SystemContext, missing_plugins: list[str])
     return "; ".join(details)
 
 
+def _fork_budget_check(context: SystemContext, state: AppState) -> dict[str, str]:
+    try:
+        report = analyze_fork_budget(render_config(context, state))
+    except Exception as exc:
+        return _check(
+            "fork-budget",
+            "warning",
+            "warning",
+            "no se pudo renderizar la configuración",
+            str(exc),
+        )
+    over_budget = state.zero_fork and report["forks"] > 0
+    return _check(
+        "fork-budget",
+        "warning" if over_budget else "ok",
+        "warning" if over_budget else "ok",
+        "modo zero-fork con procesos al iniciar"
+        if over_budget
+        else "procesos estimados al iniciar zsh",
+        format_fork_budget(report),
+    )
+
+
 def _latest_valid_zshrc_backup(context: SystemContext) -> Path | None:
     backup_dir = context.zshrc_path.parent / ".omega-backups"
     if not backup_dir.exists():
         return None
-    backups = sorted(
-        backup_dir.glob(f"{context.zshrc_path.name}.*.bak"),
-        key=lambda path: path.stat().st_mtime,
-        reverse=True,
-    )
-    for backup in backups:
-        valid, _ = validate_zsh_syntax(backup)
-        if valid:
-            return backup
-    return None
+    cache = ValidationCache.for_omega_dir(context.omega_dir)
+    records = list_backups(backup_dir, context.zshrc_path.name)
+    try:
+        for record in iter_valid_backups(
+            records, lambda path: cache.validate(path, validate_zsh_syntax)
+        ):
+            return record.path
+        return None
+    finally:
+        cache.flush()
 
 
 def _fix_result(fix_id: str, status: str, message: str, detail: str) -> dict[str, str]:
@@ -200,7 +223,7 @@ def _manifest_needs_rewrite(path: Path) -> bool:
     return status != "ok"
 
 
-def _create_minimal_zshrc(context: SystemContext) -> dict[str, str]:
+def _create_minimal_zshrc(context: SystemContext, manifest: ManifestTransaction) -> dict[str, str]:
     if context.zshrc_path.exists():
         return _fix_result(
             "zshrc", "skipped", ".zshrc existente preservado", str(context.zshrc_path)
@@ -209,13 +232,12 @@ def _create_minimal_zshrc(context: SystemContext) -> dict[str, str]:
     backup_path = _latest_valid_zshrc_backup(context)
     if backup_path:
         try:
-            restore_backup(backup_path, context.zshrc_path)
-            record_managed_file(
-                context.omega_dir / "manifest.json",
+            method = restore_backup(backup_path, context.zshrc_path)
+            manifest.record(
                 context.zshrc_path,
                 "config",
                 "doctor-restored",
-                {"source": str(backup_path)},
+                {"source": str(backup_path), "copy": method},
             )
             return _fix_result(
                 "zshrc", "fixed", ".zshrc restaurado desde backup válido", str(backup_path)
@@ -228,15 +250,15 @@ def _create_minimal_zshrc(context: SystemContext) -> dict[str, str]:
     created_zshrc = False
     try:
         temp_path.write_text(content, encoding="utf-8")
-        valid, message = validate_zsh_syntax(temp_path)
+        valid, message = ValidationCache.for_omega_dir(context.omega_dir).validate(
+            temp_path, validate_zsh_syntax
+        )
         if not valid:
             temp_path.unlink(missing_ok=True)
             return _fix_result("zshrc", "failed", "validación zsh falló", message)
         temp_path.replace(context.zshrc_path)
         created_zshrc = True
-        record_managed_file(
-            context.omega_dir / "manifest.json", context.zshrc_path, "config", "doctor-created"
-        )
+        manifest.record(context.zshrc_path, "config", "doctor-created")
         return _fix_result("zshrc", "fixed", ".zshrc mínimo creado", str(context.zshrc_path))
     except Exception as exc:
         temp_path.unlink(missing_ok=True)
@@ -247,7 +269,7 @@ def _create_minimal_zshrc(context: SystemContext) -> dict[str, str]:
 
 def run_doctor_fix(context: SystemContext | None = None) -> dict[str, Any]:
     """Apply conservative, local doctor repairs and return the updated report."""
-    context = context or SystemContext()
+    context = context or SystemContext.cached()
     fixes = []
     omega_dir_ready = False
 
@@ -280,6 +302,7 @@ def run_doctor_fix(context: SystemContext | None = None) -> dict[str, Any]:
             )
 
     manifest_path = context.omega_dir / "manifest.json"
+    manifest = ManifestTransaction(manifest_path)
     manifest_ready = False
     if not omega_dir_ready:
         fixes.append(
@@ -292,24 +315,25 @@ def run_doctor_fix(context: SystemContext | None = None) -> dict[str, Any]:
         )
     elif _manifest_needs_rewrite(manifest_path):
         try:
-            backup_path = create_backup(manifest_path, context.omega_dir / "backups")
-            save_manifest(manifest_path, load_manifest(manifest_path))
-            manifest_ready = True
-            if backup_path:
-                record_managed_file(
-                    manifest_path,
-                    backup_path,
+            backup = backup_file(manifest_path, context.omega_dir / "backups")
+            manifest.load()
+            manifest.mark_dirty()
+            if backup:
+                manifest.record(
+                    backup.path,
                     "backup",
                     "doctor-created",
-                    {"source": str(manifest_path)},
+                    {"source": str(manifest_path), "copy": backup.copy_method},
                 )
+            manifest.commit()
+            manifest_ready = True
             fixes.append(
                 _fix_result(
                     "manifest",
                     "fixed",
                     "manifest inicializado"
-                    if backup_path is None
-                    else "manifest reparado con backup",
+                    if backup is None
+                    else f"manifest reparado con backup ({backup.copy_method})",
                     str(manifest_path),
                 )
             )
@@ -322,7 +346,8 @@ def run_doctor_fix(context: SystemContext | None = None) -> dict[str, Any]:
         )
 
     if manifest_ready:
-        fixes.append(_create_minimal_zshrc(context))
+        with manifest:
+            fixes.append(_create_minimal_zshrc(context, manifest))
     else:
         fixes.append(
             _fix_result(
@@ -346,7 +371,7 @@ def run_doctor_fix(context: SystemContext | None = None) -> dict[str, Any]:
 
 def run_doctor(context: SystemContext | None = None) -> dict[str, Any]:
     """Return a read-only diagnostic report for the current Omega-ZSH setup."""
-    context = context or SystemContext()
+    context = context or SystemContext.cached()
     state = _load_state(context)
     checks = []
     zsh_path = which("zsh")
@@ -475,12 +500,16 @@ def run_doctor(context: SystemContext | None = None) -> dict[str, Any]:
         )
     )
 
-    missing_tools = [
+    selected_tools = [
         plugin
         for plugin in selected
-        if is_binary_tool(plugin)
-        and binary_supported(plugin, context.package_manager_type)
-        and not _binary_available(plugin)
+        if is_binary_tool(plugin) and binary_supported(plugin, context.package_manager_type)
+    ]
+    installed = installed_packages_for(context) if selected_tools else None
+    missing_tools = [
+        plugin
+        for plugin in selected_tools
+        if not binary_available(plugin, context.package_manager_type, installed)
     ]
     checks.append(
         _check(
@@ -522,6 +551,7 @@ def run_doctor(context: SystemContext | None = None) -> dict[str, Any]:
             state.selected_theme,
         )
     )
+    checks.append(_fork_budget_check(context, state))
 
     severity_order = {"error": 2, "warning": 1, "ok": 0}
     overall = max(checks, key=lambda item: severity_order.get(item["severity"], 0))["severity"]
@@ -1,4 +1,5 @@
 import logging
+import math
 import os
 import shlex
 import shutil
@@ -7,6 +8,25 @@ from pathlib import Path
 from typing import Dict, List
 
 
+def rainbow(text: str, freq: float = 0.1, spread: float = 3.0, seed: float = 0.0) -> str:
+    """Colorea `text` en truecolor con el mismo degradado sinusoidal que lolcat."""
+    lines = []
+    for row, line in enumerate(text.splitlines()):
+        painted = []
+        for column, char in enumerate(line):
+            if char.isspace():
+                painted.append(char)
+                continue
+            offset = freq * (seed + row + column / spread)
+            red, green, blue = (
+                int(math.sin(offset + phase) * 127 + 128)
+                for phase in (0, 2 * math.pi / 3, 4 * math.pi / 3)
+            )
+            painted.append(f"\x1b[38;2;{red};{green};{blue}m{char}")
+        lines.append("".join(painted) + ("\x1b[0m" if painted else ""))
+    return "\n".join(lines) + ("\n" if text.endswith("\n") else "")
+
+
 class FigletManager:
     """Gestor de fuentes Figlet con soporte para fuentes del sistema y locales."""
 
@@ -64,21 +84,28 @@ class FigletManager:
         if not text or not self.is_available():
             return text
 
-        # Obtener ruta segura
-        font_path = self._resolve_font_path(font)
-
         try:
-            cmd = [self.figlet_path, "-f", font_path, "-w", str(width)]
-            if center:
-                cmd.append("-c")
-            cmd.append(text)
-
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return result.stdout
+            return self.render_strict(text, font, width, center)
         except Exception as e:
             logging.error(f"Error renderizando figlet con fuente '{font}': {e}")
             return f"Error renderizando: {text}"
 
+    def render_strict(self, text: str, font: str, width: int = 80, center: bool = True) -> str:
+        """Como `render`, pero propaga los errores de figlet en vez de devolver un aviso."""
+        if not self.is_available():
+            raise FileNotFoundError("figlet no está en PATH")
+
+        # Obtener ruta segura
+        font_path = self._resolve_font_path(font)
+
+        cmd = [self.figlet_path, "-f", font_path, "-w", str(width)]
+        if center:
+            cmd.append("-c")
+        cmd.append(text)
+
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=10)
+        return result.stdout
+
     def generate_safe_command(self, text: str, font: str) -> str:
         """Genera un comando de shell blindado para .zshrc."""
 
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+# Builtins, palabras reservadas y funciones autoload de zsh que no crean procesos.
+ZSH_BUILTINS = frozenset(
+    """
+    : [ [[ ]] ]] (( )) ! { } alias autoload bg bindkey break builtin bye cd chdir command
+    compdef compinit compadd compdescribe compfiles compgroups compquote comptags comptry
+    compvalues continue declare dirs disable disown echo emulate enable eval exec exit export
+    false fc fg float functions getln getopts hash history integer jobs kill let limit local
+    log logout noglob popd print printf private pushd pushln pwd r read readonly rehash return
+    sched set setopt shift source strftime suspend test times trap true ttyctl type typeset
+    ulimit umask unalias unfunction unhash unlimit unset unsetopt vared wait whence where
+    which zcompile zformat zle zmodload zparseopts zprof zpty zregexparse zsocket zstat zstyle
+    if then else elif fi for in do done while until case esac select function repeat time
+    coproc nocorrect always
+    add-zle-hook-widget add-zsh-hook compaudit is-at-least
+    """.split()
+)
+
+_SECTION_RE = re.compile(r"^#\s*---\s*(.+?)\s*---\s*$")
+_FUNCTION_RE = re.compile(
+    r"^\s*(?:function\s+)?([\w:-]+)\s*\(\)\s*\{|^\s*function\s+([\w:-]+)\s*\{"
+)
+_ARITH_RE = re.compile(r"\(\([^()]*\)\)")
+_ARRAY_RE = re.compile(r"\b[A-Za-z_]\w*\+?=\([^()]*\)")
+_PARAM_RE = re.compile(r"\$\{[^{}]*\}")
+_COND_RE = re.compile(r"\[\[.*?\]\]")
+_REDIRECT_RE = re.compile(r"\d*(?:&>>?|[<>]{1,2}&?)")
+_SEPARATORS_RE = re.compile(r"&&|\|\||[;|&(){}]")
+_ASSIGNMENT_RE = re.compile(r"^[A-Za-z_][\w]*(\[[^\]]*\])?\+?=")
+
+
+def _strip_comment(line: str) -> str:
+    stripped = line.strip()
+    return "" if stripped.startswith("#") else stripped
+
+
+def _extract_substitutions(line: str) -> tuple[str, list[str]]:
+    """Split `$(...)`/backtick bodies out of a line; `$((...))` is arithmetic."""
+    outer = []
+    bodies = []
+    i = 0
+    while i < len(line):
+        if line.startswith("$((", i):
+            outer.append("$((")
+            i += 3
+        elif line.startswith("$(", i):
+            depth = 1
+            j = i + 2
+            while j < len(line) and depth:
+                if line[j] == "(":
+                    depth += 1
+                elif line[j] == ")":
+                    depth -= 1
+                j += 1
+            bodies.append(line[i + 2 : j - 1])
+            outer.append(" _omega_subst ")
+            i = j
+        elif line[i] == "`":
+            end = line.find("`", i + 1)
+            end = len(line) if end < 0 else end
+            bodies.append(line[i + 1 : end])
+            outer.append(" _omega_subst ")
+            i = end + 1
+        else:
+            outer.append(line[i])
+            i += 1
+    return "".join(outer), bodies
+
+
+def _strip_quotes(text: str) -> str:
+    text = re.sub(r"'[^']*'", "''", text)
+    return re.sub(r'"(?:\\.|[^"\\])*"', '""', text)
+
+
+def _command_words(line: str) -> list[str]:
+    """First word of every simple command in a line (quotes and tests removed)."""
+    text = _PARAM_RE.sub("$_", _strip_quotes(line))
+    text = _COND_RE.sub(" ", _ARITH_RE.sub(" ", text))
+    text = _ARRAY_RE.sub(" ", text)
+    # `>&2` o `&>` no separan comandos aunque lleven `&`.
+    text = _REDIRECT_RE.sub(" >", text)
+    words = []
+    for segment in _SEPARATORS_RE.split(text):
+        tokens = segment.split()
+        while tokens and (_ASSIGNMENT_RE.match(tokens[0]) or tokens[0] in {"!", "then", "do"}):
+            tokens.pop(0)
+        if not tokens:
+            continue
+        word = tokens[0]
+        if word.startswith(("$", "-", ">", "<", "'", '"')) or word in {"''", '""'}:
+            continue
+        words.append(word)
+    return words
+
+
+def _split_functions(lines: list[str]) -> tuple[list[str], dict[str, list[str]]]:
+    top_level: list[str] = []
+    functions: dict[str, list[str]] = {}
+    current: str | None = None
+    depth = 0
+    for raw in lines:
+        line = _strip_comment(raw)
+        if current is None:
+            match = _FUNCTION_RE.match(line)
+            if match:
+                current = match.group(1) or match.group(2)
+                functions[current] = []
+                depth = line.count("{") - line.count("}")
+                if depth <= 0:
+                    current = None
+                continue
+            top_level.append(raw)
+            continue
+        depth += line.count("{") - line.count("}")
+        if depth <= 0:
+            current = None
+            continue
+        functions[current].append(raw)
+    return top_level, functions
+
+
+def _empty_section(name: str) -> dict[str, Any]:
+    return {"name": name, "command_substitutions": 0, "evals": 0, "external_commands": []}
+
+
+def analyze_fork_budget(content: str) -> dict[str, Any]:
+    """Static count of the processes a rendered .zshrc may spawn at startup.
+
+    Sections follow the `# --- Name ---` markers of the templates. Functions
+    are only counted where they are called, and every guarded branch counts,
+    so the totals are an upper bound. `forks` adds command substitutions to
+    external commands run outside them.
+    """
+    lines = content.splitlines()
+    top_level, functions = _split_functions(lines)
+    sections = [_empty_section("preamble")]
+
+    def scan(body: list[str], section: dict[str, Any], visited: frozenset[str]) -> None:
+        for raw in body:
+            line = _strip_comment(raw)
+            if not line:
+                continue
+            outer, substitutions = _extract_substitutions(line)
+            section["command_substitutions"] += len(substitutions)
+            for text, nested in [(outer, False)] + [(sub, True) for sub in substitutions]:
+                for word in _command_words(text):
+                    if word == "_omega_subst":
+                        continue
+                    if word == "eval":
+                        section["evals"] += 1
+                    elif word in functions:
+                        if word not in visited:
+                            scan(functions[word], section, visited | {word})
+                    elif word not in ZSH_BUILTINS:
+                        section["external_commands"].append(
+                            {"command": word, "in_substitution": nested}
+                        )
+
+    for raw in top_level:
+        match = _SECTION_RE.match(raw.strip())
+        if match:
+            sections.append(_empty_section(match.group(1)))
+            continue
+        scan([raw], sections[-1], frozenset())
+
+    report_sections = []
+    totals = {"command_substitutions": 0, "evals": 0, "external_commands": 0, "forks": 0}
+    for section in sections:
+        externals = section["external_commands"]
+        direct = sum(1 for item in externals if not item["in_substitution"])
+        forks = section["command_substitutions"] + direct
+        if not (forks or section["evals"]):
+            continue
+        report_sections.append(
+            {
+                "name": section["name"],
+                "command_substitutions": section["command_substitutions"],
+                "evals": section["evals"],
+                "external_commands": sorted({item["command"] for item in externals}),
+                "forks": forks,
+            }
+        )
+        totals["command_substitutions"] += section["command_substitutions"]
+        totals["evals"] += section["evals"]
+        totals["external_commands"] += len(externals)
+        totals["forks"] += forks
+    return {"sections": report_sections, **totals}
+
+
+def format_fork_budget(report: dict[str, Any]) -> str:
+    """One-line summary, e.g. `3 forks (Core: 2 [date, id]; Header: 1 [fastfetch])`."""
+    if not report["forks"]:
+        return "0 forks"
+    parts = []
+    for section in report["sections"]:
+        commands = ", ".join(section["external_commands"])
+        parts.append(
+            f"{section['name']}: {section['forks']}" + (f" [{commands}]" if commands else "")
+        )
+    return f"{report['forks']} forks (" + "; ".join(parts) + ")"
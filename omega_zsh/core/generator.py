@@ -6,9 +6,10 @@ from typing import Any, Dict
 
 from jinja2 import Environment, FileSystemLoader
 
-from .backup import create_backup, prune_backups, restore_backup
-from .manifest import default_manifest_path, record_managed_file
+from .backup import BackupRecord, backup_file, prune_backups, restore_backup
+from .manifest import ManifestTransaction, default_manifest_path
 from .shell import validate_zsh_syntax
+from .validation_cache import ValidationCache
 
 
 class ConfigGenerator:
@@ -21,47 +22,104 @@ class ConfigGenerator:
         template = self.env.get_template(".zshrc.j2")
         return template.render(context)
 
-    def generate_zshrc(self, output_path: Path, context: Dict[str, Any]) -> bool:
-        """Genera el archivo .zshrc a partir de la plantilla."""
+    def render_zshenv(self, context: Dict[str, Any]) -> str:
+        """Render .zshenv (entorno para toda instancia de zsh) sin escribir a disco."""
+        return self.env.get_template(".zshenv.j2").render(context)
+
+    def render_zprofile(self, context: Dict[str, Any]) -> str:
+        """Render .zprofile (solo shells de login) sin escribir a disco."""
+        return self.env.get_template(".zprofile.j2").render(context)
+
+    def generate_zshrc(
+        self,
+        output_path: Path,
+        context: Dict[str, Any],
+        content: str | None = None,
+        metadata: Dict[str, Any] | None = None,
+        manifest: ManifestTransaction | None = None,
+        omega_dir: Path | None = None,
+    ) -> bool:
+        """Genera el archivo .zshrc a partir de la plantilla.
+
+        `content` permite reutilizar un render previo y `metadata` se guarda en
+        el manifest junto al registro del .zshrc (p. ej. su hash de contenido).
+        Si se pasa `manifest`, los registros se acumulan en esa transacción.
+        `omega_dir` (el del SystemContext) aloja la caché de validación.
+        """
         try:
-            # 2. Renderizar plantilla
-            content = self.render_zshrc(context)
+            if content is None:
+                content = self.render_zshrc(context)
+        except Exception as e:
+            logging.error(f"Error generando .zshrc: {e}", exc_info=True)
+            return False
+        return self.generate_config_file(output_path, content, metadata, manifest, omega_dir)
+
+    def generate_config_file(
+        self,
+        output_path: Path,
+        content: str,
+        metadata: Dict[str, Any] | None = None,
+        manifest: ManifestTransaction | None = None,
+        omega_dir: Path | None = None,
+    ) -> bool:
+        """Escribe un archivo de arranque de zsh ya renderizado.
 
-            # 3. Escritura atómica
+        Misma secuencia para .zshrc, .zshenv y .zprofile: escritura atómica,
+        `zsh -n`, backup rotado y registro "config" en el manifest.
+        """
+        try:
+            # Escritura atómica
             temp_path = output_path.with_suffix(".tmp")
             with open(temp_path, "w", encoding="utf-8") as f:
                 f.write(content)
 
-            valid, message = validate_zsh_syntax(temp_path)
+            cache = ValidationCache.for_omega_dir(
+                omega_dir or default_manifest_path(output_path.parent).parent
+            )
+            valid, message = cache.validate(temp_path, validate_zsh_syntax)
             if not valid:
                 temp_path.unlink(missing_ok=True)
-                logging.error("Generated .zshrc failed validation: %s", message)
+                logging.error("Generated %s failed validation: %s", output_path.name, message)
                 return False
 
             backup_dir = output_path.parent / ".omega-backups"
-            backup_path = create_backup(output_path, backup_dir)
+            backup = backup_file(output_path, backup_dir)
             try:
                 os.replace(temp_path, output_path)
             except Exception:
                 temp_path.unlink(missing_ok=True)
-                restore_backup(backup_path, output_path)
+                restore_backup(backup.path if backup else None, output_path)
                 raise
-            prune_backups(backup_dir, output_path.name)
-            manifest_path = default_manifest_path(output_path.parent)
-            record_managed_file(manifest_path, output_path, "config", "generated")
-            if backup_path:
-                record_managed_file(
-                    manifest_path,
-                    backup_path,
-                    "backup",
-                    "created",
-                    {"source": str(output_path)},
-                )
+            pruned = prune_backups(backup_dir, output_path.name)
+            if manifest is None:
+                with ManifestTransaction(default_manifest_path(output_path.parent)) as own:
+                    self._record_config(own, output_path, backup, metadata, pruned)
+            else:
+                self._record_config(manifest, output_path, backup, metadata, pruned)
             return True
         except Exception as e:
-            logging.error(f"Error generando .zshrc: {e}", exc_info=True)
+            logging.error(f"Error generando {output_path.name}: {e}", exc_info=True)
             return False
 
+    def _record_config(
+        self,
+        manifest: ManifestTransaction,
+        output_path: Path,
+        backup: BackupRecord | None,
+        metadata: Dict[str, Any] | None,
+        pruned: list[Path] | None = None,
+    ) -> None:
+        manifest.record(output_path, "config", "generated", metadata)
+        if backup:
+            manifest.record(
+                backup.path,
+                "backup",
+                "created",
+                {"source": str(output_path), "copy": backup.copy_method},
+            )
+        for old_backup in pruned or []:
+            manifest.forget(old_backup)
+
     def generate_personal_config(self, output_path: Path, context: Dict[str, Any]) -> bool:
         """Genera el archivo personal.zsh de forma segura."""
         try:
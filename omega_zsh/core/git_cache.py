@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Mapping
+
+# Caché compartida por host; se usa solo si el administrador la creó.
+SYSTEM_GIT_CACHE_DIR = Path("/var/cache/omega-zsh/git")
+GIT_CACHE_ENV = "OMEGA_GIT_CACHE"
+
+# Un mirror más reciente que esto no se vuelve a sincronizar con la red.
+MIRROR_REFRESH_SECONDS = 3600
+GIT_TIMEOUT_SECONDS = 300
+
+_FETCH_STAMP = "omega-fetched"
+
+
+def default_git_cache_dir(home: Path, env: Mapping[str, str] | None = None) -> Path | None:
+    """$OMEGA_GIT_CACHE, then the shared /var/cache mirror dir, then ~/.omega-zsh.
+
+    The per-home dir is only used when it already exists: for a single user a
+    full-history mirror plus a full clone costs more than `clone --depth 1`,
+    so None (no mirror, shallow network clones) is the default.
+    """
+    env = os.environ if env is None else env
+    if env.get(GIT_CACHE_ENV):
+        return Path(env[GIT_CACHE_ENV]).expanduser()
+    if SYSTEM_GIT_CACHE_DIR.is_dir():
+        return SYSTEM_GIT_CACHE_DIR
+    user_cache = home / ".omega-zsh" / "cache" / "git"
+    return user_cache if user_cache.is_dir() else None
+
+
+def mirror_name(url: str) -> str:
+    """Stable `<repo>-<hash>.git` directory name for a remote URL."""
+    base = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git") or "repo"
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:10]
+    return f"{base}-{digest}.git"
+
+
+def run_git(
+    cmd: list[str],
+    on_progress: Callable[[str], None],
+    timeout: int = GIT_TIMEOUT_SECONDS,
+) -> int | None:
+    """Run git streaming its output; returns the exit code or None on timeout."""
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    if process.stdout:
+        for line in process.stdout:
+            on_progress(f"  [git] {line.strip()}")
+    try:
+        return process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        return None
+
+
+class GitMirrorCache:
+    """Bare `git clone --mirror` copies of remote repos, shared between homes.
+
+    Installs clone from the local mirror (git hardlinks the objects when the
+    mirror lives on the same filesystem) and then point `origin` back at the
+    real URL. A warm cache keeps working offline: a failed refresh just
+    reuses the mirror as it is.
+    """
+
+    def __init__(self, cache_dir: Path, refresh_seconds: int = MIRROR_REFRESH_SECONDS):
+        self.cache_dir = cache_dir
+        self.refresh_seconds = refresh_seconds
+
+    def mirror_path(self, url: str) -> Path:
+        return self.cache_dir / mirror_name(url)
+
+    def _git(self, mirror: Path) -> list[str]:
+        # Mirrors de /var/cache pertenecen a otro usuario; git exige safe.directory.
+        return ["git", "-c", f"safe.directory={mirror}"]
+
+    def _is_fresh(self, mirror: Path) -> bool:
+        try:
+            age = time.time() - (mirror / _FETCH_STAMP).stat().st_mtime
+        except OSError:
+            return False
+        return age < self.refresh_seconds
+
+    def _touch_stamp(self, mirror: Path) -> None:
+        try:
+            (mirror / _FETCH_STAMP).touch()
+        except OSError:
+            pass
+
+    def ensure_mirror(self, url: str, on_progress: Callable[[str], None]) -> Path | None:
+        """Create or refresh the mirror for `url`; None when no usable mirror exists."""
+        mirror = self.mirror_path(url)
+        try:
+            if (mirror / "HEAD").exists():
+                if self._is_fresh(mirror) or not os.access(mirror, os.W_OK):
+                    return mirror
+                code = run_git(
+                    [*self._git(mirror), "--git-dir", str(mirror), "remote", "update", "--prune"],
+                    on_progress,
+                )
+                if code == 0:
+                    self._touch_stamp(mirror)
+                else:
+                    on_progress(f"Mirror sin actualizar (¿offline?), se usa la copia local: {url}")
+                return mirror
+
+            temp = mirror.with_name(f"{mirror.name}.tmp-{os.getpid()}")
+            code = run_git(["git", "clone", "--mirror", url, str(temp)], on_progress)
+            if code != 0:
+                shutil.rmtree(temp, ignore_errors=True)
+                return None
+            self._touch_stamp(temp)
+            try:
+                temp.rename(mirror)
+            except OSError:
+                # Otro proceso creó el mirror mientras tanto; usamos el suyo.
+                shutil.rmtree(temp, ignore_errors=True)
+            return mirror if (mirror / "HEAD").exists() else None
+        except Exception as exc:
+            on_progress(f"Mirror Git no disponible para {url}: {exc}")
+            return None
+
+    def clone(self, url: str, target: Path, on_progress: Callable[[str], None]) -> bool:
+        """Clone `url` into `target` from the local mirror, with origin set to `url`."""
+        mirror = self.ensure_mirror(url, on_progress)
+        if mirror is None:
+            return False
+        try:
+            code = run_git([*self._git(mirror), "clone", str(mirror), str(target)], on_progress)
+            if code == 0:
+                code = run_git(
+                    ["git", "-C", str(target), "remote", "set-url", "origin", url], on_progress
+                )
+            if code == 0:
+                return True
+        except Exception as exc:
+            on_progress(f"Clon local desde mirror falló: {exc}")
+        shutil.rmtree(target, ignore_errors=True)
+        return False
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import subprocess
+import time
+from pathlib import Path
+
+from .commands import find_command
+from .constants import DEFAULT_HEADER_CACHE_TTL
+
+HEADER_REFRESH_TIMEOUT_SECONDS = 10
+
+# `--pipe false` mantiene los colores aunque la salida vaya a un archivo.
+FASTFETCH_SNAPSHOT_COMMAND = ["fastfetch", "--pipe", "false"]
+
+
+def header_cache_path(omega_dir: Path) -> Path:
+    return omega_dir / "cache" / "header.ansi"
+
+
+def header_cache_is_fresh(path: Path, ttl_seconds: int) -> bool:
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    return stat.st_size > 0 and time.time() - stat.st_mtime <= ttl_seconds
+
+
+def refresh_header_cache(
+    omega_dir: Path, ttl_seconds: int = DEFAULT_HEADER_CACHE_TTL
+) -> Path | None:
+    """Write a fresh fastfetch snapshot when the cached one is missing or stale.
+
+    Returns the snapshot path when it was (re)written; None when it was still
+    fresh, fastfetch is missing or it failed. The shell only ever prints this
+    file and refreshes it from a detached job, so this just seeds it at apply.
+    """
+    path = header_cache_path(omega_dir)
+    binary = find_command(FASTFETCH_SNAPSHOT_COMMAND[0])
+    if binary is None or header_cache_is_fresh(path, ttl_seconds):
+        return None
+    try:
+        result = subprocess.run(
+            [binary, *FASTFETCH_SNAPSHOT_COMMAND[1:]],
+            capture_output=True,
+            text=True,
+            timeout=HEADER_REFRESH_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    temp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(result.stdout, encoding="utf-8")
+        temp_path.replace(path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        return None
+    return path
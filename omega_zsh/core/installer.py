@@ -1,9 +1,11 @@
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from shutil import which
 from typing import Callable, List
 
+from ..platforms import make_platform
+from .commands import any_command_available
 from .constants import (
     EXTERNAL_URLS,
     binary_commands,
@@ -12,11 +14,31 @@ from .constants import (
     is_binary_tool,
     unknown_plugin_ids,
 )
+from .git_cache import GitMirrorCache, default_git_cache_dir, run_git
 from .operations import write_operation_log
+from .precompile import omz_sources, plugin_sources
+from .shell import zcompile_files
 
+# Clones concurrentes por defecto; los gestores de paquetes siempre van en serie.
+DEFAULT_INSTALL_JOBS = 4
 
-def _binary_available(plugin_id: str) -> bool:
-    return any(which(cmd) for cmd in binary_commands(plugin_id))
+
+def installed_packages_for(context) -> frozenset[str] | None:
+    """One cached package-manager query for the context, or None if unavailable."""
+    try:
+        return make_platform(context).installed_packages()
+    except Exception:
+        return None
+
+
+def binary_available(
+    plugin_id: str, package_manager: str = "", installed: frozenset[str] | None = None
+) -> bool:
+    """Installed-package list first; $PATH covers tools installed by other means."""
+    if installed is not None and binary_supported(plugin_id, package_manager):
+        if binary_package_name(plugin_id, package_manager) in installed:
+            return True
+    return any_command_available(binary_commands(plugin_id))
 
 
 def _platform_package_manager(platform) -> str:
@@ -35,6 +57,25 @@ class InstallResult:
     unsupported: list[str] = field(default_factory=list)
     messages: list[str] = field(default_factory=list)
 
+    def merge(self, other: "InstallResult") -> None:
+        """Append another (per-plugin) result, keeping the caller's ordering."""
+        self.ok = self.ok and other.ok
+        self.installed.extend(other.installed)
+        self.skipped.extend(other.skipped)
+        self.failed.extend(other.failed)
+        self.unsupported.extend(other.unsupported)
+        self.messages.extend(other.messages)
+
+
+def _prefixed_progress(
+    plugin_id: str, on_progress: Callable[[str], None], lock: threading.Lock
+) -> Callable[[str], None]:
+    def report(message: str) -> None:
+        with lock:
+            on_progress(f"[{plugin_id}] {message}")
+
+    return report
+
 
 class PluginInstaller:
     """
@@ -45,16 +86,33 @@ class PluginInstaller:
     Git para plugins externos.
     """
 
-    def __init__(self, platform, home_dir: Path):
+    def __init__(
+        self,
+        platform,
+        home_dir: Path,
+        jobs: int = DEFAULT_INSTALL_JOBS,
+        git_cache: GitMirrorCache | None = None,
+        repo_ttl: int | None = None,
+    ):
         """
         Inicializa el instalador.
 
         Args:
             platform: Instancia de la clase de plataforma (TermuxPlatform/DebianPlatform).
             home_dir (Path): Ruta al directorio home del usuario.
+            jobs (int): Máximo de clones Git simultáneos (1 = secuencial).
+            git_cache (GitMirrorCache): Caché de mirrors Git; por defecto
+                                        `default_git_cache_dir(home_dir)`, o
+                                        ninguna (clones superficiales).
+            repo_ttl (int): Segundos durante los que las listas de paquetes se
+                            consideran frescas (None = TTL de la plataforma).
         """
         self.platform = platform
         self.home = home_dir
+        self.jobs = max(1, jobs)
+        cache_dir = default_git_cache_dir(home_dir)
+        self.git_cache = git_cache or (GitMirrorCache(cache_dir) if cache_dir else None)
+        self.repo_ttl = repo_ttl
         self.custom_dir = self.home / ".oh-my-zsh/custom"
 
     def get_missing_binaries(self, plugins: List[str]) -> List[str]:
@@ -65,9 +123,17 @@ class PluginInstaller:
             plugins (List[str]): Lista de identificadores de plugins.
 
         Returns:
-            List[str]: Subconjunto de binarios no encontrados en el PATH.
+            List[str]: Subconjunto de binarios sin paquete instalado ni comando en el PATH.
         """
-        return [p for p in plugins if is_binary_tool(p) and not _binary_available(p)]
+        package_manager = _platform_package_manager(self.platform)
+        installed = self.platform.installed_packages()
+        if not isinstance(installed, frozenset):
+            installed = None
+        return [
+            p
+            for p in plugins
+            if is_binary_tool(p) and not binary_available(p, package_manager, installed)
+        ]
 
     def install_binary(self, plugin: str) -> bool:
         """
@@ -139,56 +205,83 @@ class PluginInstaller:
             selected_ids (List[str]): Lista de identificadores de plugins a instalar.
             on_progress (Callable[[str], None]): Función de callback para reportar progreso.
                                                 Debe aceptar un string (mensaje).
+
+        Con `jobs > 1` los clones Git corren en un pool de hilos y cada línea de
+        progreso lleva el prefijo `[plugin]`; los paquetes binarios se instalan
+        en una sola transacción `install_packages` en el hilo llamador porque
+        apt/pacman mantienen un lock global.
+        Los resultados por plugin se combinan en el orden de `selected_ids`.
         """
-        result = InstallResult()
         unknown = set(unknown_plugin_ids(selected_ids))
-        for plugin_id in selected_ids:
-            if plugin_id in unknown:
-                message = f"ID desconocido omitido: {plugin_id}"
-                on_progress(message)
-                result.messages.append(message)
-                result.skipped.append(plugin_id)
+        outcomes: dict[int, InstallResult] = {}
+        clones: list[tuple[int, str, str, Path]] = []
+        queued: set[str] = set()
+        for index, plugin_id in enumerate(selected_ids):
+            if plugin_id in unknown or plugin_id not in EXTERNAL_URLS or plugin_id in queued:
                 continue
-            # 1. ¿Es un paquete binario del sistema?
-            if is_binary_tool(plugin_id):
-                package_manager = _platform_package_manager(self.platform)
-                if not binary_supported(plugin_id, package_manager):
-                    message = f"Herramienta no soportada en {package_manager}: {plugin_id}"
-                    on_progress(message)
-                    result.messages.append(message)
-                    result.unsupported.append(plugin_id)
-                    result.skipped.append(plugin_id)
-                    continue
-                package_name = binary_package_name(plugin_id, package_manager)
-                on_progress(f"Instalando paquete binario: {plugin_id}")
-                if not self.platform.install_package(package_name, on_progress=on_progress):
-                    on_progress(f"Error instalando paquete binario: {plugin_id}")
-                    result.failed.append(plugin_id)
-                else:
-                    result.installed.append(plugin_id)
-
-            # 2. ¿Es un plugin externo de Git?
-            elif plugin_id in EXTERNAL_URLS:
-                url = EXTERNAL_URLS[plugin_id]
-                target_path = self.custom_dir / "plugins" / plugin_id
+            target_path = self.custom_dir / "plugins" / plugin_id
+            if not target_path.exists():
+                clones.append((index, plugin_id, EXTERNAL_URLS[plugin_id], target_path))
+                queued.add(plugin_id)
+
+        lock = threading.Lock()
+        executor = None
+        futures = {}
+
+        def progress_for(plugin_id: str) -> Callable[[str], None]:
+            if executor is None:
+                return on_progress
+            return _prefixed_progress(plugin_id, on_progress, lock)
+
+        if len(clones) > 1 and self.jobs > 1:
+            executor = ThreadPoolExecutor(max_workers=min(self.jobs, len(clones)))
+            for index, plugin_id, url, target_path in clones:
+                futures[index] = executor.submit(
+                    self._clone_plugin, plugin_id, url, target_path, progress_for(plugin_id)
+                )
 
-                if not target_path.exists():
-                    on_progress(f"Clonando plugin Git: {plugin_id}")
-                    if not self._git_clone(url, target_path, on_progress):
-                        on_progress(f"Error clonando plugin Git: {plugin_id}")
-                        result.failed.append(plugin_id)
+        try:
+            package_manager = _platform_package_manager(self.platform)
+            packages = self._install_binary_batch(
+                [plugin_id for plugin_id in selected_ids if plugin_id not in unknown],
+                package_manager,
+                progress_for(package_manager),
+            )
+            for index, plugin_id in enumerate(selected_ids):
+                if index in futures:
+                    continue
+                progress = progress_for(plugin_id)
+                if plugin_id in unknown:
+                    outcomes[index] = self._skip_unknown(plugin_id, progress)
+                # 1. ¿Es un paquete binario del sistema?
+                elif is_binary_tool(plugin_id):
+                    outcomes[index] = self._binary_outcome(
+                        plugin_id, package_manager, packages, progress
+                    )
+                # 2. ¿Es un plugin externo de Git?
+                elif plugin_id in EXTERNAL_URLS:
+                    target_path = self.custom_dir / "plugins" / plugin_id
+                    if target_path.exists() or (futures and plugin_id in queued):
+                        progress(f"Plugin Git ya existe: {plugin_id}")
+                        outcomes[index] = InstallResult(skipped=[plugin_id])
                     else:
-                        result.installed.append(plugin_id)
+                        outcomes[index] = self._clone_plugin(
+                            plugin_id, EXTERNAL_URLS[plugin_id], target_path, progress
+                        )
+                # 3. ¿Es un plugin nativo de OMZ?
+                # No requiere instalación física, solo estar en la lista del .zshrc
                 else:
-                    on_progress(f"Plugin Git ya existe: {plugin_id}")
-                    result.skipped.append(plugin_id)
-
-            # 3. ¿Es un plugin nativo de OMZ?
-            # No requiere instalación física, solo estar en la lista del .zshrc
-            else:
-                on_progress(f"Activando plugin nativo: {plugin_id}")
-                result.skipped.append(plugin_id)
+                    progress(f"Activando plugin nativo: {plugin_id}")
+                    outcomes[index] = InstallResult(skipped=[plugin_id])
+            for index, future in futures.items():
+                outcomes[index] = future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
 
+        result = InstallResult()
+        for index in sorted(outcomes):
+            result.merge(outcomes[index])
         if result.failed:
             result.ok = False
             message = "Fallaron: " + ", ".join(result.failed)
@@ -197,6 +290,77 @@ class PluginInstaller:
         self._log_install(result)
         return result
 
+    def _skip_unknown(self, plugin_id: str, on_progress: Callable[[str], None]) -> InstallResult:
+        message = f"ID desconocido omitido: {plugin_id}"
+        on_progress(message)
+        return InstallResult(skipped=[plugin_id], messages=[message])
+
+    def _install_binary_batch(
+        self, plugin_ids: List[str], package_manager: str, on_progress: Callable[[str], None]
+    ) -> dict[str, bool]:
+        """Instala todos los binarios soportados en una única transacción."""
+        package_names = []
+        for plugin_id in dict.fromkeys(plugin_ids):
+            if is_binary_tool(plugin_id) and binary_supported(plugin_id, package_manager):
+                on_progress(f"Instalando paquete binario: {plugin_id}")
+                package_names.append(binary_package_name(plugin_id, package_manager))
+        if not package_names:
+            return {}
+        self._refresh_repos(on_progress)
+        return self.platform.install_packages(package_names, on_progress=on_progress)
+
+    def _refresh_repos(self, on_progress: Callable[[str], None]) -> None:
+        """Actualiza las listas de paquetes solo si superan el TTL y lo registra."""
+        decision = self.platform.update_repos_if_stale(self.repo_ttl)
+        age = decision.get("age_seconds")
+        age_text = "desconocida" if age is None else f"{int(age)}s"
+        if decision.get("action") == "skipped":
+            on_progress(f"Listas de paquetes frescas (edad {age_text}); se omite update.")
+        elif decision.get("action") == "failed":
+            on_progress("No se pudieron actualizar las listas de paquetes.")
+        elif decision.get("action") == "manual":
+            on_progress(
+                f"Listas de paquetes con edad {age_text}; refréscalas a mano "
+                "(p. ej. `sudo pacman -Syu`) si falta algún paquete."
+            )
+        write_operation_log(
+            self.home / ".omega-zsh",
+            "update-repos",
+            [
+                f"action={decision.get('action')}",
+                f"age={age_text}",
+                f"ttl={decision.get('ttl_seconds')}s",
+                f"package_manager={_platform_package_manager(self.platform)}",
+            ],
+        )
+
+    def _binary_outcome(
+        self,
+        plugin_id: str,
+        package_manager: str,
+        packages: dict[str, bool],
+        on_progress: Callable[[str], None],
+    ) -> InstallResult:
+        if not binary_supported(plugin_id, package_manager):
+            message = f"Herramienta no soportada en {package_manager}: {plugin_id}"
+            on_progress(message)
+            return InstallResult(unsupported=[plugin_id], skipped=[plugin_id], messages=[message])
+        if not packages.get(binary_package_name(plugin_id, package_manager)):
+            on_progress(f"Error instalando paquete binario: {plugin_id}")
+            return InstallResult(ok=False, failed=[plugin_id])
+        return InstallResult(installed=[plugin_id])
+
+    def _clone_plugin(
+        self, plugin_id: str, url: str, target_path: Path, on_progress: Callable[[str], None]
+    ) -> InstallResult:
+        on_progress(f"Clonando plugin Git: {plugin_id}")
+        if not self._git_clone(url, target_path, on_progress):
+            on_progress(f"Error clonando plugin Git: {plugin_id}")
+            return InstallResult(ok=False, failed=[plugin_id])
+        # Cada clon ya corre en su propio hilo; un solo zsh por plugin basta.
+        zcompile_files(plugin_sources(target_path), jobs=1)
+        return InstallResult(installed=[plugin_id])
+
     def _log_install(self, result: InstallResult) -> None:
         write_operation_log(
             self.home / ".omega-zsh",
@@ -215,6 +379,9 @@ class PluginInstaller:
         """
         Clona un repositorio git de forma silenciosa con timeout.
 
+        Primero intenta un clon local desde el mirror de `self.git_cache`; sin
+        caché o sin mirror utilizable clona desde la red con `--depth 1`.
+
         Args:
             url (str): URL del repositorio Git.
             target (Path): Directorio destino local.
@@ -227,20 +394,12 @@ class PluginInstaller:
                 on_progress(f"Plugin ya existe: {target.name}")
                 return True
 
-            process = subprocess.Popen(
-                ["git", "clone", "--depth", "1", url, str(target)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            if process.stdout:
-                for line in process.stdout:
-                    on_progress(f"  [git] {line.strip()}")
-
-            try:
-                return_code = process.wait(timeout=300)  # 5 minutos máximo
-            except subprocess.TimeoutExpired:
-                process.kill()
+            if self.git_cache is not None and self.git_cache.clone(url, target, on_progress):
+                return True
+
+            on_progress(f"Clonando desde la red: {url}")
+            return_code = run_git(["git", "clone", "--depth", "1", url, str(target)], on_progress)
+            if return_code is None:
                 on_progress(f"Error: Timeout clonando {url}")
                 return False
 
@@ -265,4 +424,7 @@ class PluginInstaller:
             return True
 
         on_progress("Oh My Zsh no encontrado. Clonando...")
-        return self._git_clone("https://github.com/ohmyzsh/ohmyzsh.git", omz_dir, on_progress)
+        if not self._git_clone("https://github.com/ohmyzsh/ohmyzsh.git", omz_dir, on_progress):
+            return False
+        zcompile_files(omz_sources(omz_dir), jobs=self.jobs)
+        return True
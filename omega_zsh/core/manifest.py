@@ -4,20 +4,46 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+# Past this many journal bytes the next commit folds it into manifest.json.
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+# path -> (snapshot/journal stat signature, replayed manifest data)
+_INDEX_CACHE: dict[Path, tuple[tuple, dict[str, Any]]] = {}
+
 
 def default_manifest_path(home: Path) -> Path:
     return home / ".omega-zsh" / "manifest.json"
 
 
-def load_manifest(path: Path) -> dict[str, Any]:
+def manifest_journal_path(path: Path) -> Path:
+    return path.with_suffix(".journal")
+
+
+def _empty_manifest() -> dict[str, Any]:
+    return {"version": 1, "files": {}}
+
+
+def _stat_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _manifest_signature(path: Path) -> tuple:
+    return (_stat_signature(path), _stat_signature(manifest_journal_path(path)))
+
+
+def _read_snapshot(path: Path) -> dict[str, Any]:
     if not path.exists():
-        return {"version": 1, "files": {}}
+        return _empty_manifest()
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
     except Exception:
-        return {"version": 1, "files": {}}
+        return _empty_manifest()
     if not isinstance(data, dict):
-        return {"version": 1, "files": {}}
+        return _empty_manifest()
     data.setdefault("version", 1)
     data.setdefault("files", {})
     if not isinstance(data["files"], dict):
@@ -25,11 +51,228 @@ def load_manifest(path: Path) -> dict[str, Any]:
     return data
 
 
+def _journal_record(key: str, entry: dict[str, Any] | None) -> dict[str, Any]:
+    if entry is None:
+        return {"op": "del", "key": key}
+    return {"op": "set", "key": key, "entry": entry}
+
+
+def _apply_journal_line(files: dict[str, Any], record: Any) -> None:
+    if not isinstance(record, dict) or not isinstance(record.get("key"), str):
+        return
+    if record.get("op") == "set" and isinstance(record.get("entry"), dict):
+        files[record["key"]] = record["entry"]
+    elif record.get("op") == "del":
+        files.pop(record["key"], None)
+
+
+def _replay_journal(path: Path, files: dict[str, Any]) -> None:
+    journal_path = manifest_journal_path(path)
+    if not journal_path.exists():
+        return
+    try:
+        with open(journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Línea truncada por un corte a mitad de escritura
+                _apply_journal_line(files, record)
+    except OSError:
+        return
+
+
+def _load_index(path: Path) -> dict[str, Any]:
+    """Return the replayed manifest, reusing it while neither file changed on disk."""
+    signature = _manifest_signature(path)
+    cached = _INDEX_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    data = _read_snapshot(path)
+    _replay_journal(path, data["files"])
+    _INDEX_CACHE[path] = (signature, data)
+    return data
+
+
+def load_manifest(path: Path) -> dict[str, Any]:
+    """Load manifest.json plus the pending journal entries appended after it."""
+    data = _load_index(path)
+    return {**data, "files": dict(data["files"])}
+
+
 def save_manifest(path: Path, data: dict[str, Any]) -> None:
+    """Write a full snapshot atomically and drop the journal it supersedes."""
     path.parent.mkdir(parents=True, exist_ok=True)
     temp_path = path.with_suffix(".tmp")
     temp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
     temp_path.replace(path)
+    manifest_journal_path(path).unlink(missing_ok=True)
+    _INDEX_CACHE[path] = (
+        _manifest_signature(path),
+        {**data, "files": dict(data.get("files", {}))},
+    )
+
+
+def append_manifest_journal(path: Path, changes: dict[str, dict[str, Any] | None]) -> None:
+    """Append one JSONL record per change; `None` marks a removed entry."""
+    if not changes:
+        return
+    lines = [
+        json.dumps(_journal_record(key, entry), ensure_ascii=False) + "\n"
+        for key, entry in changes.items()
+    ]
+
+    previous = _manifest_signature(path)
+    journal_path = manifest_journal_path(path)
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(journal_path, "a", encoding="utf-8") as journal:
+        journal.write("".join(lines))
+
+    cached = _INDEX_CACHE.get(path)
+    if cached is not None and cached[0] == previous:
+        files = cached[1]["files"]
+        for key, entry in changes.items():
+            _apply_journal_line(files, _journal_record(key, entry))
+        _INDEX_CACHE[path] = (_manifest_signature(path), cached[1])
+
+
+def _drop_missing_backups(files: dict[str, Any]) -> list[str]:
+    removed = [
+        key
+        for key, entry in files.items()
+        if isinstance(entry, dict) and entry.get("kind") == "backup" and not os.path.lexists(key)
+    ]
+    for key in removed:
+        del files[key]
+    return removed
+
+
+def compact_manifest(path: Path) -> None:
+    """Fold the journal into manifest.json, dropping backups deleted from disk."""
+    data = load_manifest(path)
+    _drop_missing_backups(data["files"])
+    save_manifest(path, data)
+
+
+def _entry_matches(
+    entry: dict[str, Any] | None,
+    kind: str | None = None,
+    metadata: dict[str, Any] | None = None,
+) -> bool:
+    if entry is None:
+        return False
+    if kind is not None and entry.get("kind") != kind:
+        return False
+    if metadata:
+        entry_metadata = entry.get("metadata") if isinstance(entry.get("metadata"), dict) else {}
+        for key, value in metadata.items():
+            if entry_metadata.get(key) != value:
+                return False
+    return True
+
+
+class ManifestTransaction:
+    """Load the manifest once, batch records and lookups in memory, save once.
+
+    Use as a context manager; the accumulated records are written on exit as
+    one journal append, or as a compacted snapshot when there is none yet or
+    the journal grew past `JOURNAL_COMPACT_BYTES`. Records describe
+    filesystem changes that already happened, so they are committed even
+    when the block raises.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.data: dict[str, Any] = _empty_manifest()
+        self.dirty = False
+        self._loaded = False
+        self._rewrite = False
+        self._changes: dict[str, dict[str, Any] | None] = {}
+
+    def __enter__(self) -> "ManifestTransaction":
+        if not self._loaded:
+            self.load()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.commit()
+
+    def load(self) -> None:
+        self.data = load_manifest(self.path)
+        self._changes = {}
+        self._loaded = True
+
+    def mark_dirty(self) -> None:
+        """Force this transaction's commits to rewrite the full snapshot."""
+        self.dirty = True
+        self._rewrite = True
+
+    def record(
+        self,
+        file_path: Path,
+        kind: str,
+        action: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        key = str(file_path.expanduser())
+        entry = {
+            "kind": kind,
+            "action": action,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "metadata": metadata or {},
+        }
+        self.data["files"][key] = entry
+        self._changes[key] = entry
+        self.dirty = True
+
+    def forget(self, file_path: Path) -> None:
+        key = str(file_path.expanduser())
+        if self.data["files"].pop(key, None) is None:
+            return
+        self._changes[key] = None
+        self.dirty = True
+
+    def get(self, file_path: Path) -> dict[str, Any] | None:
+        entry = self.data["files"].get(str(file_path.expanduser()))
+        return entry if isinstance(entry, dict) else None
+
+    def is_managed(
+        self,
+        file_path: Path,
+        kind: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> bool:
+        return _entry_matches(self.get(file_path), kind, metadata)
+
+    def require_managed_or_absent(
+        self,
+        file_path: Path,
+        kind: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> bool:
+        if not path_exists_or_is_symlink(file_path):
+            return True
+        return self.is_managed(file_path, kind, metadata)
+
+    def commit(self) -> None:
+        if not self.dirty or not self._loaded:
+            return
+        if self._needs_compaction():
+            _drop_missing_backups(self.data["files"])
+            save_manifest(self.path, self.data)
+        else:
+            append_manifest_journal(self.path, self._changes)
+        self._changes = {}
+        self.dirty = False
+
+    def _needs_compaction(self) -> bool:
+        if self._rewrite or not self.path.exists():
+            return True
+        try:
+            size = manifest_journal_path(self.path).stat().st_size
+        except OSError:
+            return False
+        return size >= JOURNAL_COMPACT_BYTES
 
 
 def record_managed_file(
@@ -39,20 +282,12 @@ def record_managed_file(
     action: str,
     metadata: dict[str, Any] | None = None,
 ) -> None:
-    manifest = load_manifest(manifest_path)
-    key = str(file_path.expanduser())
-    manifest["files"][key] = {
-        "kind": kind,
-        "action": action,
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-        "metadata": metadata or {},
-    }
-    save_manifest(manifest_path, manifest)
+    with ManifestTransaction(manifest_path) as manifest:
+        manifest.record(file_path, kind, action, metadata)
 
 
 def get_managed_file(manifest_path: Path, file_path: Path) -> dict[str, Any] | None:
-    manifest = load_manifest(manifest_path)
-    entry = manifest.get("files", {}).get(str(file_path.expanduser()))
+    entry = _load_index(manifest_path)["files"].get(str(file_path.expanduser()))
     return entry if isinstance(entry, dict) else None
 
 
@@ -62,17 +297,7 @@ def is_managed_file(
     kind: str | None = None,
     metadata: dict[str, Any] | None = None,
 ) -> bool:
-    entry = get_managed_file(manifest_path, file_path)
-    if entry is None:
-        return False
-    if kind is not None and entry.get("kind") != kind:
-        return False
-    if metadata:
-        entry_metadata = entry.get("metadata") if isinstance(entry.get("metadata"), dict) else {}
-        for key, value in metadata.items():
-            if entry_metadata.get(key) != value:
-                return False
-    return True
+    return _entry_matches(get_managed_file(manifest_path, file_path), kind, metadata)
 
 
 def path_exists_or_is_symlink(path: Path) -> bool:
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from .constants import is_binary_tool, valid_selected_plugins
+from .state import AppState, is_safe_minimal_state
+
+
+def omz_sources(omz_dir: Path) -> list[Path]:
+    """`oh-my-zsh.sh` plus every `lib/*.zsh` it sources on startup."""
+    if not (omz_dir / "oh-my-zsh.sh").is_file():
+        return []
+    return [omz_dir / "oh-my-zsh.sh", *sorted((omz_dir / "lib").glob("*.zsh"))]
+
+
+def plugin_sources(plugin_dir: Path) -> list[Path]:
+    """Top-level `*.zsh` files of a plugin (`<id>.plugin.zsh` and what it sources)."""
+    return sorted(path for path in plugin_dir.glob("*.zsh") if path.is_file())
+
+
+def _plugin_dir(omz_dir: Path, plugin_id: str) -> Path | None:
+    # Misma precedencia que OMZ: custom/ sobrescribe los plugins nativos.
+    for base in (omz_dir / "custom" / "plugins", omz_dir / "plugins"):
+        if (base / plugin_id).is_dir():
+            return base / plugin_id
+    return None
+
+
+def _theme_file(omz_dir: Path, theme: str) -> Path | None:
+    for base in (omz_dir / "custom" / "themes", omz_dir / "themes"):
+        if (base / f"{theme}.zsh-theme").is_file():
+            return base / f"{theme}.zsh-theme"
+    return None
+
+
+def zcompile_targets(context: Any, state: AppState) -> list[Path]:
+    """Scripts a shell built from `state` sources at startup, in load order.
+
+    Covers the generated `.zshrc`, `personal.zsh`/`custom.zsh`, Oh My Zsh and
+    its libs, the selected plugins and both prompt themes. Missing files are
+    left out.
+    """
+    targets = [
+        context.zshrc_path,
+        context.omega_dir / "personal.zsh",
+        context.omega_dir / "custom.zsh",
+    ]
+    omz_dir = context.omz_dir
+    targets.extend(omz_sources(omz_dir))
+    if not is_safe_minimal_state(state):
+        for plugin_id in valid_selected_plugins(
+            state.selected_plugins, state.allowed_custom_plugins
+        ):
+            plugin_dir = None if is_binary_tool(plugin_id) else _plugin_dir(omz_dir, plugin_id)
+            if plugin_dir is not None:
+                targets.extend(plugin_sources(plugin_dir))
+    for theme in (state.selected_theme, state.selected_root_theme):
+        theme_file = _theme_file(omz_dir, theme)
+        if theme_file is not None:
+            targets.append(theme_file)
+    return [path for path in dict.fromkeys(targets) if path.is_file()]
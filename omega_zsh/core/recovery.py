@@ -1,14 +1,20 @@
 import re
 from dataclasses import dataclass, field
-from datetime import datetime
 from pathlib import Path
 
-from .backup import create_backup, restore_backup
+from .backup import (
+    BackupRecord,
+    backup_file,
+    file_sha256,
+    iter_valid_backups,
+    list_backups,
+    restore_backup,
+)
 from .context import SystemContext
 from .shell import validate_zsh_syntax
+from .validation_cache import ValidationCache
 
 OMEGA_RE = re.compile(r"omega[-_]?zsh|omega_zsh|omegazsh|omega-zsh-python", re.IGNORECASE)
-ZSHRC_BACKUP_RE = re.compile(r"\.zshrc\.(\d{8}-\d{6})\.bak$")
 
 
 @dataclass
@@ -47,9 +53,10 @@ def _safe_name(path: Path) -> str:
     return str(path).replace("/", "__")
 
 
-def _record_backup(result: RecoveryResult, backup_path: Path | None) -> None:
-    if backup_path:
-        result.backups.append(str(backup_path))
+def _record_backup(result: RecoveryResult, record: BackupRecord | None) -> None:
+    if record:
+        result.backups.append(str(record.path))
+        result.messages.append(f"Backed up {record.source} ({record.copy_method})")
 
 
 def _backup_file(context: SystemContext, path: Path, result: RecoveryResult, dry_run: bool) -> None:
@@ -58,7 +65,9 @@ def _backup_file(context: SystemContext, path: Path, result: RecoveryResult, dry
     if dry_run:
         result.messages.append(f"Would back up {path}")
         return
-    _record_backup(result, create_backup(path, _backup_dir(context)))
+    # Almacén propio en ~/.omega-zsh-recovery/objects: la copia de seguridad de
+    # recovery no depende de que ~/.omega-backups siga existiendo.
+    _record_backup(result, backup_file(path, _backup_dir(context)))
 
 
 def _clean_shell_file(
@@ -155,45 +164,31 @@ def _latest_valid_zshrc_backup(context: SystemContext) -> Path | None:
     return backups[0] if backups else None
 
 
-def _backup_sort_key(path: Path) -> tuple[datetime, float]:
-    match = ZSHRC_BACKUP_RE.search(path.name)
-    if match:
-        try:
-            timestamp = datetime.strptime(match.group(1), "%Y%m%d-%H%M%S")
-            return timestamp, path.stat().st_mtime
-        except ValueError:
-            pass
-    return datetime.fromtimestamp(0), path.stat().st_mtime
-
-
 def list_zshrc_backups(context: SystemContext | None = None) -> list[Path]:
     context = context or SystemContext()
-    candidates: list[Path] = []
     omega_backups = context.zshrc_path.parent / ".omega-backups"
-    if omega_backups.exists():
-        candidates.extend(omega_backups.glob(f"{context.zshrc_path.name}.*.bak"))
-    legacy_recovery = _backup_dir(context)
-    if legacy_recovery.exists():
-        legacy = legacy_recovery / _safe_name(context.zshrc_path)
-        if legacy.exists():
-            candidates.append(legacy)
-        candidates.extend(legacy_recovery.glob(f"{context.zshrc_path.name}.*.bak"))
-
-    backups = sorted(
-        [path for path in candidates if path.is_file()],
-        key=_backup_sort_key,
-        reverse=True,
-    )
-    valid_backups = []
+    records = list_backups(omega_backups, context.zshrc_path.name)
+    records.extend(list_backups(_backup_dir(context), context.zshrc_path.name))
+    records.sort(key=lambda record: record.timestamp, reverse=True)
+
+    cache = ValidationCache.for_omega_dir(context.omega_dir)
+
+    def validate(path: Path) -> tuple[bool, str]:
+        return cache.validate(path, validate_zsh_syntax)
+
+    # Deduplicar después de filtrar: si la copia más nueva de un contenido ya no
+    # existe, sigue valiendo una más antigua.
     seen = set()
-    for backup in backups:
-        resolved = backup.resolve(strict=False)
-        if resolved in seen:
-            continue
-        valid, _ = validate_zsh_syntax(backup)
-        if valid:
-            valid_backups.append(backup)
-            seen.add(resolved)
+    valid_backups = []
+    for record in iter_valid_backups(records, validate):
+        if record.sha256 not in seen:
+            seen.add(record.sha256)
+            valid_backups.append(record.path)
+    # Copia única del formato antiguo de recovery, fuera del índice; va al final.
+    legacy = _backup_dir(context) / _safe_name(context.zshrc_path)
+    if legacy.is_file() and file_sha256(legacy) not in seen and validate(legacy)[0]:
+        valid_backups.append(legacy)
+    cache.flush()
     return valid_backups
 
 
@@ -215,9 +210,9 @@ def restore_zshrc_backup(
         result.messages.append(f"Would restore {selected} -> {context.zshrc_path}")
         return result
     _backup_file(context, context.zshrc_path, result, dry_run=False)
-    restore_backup(selected, context.zshrc_path)
+    method = restore_backup(selected, context.zshrc_path)
     result.changed.append(str(context.zshrc_path))
-    result.messages.append(f"Restored .zshrc from {selected}")
+    result.messages.append(f"Restored .zshrc from {selected} ({method})")
     return result
 
 
@@ -1,14 +1,313 @@
+import atexit
+import itertools
+import os
+import queue
+import select
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from shutil import which
+from typing import Iterable
+
+ZCOMPILE_JOBS = 4
+ZCOMPILE_TIMEOUT_SECONDS = 60
+
+ZSH_POOL_SIZE = 2
+ZSH_POOL_TIMEOUT_SECONDS = 10
+# Un worker se recicla tras este número de peticiones para acotar su estado.
+ZSH_POOL_MAX_REQUESTS = 500
+# Tras dos workers nuevos seguidos sin protocolo, el pool descansa este tiempo.
+ZSH_POOL_RETRY_SECONDS = 30
+
+# Bucle de cada worker: petición = id, tipo y carga; respuesta = id, estado,
+# stdout y stderr. Cada campo termina en NUL.
+_WORKER_SCRIPT = r"""
+zmodload zsh/parameter 2>/dev/null
+_omega_err=$1
+if [[ -n $2 && -d $2/lib ]]; then
+    {
+        export ZSH=$2
+        fpath=("$2/functions" "$2/completions" $fpath)
+        autoload -U colors && colors
+        autoload -Uz vcs_info
+        for _f in "$2"/lib/{git,theme-and-appearance,functions,prompt_info_functions}.zsh; do
+            [[ -r $_f ]] && source "$_f"
+        done
+    } >/dev/null 2>&1
+fi
+# Cualquier salida aquí se mezclaría con la primera respuesta del protocolo.
+[[ -f ~/.cargo/env ]] && source ~/.cargo/env >/dev/null 2>&1
+function _omega_syntax() {
+    # Equivale a `zsh -n`: se parsea todo el buffer y no se ejecuta nada.
+    setopt localoptions noaliases
+    eval "setopt localoptions noexec"$'\n'"$1"
+}
+function _omega_prompt() {
+    source "$1" && print -P -- "$PROMPT" && print -P -- "$RPROMPT"
+}
+while IFS= read -r -d '' _id && IFS= read -r -d '' _kind && IFS= read -r -d '' _payload; do
+    _out=""
+    case $_kind in
+        syntax) _omega_syntax "$_payload" >/dev/null 2>$_omega_err ;;
+        prompt) _out=$(_omega_prompt "$_payload" 2>$_omega_err) ;;
+        *) print -r -- "unknown request: $_kind" 2>/dev/null >$_omega_err; false ;;
+    esac
+    _status=$?
+    print -rn -- "$_id"$'\0'"$_status"$'\0'"$_out"$'\0'"$(<$_omega_err)"$'\0'
+done
+"""
+
+
+class ZshWorkerError(RuntimeError):
+    """A pooled zsh worker died or answered outside the protocol."""
+
+
+class _FreshWorkerError(ZshWorkerError):
+    """A worker failed on its very first request."""
+
+
+@dataclass
+class ZshReply:
+    status: int
+    stdout: str
+    stderr: str
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 0
+
+
+class _ZshWorker:
+    def __init__(self, zsh_bin: str, omz_dir: Path | None):
+        fd, err_path = tempfile.mkstemp(prefix="omega-zsh-worker-", suffix=".err")
+        os.close(fd)
+        self.err_path = Path(err_path)
+        self.requests = 0
+        try:
+            self.process = subprocess.Popen(
+                [
+                    zsh_bin,
+                    "-f",
+                    "-c",
+                    _WORKER_SCRIPT,
+                    "omega-zsh-worker",
+                    str(self.err_path),
+                    str(omz_dir or ""),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            self.err_path.unlink(missing_ok=True)
+            raise
+
+    def request(self, request_id: int, kind: str, payload: str, timeout: float) -> ZshReply:
+        self.requests += 1
+        try:
+            self.process.stdin.write(f"{request_id}\0{kind}\0{payload}\0".encode("utf-8"))
+            self.process.stdin.flush()
+        except OSError as exc:
+            raise ZshWorkerError(f"worker zsh no disponible: {exc}") from exc
+        fields = self._read_fields(4, timeout)
+        if fields[0] != str(request_id) or not fields[1].isdigit():
+            raise ZshWorkerError("respuesta fuera de protocolo")
+        return ZshReply(int(fields[1]), fields[2], fields[3])
+
+    def _read_fields(self, count: int, timeout: float) -> list[str]:
+        fd = self.process.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        buffer = b""
+        while buffer.count(b"\0") < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError(f"zsh no respondió en {timeout} s")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise ZshWorkerError("el worker zsh terminó")
+            buffer += chunk
+        return buffer.decode("utf-8", errors="replace").split("\0")[:count]
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self.err_path.unlink(missing_ok=True)
+
+
+class ZshWorkerPool:
+    """Long-lived `zsh -f` coprocesses that answer framed requests over pipes.
+
+    Workers preload the Oh My Zsh libs a theme needs, start lazily (at most
+    `size`) and serve syntax checks and prompt renders for the cost of a
+    pipe round-trip. A worker that times out, dies or reaches `max_requests`
+    is killed and its slot respawns on the next request.
+    """
+
+    def __init__(
+        self,
+        size: int = ZSH_POOL_SIZE,
+        zsh_bin: str | None = None,
+        omz_dir: Path | None = None,
+        timeout: float = ZSH_POOL_TIMEOUT_SECONDS,
+        max_requests: int = ZSH_POOL_MAX_REQUESTS,
+    ):
+        self.zsh_bin = zsh_bin or which("zsh")
+        if not self.zsh_bin:
+            raise FileNotFoundError("zsh no está en PATH")
+        self.omz_dir = omz_dir
+        self.timeout = timeout
+        self.max_requests = max_requests
+        self._broken_until = 0.0
+        self._ids = itertools.count(1)
+        # None = hueco libre: el worker se arranca al primer uso.
+        self._slots: queue.LifoQueue[_ZshWorker | None] = queue.LifoQueue()
+        for _ in range(max(1, size)):
+            self._slots.put(None)
+
+    @property
+    def broken(self) -> bool:
+        """True while the pool rests after fresh workers failed the protocol."""
+        return time.monotonic() < self._broken_until
+
+    def request(self, kind: str, payload: str, timeout: float | None = None) -> ZshReply:
+        """Send one request; raises TimeoutError or ZshWorkerError on failure.
+
+        A fresh worker that fails the protocol is replaced once at once; if
+        the replacement fails too, the pool reports itself broken for
+        ZSH_POOL_RETRY_SECONDS and then tries again.
+        """
+        if "\0" in payload:
+            raise ValueError("la carga no puede contener NUL")
+        if self.broken:
+            raise ZshWorkerError(f"{self.zsh_bin} no habla el protocolo del pool")
+        try:
+            return self._request(kind, payload, timeout)
+        except _FreshWorkerError:
+            pass
+        try:
+            return self._request(kind, payload, timeout)
+        except _FreshWorkerError as exc:
+            self._broken_until = time.monotonic() + ZSH_POOL_RETRY_SECONDS
+            raise ZshWorkerError(str(exc)) from exc
+
+    def _request(self, kind: str, payload: str, timeout: float | None) -> ZshReply:
+        worker = self._slots.get()
+        healthy = False
+        try:
+            if worker is None:
+                worker = _ZshWorker(self.zsh_bin, self.omz_dir)
+            reply = worker.request(next(self._ids), kind, payload, timeout or self.timeout)
+            healthy = worker.requests < self.max_requests
+            return reply
+        except ZshWorkerError as exc:
+            if worker is not None and worker.requests == 1:
+                # Un worker recién arrancado que no responde no es un fallo puntual.
+                raise _FreshWorkerError(str(exc)) from exc
+            raise
+        finally:
+            if healthy:
+                self._slots.put(worker)
+            else:
+                if worker is not None:
+                    worker.close()
+                self._slots.put(None)
+
+    def check_syntax(self, content: str) -> tuple[bool, str]:
+        reply = self.request("syntax", content)
+        if reply.ok:
+            return True, "zsh syntax ok"
+        return False, reply.stderr.strip() or "zsh syntax validation failed"
+
+    def render_prompt(self, theme_path: Path, timeout: float | None = None) -> ZshReply:
+        """Source a theme in a subshell of a warm worker and print PROMPT/RPROMPT."""
+        return self.request("prompt", str(theme_path), timeout)
+
+    def close(self) -> None:
+        while True:
+            try:
+                worker = self._slots.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.close()
+
+    def __enter__(self) -> "ZshWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_default_pool: ZshWorkerPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def default_zsh_pool() -> ZshWorkerPool | None:
+    """Process-wide pool for the `zsh` on PATH; None when zsh is missing."""
+    global _default_pool
+    zsh_bin = which("zsh")
+    if not zsh_bin:
+        return None
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool.zsh_bin != zsh_bin:
+            if _default_pool is not None:
+                _default_pool.close()
+            omz_dir = Path(os.environ.get("ZSH", str(Path.home() / ".oh-my-zsh")))
+            _default_pool = ZshWorkerPool(zsh_bin=zsh_bin, omz_dir=omz_dir)
+        return _default_pool
+
+
+def close_default_zsh_pool() -> None:
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+            _default_pool = None
+
+
+atexit.register(close_default_zsh_pool)
+
+
+def zsh_identity() -> str | None:
+    """Stable id of the `zsh` on PATH (resolved path, size, mtime) without running it."""
+    zsh_bin = which("zsh")
+    if not zsh_bin:
+        return None
+    try:
+        real = Path(zsh_bin).resolve()
+        stat = real.stat()
+    except OSError:
+        return None
+    return f"{real}:{stat.st_size}:{stat.st_mtime_ns}"
 
 
 def validate_zsh_syntax(path: Path) -> tuple[bool, str]:
-    """Validate a zsh script with `zsh -n` when zsh is available."""
+    """Validate a zsh script when zsh is available.
+
+    Goes through the shared worker pool; a one-shot `zsh -n` is the fallback
+    when no worker can answer in time or the file cannot be framed, so every
+    returned verdict comes from zsh itself.
+    """
     zsh_bin = which("zsh")
     if not zsh_bin:
         return True, "zsh not found; syntax validation skipped"
 
+    pool = default_zsh_pool()
+    if pool is not None:
+        try:
+            return pool.check_syntax(path.read_text(encoding="utf-8"))
+        except (TimeoutError, ZshWorkerError, ValueError, OSError):
+            pass
     result = subprocess.run(
         [zsh_bin, "-n", str(path)],
         capture_output=True,
@@ -18,3 +317,110 @@ def validate_zsh_syntax(path: Path) -> tuple[bool, str]:
     if result.returncode == 0:
         return True, "zsh syntax ok"
     return False, (result.stderr or result.stdout or "zsh syntax validation failed").strip()
+
+
+def zcompile_file(path: Path) -> bool:
+    """Compile a zsh script to `<path>.zwc`; False when zsh is missing or it fails."""
+    zsh_bin = which("zsh")
+    if not zsh_bin:
+        return False
+    try:
+        result = subprocess.run(
+            [zsh_bin, "-c", 'zcompile "$1"', "--", str(path)],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0
+
+
+def zwc_path(path: Path) -> Path:
+    return path.with_name(path.name + ".zwc")
+
+
+def zcompile_is_fresh(path: Path) -> bool:
+    """Same rule zsh applies when sourcing: the `.zwc` must not be older than the script."""
+    try:
+        return zwc_path(path).stat().st_mtime >= path.stat().st_mtime
+    except OSError:
+        return False
+
+
+def _zcompile_chunk(zsh_bin: str, chunk: list[Path]) -> None:
+    try:
+        subprocess.run(
+            [zsh_bin, "-f", "-c", 'for f; do zcompile "$f"; done', "zcompile", *map(str, chunk)],
+            capture_output=True,
+            text=True,
+            timeout=ZCOMPILE_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+
+def zcompile_files(paths: Iterable[Path], jobs: int = ZCOMPILE_JOBS) -> list[Path]:
+    """Compile every stale script to `.zwc` using at most `jobs` zsh processes.
+
+    Each process compiles a whole chunk of files, so compiling N scripts costs
+    `jobs` forks instead of N. Returns the `.zwc` files that are now fresh.
+    """
+    stale = [
+        path for path in dict.fromkeys(paths) if path.is_file() and not zcompile_is_fresh(path)
+    ]
+    zsh_bin = which("zsh")
+    if not stale or not zsh_bin:
+        return []
+    workers = max(1, min(jobs, len(stale)))
+    chunks = [stale[index::workers] for index in range(workers)]
+    if workers == 1:
+        _zcompile_chunk(zsh_bin, chunks[0])
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda chunk: _zcompile_chunk(zsh_bin, chunk), chunks))
+    return [zwc_path(path) for path in stale if zcompile_is_fresh(path)]
+
+
+def zsh_fpath() -> list[str] | None:
+    """Default `$fpath` of the installed zsh, without user startup files."""
+    zsh_bin = which("zsh")
+    if not zsh_bin:
+        return None
+    try:
+        result = subprocess.run(
+            [zsh_bin, "-f", "-c", "print -rl -- $fpath"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def build_compdump(dump: Path, fpath: list[str]) -> bool:
+    """Run a full `compinit` over exactly `fpath`, writing its dump to `dump`."""
+    zsh_bin = which("zsh")
+    if not zsh_bin:
+        return False
+    try:
+        result = subprocess.run(
+            [
+                zsh_bin,
+                "-f",
+                "-c",
+                'dump=$1; shift; fpath=("$@"); autoload -Uz compinit && compinit -i -d "$dump"',
+                "compinit",
+                str(dump),
+                *fpath,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=ZCOMPILE_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0 and dump.is_file()
@@ -3,7 +3,9 @@ import logging
 import re
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Dict, List
+
+from .constants import DEFAULT_HEADER_CACHE_TTL, LOAD_STRATEGIES
 
 
 @dataclass
@@ -15,6 +17,16 @@ class AppState:
     selected_header: str = "fastfetch"
     header_text: str = "Omega"
     header_font: str = "slant"
+    # Seconds a cached fastfetch header is shown before a background refresh; 0 = live.
+    header_cache_ttl: int = DEFAULT_HEADER_CACHE_TTL
+    # Render the .zshrc with zsh builtins only (no forks at shell startup).
+    zero_fork: bool = False
+    # Source OMZ libs, plugins and theme directly instead of oh-my-zsh.sh.
+    direct_load: bool = False
+    # Move environment setup to .zshenv/.zprofile; .zshrc keeps interactive setup only.
+    split_config: bool = False
+    # Overrides per plugin id of the STARTUP_IMPACT default (see LOAD_STRATEGIES).
+    plugin_load_strategies: Dict[str, str] = field(default_factory=dict)
 
 
 VALID_HEADERS = {"fastfetch", "figlet", "cowsay", "none"}
@@ -89,6 +101,22 @@ def _clean_plugins(value) -> List[str]:
     return plugins
 
 
+def _clean_ttl(value, default: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        return default
+    return value
+
+
+def _clean_load_strategies(value) -> Dict[str, str]:
+    if not isinstance(value, dict):
+        return {}
+    return {
+        plugin_id.strip().lower(): strategy
+        for plugin_id, strategy in value.items()
+        if isinstance(plugin_id, str) and plugin_id.strip() and strategy in LOAD_STRATEGIES
+    }
+
+
 def normalize_app_state(data) -> AppState:
     """Normalize untrusted JSON-like state data into a safe AppState."""
     defaults = AppState()
@@ -112,6 +140,11 @@ def normalize_app_state(data) -> AppState:
         selected_header=selected_header,
         header_text=_clean_string(data.get("header_text"), defaults.header_text),
         header_font=_clean_string(data.get("header_font"), defaults.header_font),
+        header_cache_ttl=_clean_ttl(data.get("header_cache_ttl"), defaults.header_cache_ttl),
+        zero_fork=data.get("zero_fork", defaults.zero_fork) is True,
+        direct_load=data.get("direct_load", defaults.direct_load) is True,
+        split_config=data.get("split_config", defaults.split_config) is True,
+        plugin_load_strategies=_clean_load_strategies(data.get("plugin_load_strategies")),
     )
 
 
@@ -126,6 +159,11 @@ def safe_minimal_state(previous: AppState | None = None) -> AppState:
         selected_header="none",
         header_text=base.header_text,
         header_font=base.header_font,
+        header_cache_ttl=base.header_cache_ttl,
+        zero_fork=base.zero_fork,
+        direct_load=base.direct_load,
+        split_config=base.split_config,
+        plugin_load_strategies=base.plugin_load_strategies,
     )
 
 
@@ -152,6 +190,11 @@ def apply_preset(name: str, previous: AppState | None = None) -> AppState:
             "selected_header": preset["selected_header"],
             "header_text": base.header_text,
             "header_font": base.header_font,
+            "header_cache_ttl": base.header_cache_ttl,
+            "zero_fork": base.zero_fork,
+            "direct_load": base.direct_load,
+            "split_config": base.split_config,
+            "plugin_load_strategies": base.plugin_load_strategies,
         }
     )
 
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import shlex
+import subprocess
+from pathlib import Path
+from typing import Iterable
+
+from .commands import find_command
+from .constants import TOOL_INIT_COMMANDS
+from .shell import zcompile_file
+
+INIT_TIMEOUT_SECONDS = 10
+
+
+def tool_init_cache_dir(omega_dir: Path) -> Path:
+    return omega_dir / "cache" / "init"
+
+
+def tool_init_hooks(omega_dir: Path, active_tools: Iterable[str]) -> list[dict[str, str]]:
+    """Template data for every selected tool that has a cacheable init hook."""
+    cache_dir = tool_init_cache_dir(omega_dir)
+    return [
+        {
+            "tool": tool,
+            "command": TOOL_INIT_COMMANDS[tool][0],
+            "init": shlex.join(TOOL_INIT_COMMANDS[tool]),
+            "cache": str(cache_dir / f"{tool}.zsh"),
+        }
+        for tool in active_tools
+        if tool in TOOL_INIT_COMMANDS
+    ]
+
+
+def _cache_is_fresh(cache: Path, binary: str) -> bool:
+    # Misma regla que el .zshrc: se regenera si el binario es más nuevo (`-nt`).
+    try:
+        cache_stat = cache.stat()
+        return cache_stat.st_size > 0 and os.stat(binary).st_mtime <= cache_stat.st_mtime
+    except OSError:
+        return False
+
+
+def refresh_tool_init_cache(omega_dir: Path, active_tools: Iterable[str]) -> list[Path]:
+    """Run each stale init hook once, store its output and zcompile it.
+
+    Returns the cache files that were (re)written. Missing tools and failing
+    hooks are skipped; the generated .zshrc falls back to `eval` for them.
+    """
+    written = []
+    for hook in tool_init_hooks(omega_dir, active_tools):
+        binary = find_command(hook["command"])
+        cache = Path(hook["cache"])
+        if binary is None or _cache_is_fresh(cache, binary):
+            continue
+        try:
+            result = subprocess.run(
+                [binary, *TOOL_INIT_COMMANDS[hook["tool"]][1:]],
+                capture_output=True,
+                text=True,
+                timeout=INIT_TIMEOUT_SECONDS,
+            )
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if result.returncode != 0 or not result.stdout.strip():
+            continue
+        temp_path = cache.with_suffix(".tmp")
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(result.stdout, encoding="utf-8")
+            temp_path.replace(cache)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            continue
+        zcompile_file(cache)
+        written.append(cache)
+    return written
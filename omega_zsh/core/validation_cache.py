@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Callable
+
+from .shell import zsh_identity
+
+VALIDATION_CACHE_MAX_ENTRIES = 256
+
+Validator = Callable[[Path], tuple[bool, str]]
+
+
+def validation_cache_path(omega_dir: Path) -> Path:
+    return omega_dir / "cache" / "validation.json"
+
+
+class ValidationCache:
+    """Persistent `zsh -n` verdicts keyed by sha256 of the content and the zsh build.
+
+    Entries live in a small JSON file in least-recently-used order and the
+    oldest are evicted past `max_entries`. A hit only reorders in memory;
+    the new order is written with the next miss or by `flush()`, so a
+    batch of hits costs no writes. When zsh is missing nothing is cached:
+    the validator's "skipped" answer is not a verdict.
+    """
+
+    def __init__(self, path: Path, max_entries: int = VALIDATION_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: dict[str, list] | None = None
+        self._dirty = False
+
+    @classmethod
+    def for_omega_dir(cls, omega_dir: Path) -> "ValidationCache":
+        return cls(validation_cache_path(omega_dir))
+
+    def _load(self) -> dict[str, list]:
+        if self._entries is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            self._entries = {
+                key: value
+                for key, value in (data.items() if isinstance(data, dict) else ())
+                if isinstance(value, list) and len(value) == 2
+            }
+        return self._entries
+
+    def _save(self) -> None:
+        temp_path = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(self._entries), encoding="utf-8")
+            temp_path.replace(self.path)
+            self._dirty = False
+        except OSError as exc:
+            temp_path.unlink(missing_ok=True)
+            logging.warning("No se pudo guardar la caché de validación: %s", exc)
+
+    def flush(self) -> None:
+        """Persist the LRU order changed by cache hits, if any."""
+        if self._dirty:
+            self._save()
+
+    def validate(self, path: Path, validator: Validator) -> tuple[bool, str]:
+        """Return the cached verdict for `path`'s content or run `validator` once."""
+        identity = zsh_identity()
+        try:
+            content = path.read_bytes()
+        except OSError:
+            identity = None
+        if identity is None:
+            return validator(path)
+        digest = hashlib.sha256(identity.encode("utf-8") + b"\0" + content).hexdigest()
+        entries = self._load()
+        cached = entries.get(digest)
+        if cached is not None:
+            if next(reversed(entries)) != digest:
+                # LRU: la entrada usada pasa al final; se guarda con flush().
+                entries[digest] = entries.pop(digest)
+                self._dirty = True
+            return bool(cached[0]), str(cached[1])
+        valid, message = validator(path)
+        entries[digest] = [valid, message]
+        while len(entries) > self.max_entries:
+            entries.pop(next(iter(entries)))
+        self._save()
+        return valid, message
@@ -0,0 +1,15 @@
+from .arch import ArchPlatform
+from .base import BasePlatform
+from .debian import DebianPlatform
+from .termux import TermuxPlatform
+
+
+def make_platform(ctx) -> BasePlatform:
+    """Backend de paquetes para el contexto detectado (RuntimeError si no hay soporte)."""
+    if ctx.is_termux:
+        return TermuxPlatform()
+    if ctx.package_manager_type in {"apt", "nala"}:
+        return DebianPlatform(use_nala=ctx.package_manager_type == "nala")
+    if ctx.package_manager_type == "pacman":
+        return ArchPlatform()
+    raise RuntimeError(f"Package manager no soportado: {ctx.package_manager_type}")
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Callable, List, Optional
 
 from .base import BasePlatform
@@ -7,16 +8,22 @@ class ArchPlatform(BasePlatform):
     def __init__(self):
         self.pkg_mgr = "pacman"
 
+    def package_lists_paths(self) -> List[Path]:
+        return sorted(Path("/var/lib/pacman/sync").glob("*.db"))
+
     def update_repos(self) -> bool:
         return self._run_command(["sudo", "pacman", "-Syu", "--noconfirm"])
 
     def install_package(
         self, package_name: str, on_progress: Optional[Callable[[str], None]] = None
     ) -> bool:
-        return self._run_command(
-            ["sudo", "pacman", "-S", "--noconfirm", "--needed", package_name],
-            on_progress,
-        )
+        return self._run_command(self._install_command([package_name]), on_progress)
+
+    def _install_command(self, package_names: List[str]) -> List[str]:
+        return ["sudo", "pacman", "-S", "--noconfirm", "--needed", *package_names]
+
+    def _installed_packages_command(self) -> List[str]:
+        return ["pacman", "-Qq"]
 
     def get_essential_tools(self) -> List[str]:
         return [
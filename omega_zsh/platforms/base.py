@@ -1,16 +1,69 @@
 import subprocess
+import time
 from abc import ABC, abstractmethod
-from typing import Callable, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set
+
+# Resultado de la consulta de paquetes instalados, compartido durante la sesión.
+_INSTALLED_PACKAGES_CACHE: Dict[tuple, Optional[FrozenSet[str]]] = {}
 
 
 class BasePlatform(ABC):
     COMMAND_TIMEOUT_SECONDS = 600
+    QUERY_TIMEOUT_SECONDS = 30
+    # Listas de paquetes más jóvenes que esto no se vuelven a descargar.
+    REPO_FRESHNESS_TTL_SECONDS = 6 * 3600
 
     @abstractmethod
     def update_repos(self) -> bool:
         """Actualiza los repositorios del sistema."""
         pass
 
+    def refresh_package_lists(self) -> Optional[bool]:
+        """Descarga solo las listas de paquetes, sin actualizar el sistema.
+
+        Devuelve None si el gestor no tiene un refresco seguro sin upgrade
+        (pacman -Sy deja el sistema en actualización parcial).
+        """
+        return None
+
+    def package_lists_paths(self) -> List[Path]:
+        """Ficheros/directorios cuyo mtime indica la última actualización de repos."""
+        return []
+
+    def package_lists_age(self) -> Optional[float]:
+        """Segundos desde la última actualización de repos (None si no se sabe)."""
+        stamps = []
+        for path in self.package_lists_paths():
+            try:
+                stamps.append(path.stat().st_mtime)
+            except OSError:
+                continue
+        if not stamps:
+            return None
+        return max(0.0, time.time() - max(stamps))
+
+    def update_repos_if_stale(self, ttl_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """Ejecuta `refresh_package_lists()` solo si las listas superan el TTL.
+
+        Nunca llama a `update_repos()`, que en algunos backends actualiza todo
+        el sistema. Devuelve la decisión tomada ("skipped", "updated", "failed"
+        o "manual" si el backend no puede refrescar solo las listas) junto con
+        la edad medida y el TTL aplicado, para que el llamador la registre.
+        """
+        ttl = self.REPO_FRESHNESS_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        age = self.package_lists_age()
+        decision: Dict[str, Any] = {"age_seconds": age, "ttl_seconds": ttl}
+        if age is not None and age < ttl:
+            decision["action"] = "skipped"
+            return decision
+        refreshed = self.refresh_package_lists()
+        if refreshed is None:
+            decision["action"] = "manual"
+        else:
+            decision["action"] = "updated" if refreshed else "failed"
+        return decision
+
     @abstractmethod
     def install_package(
         self, package_name: str, on_progress: Optional[Callable[[str], None]] = None
@@ -18,6 +71,73 @@ class BasePlatform(ABC):
         """Instala un paquete usando el gestor de paquetes nativo."""
         pass
 
+    def install_packages(
+        self, package_names: List[str], on_progress: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, bool]:
+        """Instala varios paquetes en una sola transacción del gestor nativo.
+
+        Si la transacción conjunta falla se reintenta paquete a paquete para
+        atribuir el fallo. Devuelve {paquete: instalado} en el orden recibido.
+        """
+        names = list(dict.fromkeys(package_names))
+        if len(names) > 1:
+            cmd = self._install_command(names)
+            if cmd is not None:
+                if self._run_command(cmd, on_progress):
+                    self.invalidate_installed_packages()
+                    return {name: True for name in names}
+                if on_progress:
+                    on_progress("Instalación conjunta falló; reintentando paquete a paquete.")
+        results = {}
+        for name in names:
+            results[name] = bool(self.install_package(name, on_progress=on_progress))
+        self.invalidate_installed_packages()
+        return results
+
+    def _install_command(self, package_names: List[str]) -> Optional[List[str]]:
+        """Comando que instala todos los paquetes de una vez (None = sin soporte)."""
+        return None
+
+    def installed_packages(self) -> Optional[FrozenSet[str]]:
+        """Nombres de paquetes instalados, obtenidos con una sola consulta al gestor.
+
+        El resultado se cachea para toda la sesión; None indica que el gestor no
+        pudo consultarse y el llamador debe recurrir al PATH.
+        """
+        cmd = self._installed_packages_command()
+        if cmd is None:
+            return None
+        key = tuple(cmd)
+        if key not in _INSTALLED_PACKAGES_CACHE:
+            _INSTALLED_PACKAGES_CACHE[key] = self._query_installed_packages(cmd)
+        return _INSTALLED_PACKAGES_CACHE[key]
+
+    def invalidate_installed_packages(self) -> None:
+        cmd = self._installed_packages_command()
+        if cmd is not None:
+            _INSTALLED_PACKAGES_CACHE.pop(tuple(cmd), None)
+
+    def _installed_packages_command(self) -> Optional[List[str]]:
+        """Comando que lista los paquetes instalados (None = sin soporte)."""
+        return None
+
+    def _parse_installed_packages(self, output: str) -> Set[str]:
+        return {line.split()[0] for line in output.splitlines() if line.strip()}
+
+    def _query_installed_packages(self, cmd: List[str]) -> Optional[FrozenSet[str]]:
+        try:
+            completed = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=self.QUERY_TIMEOUT_SECONDS,
+            )
+        except Exception:
+            return None
+        if completed.returncode != 0:
+            return None
+        return frozenset(self._parse_installed_packages(completed.stdout))
+
     def _run_command(
         self, cmd: List[str], on_progress: Optional[Callable[[str], None]] = None
     ) -> bool:
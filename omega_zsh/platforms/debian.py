@@ -1,5 +1,6 @@
 import os
-from typing import Callable, List, Optional
+from pathlib import Path
+from typing import Callable, List, Optional, Set
 
 from .base import BasePlatform
 
@@ -18,23 +19,46 @@ class DebianPlatform(BasePlatform):
             cmd.append("-y")
         return cmd
 
+    def package_lists_paths(self) -> List[Path]:
+        return [
+            Path("/var/lib/apt/lists"),
+            Path("/var/lib/apt/periodic/update-success-stamp"),
+        ]
+
+    def refresh_package_lists(self) -> bool:
+        return self.update_repos()
+
     def update_repos(self) -> bool:
         cmd = self._get_base_cmd("update")
         return self._run_command(cmd)
 
+    def _resolve_package_name(self, package_name: str) -> str:
+        # Mapeos específicos de Debian
+        if package_name == "fd":
+            return "fd-find"
+        return package_name
+
     def install_package(
         self, package_name: str, on_progress: Optional[Callable[[str], None]] = None
     ) -> bool:
-        resolved_name = package_name
-        # Mapeos específicos de Debian
-        if package_name == "fd":
-            resolved_name = "fd-find"
-        elif package_name == "bat":
-            resolved_name = "bat"
+        return self._run_command(self._install_command([package_name]), on_progress)
 
+    def _install_command(self, package_names: List[str]) -> List[str]:
         cmd = self._get_base_cmd("install")
-        cmd.append(resolved_name)
-        return self._run_command(cmd, on_progress)
+        cmd.extend(self._resolve_package_name(name) for name in package_names)
+        return cmd
+
+    def _installed_packages_command(self) -> List[str]:
+        return ["dpkg-query", "-W", "-f=${db:Status-Status} ${Package}\n"]
+
+    def _parse_installed_packages(self, output: str) -> Set[str]:
+        # dpkg-query -W también lista paquetes eliminados que dejaron configuración.
+        packages = set()
+        for line in output.splitlines():
+            status, _, name = line.partition(" ")
+            if status == "installed" and name:
+                packages.add(name.strip())
+        return packages
 
     def get_essential_tools(self) -> List[str]:
         return [
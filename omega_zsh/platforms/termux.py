@@ -1,5 +1,7 @@
+import os
+from pathlib import Path
 from shutil import which
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Set
 
 from .base import BasePlatform
 
@@ -8,6 +10,17 @@ class TermuxPlatform(BasePlatform):
     def __init__(self, use_nala: bool = False):
         self.pkg_mgr = "nala" if use_nala else "pkg"
 
+    def package_lists_paths(self) -> List[Path]:
+        prefix = Path(os.environ.get("PREFIX", "/data/data/com.termux/files/usr"))
+        return [
+            prefix / "var/lib/apt/lists",
+            prefix / "var/lib/apt/periodic/update-success-stamp",
+        ]
+
+    def refresh_package_lists(self) -> bool:
+        # `pkg update` / `nala update` solo descargan índices; `upgrade` actualiza todo.
+        return self._run_command([self.pkg_mgr, "update"])
+
     def update_repos(self) -> bool:
         return self._run_command([self.pkg_mgr, "upgrade", "-y"])
 
@@ -27,8 +40,29 @@ class TermuxPlatform(BasePlatform):
 
             return self._run_command(["gem", "install", "lolcat", "--no-document"], on_progress)
 
-        cmd = [self.pkg_mgr, "install", "-y", resolved_name]
-        return self._run_command(cmd, on_progress)
+        return self._run_command(self._install_command([resolved_name]), on_progress)
+
+    def install_packages(
+        self, package_names: List[str], on_progress: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, bool]:
+        # lolcat va por gem, así que queda fuera de la transacción de pkg.
+        names = list(dict.fromkeys(package_names))
+        results = super().install_packages(
+            [name for name in names if name != "lolcat"], on_progress
+        )
+        if "lolcat" in names:
+            results["lolcat"] = self.install_package("lolcat", on_progress)
+        return {name: results[name] for name in names}
+
+    def _install_command(self, package_names: List[str]) -> List[str]:
+        return [self.pkg_mgr, "install", "-y", *package_names]
+
+    def _installed_packages_command(self) -> List[str]:
+        return ["pkg", "list-installed"]
+
+    def _parse_installed_packages(self, output: str) -> Set[str]:
+        # Formato de apt list: "zsh/stable,now 5.9 aarch64 [installed]"
+        return {line.split("/", 1)[0] for line in output.splitlines() if "/" in line}
 
     def get_essential_tools(self) -> List[str]:
         return [
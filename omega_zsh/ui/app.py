@@ -1,4 +1,5 @@
 import logging
+from dataclasses import replace
 from pathlib import Path
 
 from textual.app import App, ComposeResult
@@ -142,7 +143,7 @@ class OmegaApp(App):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         logging.info("Inicializando OmegaApp...")
-        self.context = SystemContext()
+        self.context = SystemContext.cached()
         self.state_manager = StateManager(self.context.omega_dir)
 
         try:
@@ -186,6 +187,7 @@ class OmegaApp(App):
                     selected_header=self.state.selected_header,
                     header_text=self.state.header_text,
                     selected_font=self.state.header_font,
+                    header_cache_ttl=self.state.header_cache_ttl,
                 )
             with TabPane("Recovery", id="tab-recovery"):
                 yield RecoveryScreen()
@@ -276,21 +278,24 @@ class OmegaApp(App):
             try:
                 header_screen = self.query_one(HeaderSelectScreen)
                 h_type, h_text, h_font = header_screen.get_selected()
+                h_ttl = header_screen.get_cache_ttl()
             except Exception:
-                h_type, h_text, h_font = (
+                h_type, h_text, h_font, h_ttl = (
                     self.state.selected_header,
                     self.state.header_text,
                     self.state.header_font,
+                    self.state.header_cache_ttl,
                 )
 
-            current_state = AppState(
+            # replace() conserva los campos sin control en la TUI (zero_fork, etc.).
+            current_state = replace(
+                self.state,
                 selected_plugins=selected_plugins,
-                allowed_custom_plugins=self.state.allowed_custom_plugins,
                 selected_theme=selected_theme,
-                selected_root_theme=self.state.selected_root_theme,
                 selected_header=h_type,
                 header_text=h_text,
                 header_font=h_font,
+                header_cache_ttl=h_ttl,
             )
             self.state = normalize_app_state(current_state.__dict__)
             self.state_manager.save(self.state)
@@ -23,8 +23,8 @@ from textual.widgets import (
 from textual.widgets.selection_list import Selection
 
 from ..core.constants import (
+    DEFAULT_HEADER_CACHE_TTL,
     EXTERNAL_URLS,
-    binary_commands,
     binary_supported,
     is_binary_tool,
     startup_impact,
@@ -32,6 +32,7 @@ from ..core.constants import (
 from ..core.context import SystemContext
 from ..core.doctor import run_doctor, run_doctor_fix
 from ..core.figlet import FigletManager
+from ..core.installer import binary_available, installed_packages_for
 from ..core.recovery import (
     cleanup_shell_files,
     list_zshrc_backups,
@@ -40,6 +41,7 @@ from ..core.recovery import (
     restore_latest_zshrc_backup,
     restore_zshrc_backup,
 )
+from ..core.shell import default_zsh_pool
 from ..core.system_info import get_system_stats
 
 NAV_HINT = (
@@ -112,7 +114,7 @@ class DashboardScreen(Static):
     """Pantalla principal con estética Neon Retro Informativa."""
 
     def compose(self) -> ComposeResult:
-        self.context = SystemContext()
+        self.context = SystemContext.cached()
         stats = get_system_stats(self.context._env)
 
         header_art = Text.from_markup(
@@ -202,7 +204,7 @@ class ProblemsScreen(Vertical):
         self.fix_armed = False
         self._write_log("$ omega doctor\n")
         try:
-            report = run_doctor(SystemContext())
+            report = run_doctor(SystemContext.cached())
             for line in self._render_report(report):
                 self._write_log(f"{line}\n")
             severity = "error" if report.get("overall") == "error" else None
@@ -220,7 +222,7 @@ class ProblemsScreen(Vertical):
         self.fix_armed = False
         self._write_log("$ omega doctor --fix\n")
         try:
-            result = run_doctor_fix(SystemContext())
+            result = run_doctor_fix(SystemContext.cached())
             for fix in result.get("fixes", []):
                 self._write_log(
                     f"[{fix.get('status')}] {fix.get('id')}: "
@@ -315,7 +317,7 @@ class RecoveryScreen(Vertical):
 
     def refresh_backup_list(self) -> None:
         try:
-            context = SystemContext()
+            context = SystemContext.cached()
             backups = list_zshrc_backups(context)
             items = [ListItem(Label(str(path)), id=f"backup-{i}") for i, path in enumerate(backups)]
             backup_list = self.query_one("#recovery-backups", ListView)
@@ -348,7 +350,7 @@ class RecoveryScreen(Vertical):
             notify()
 
     def _run_recovery(self, action: str) -> None:
-        context = SystemContext()
+        context = SystemContext.cached()
         self._write_log(f"$ omega recovery {action}\n")
         try:
             if action != "restore-zshrc":
@@ -443,7 +445,7 @@ class PluginSelectScreen(Vertical):
         yield Label("[bold #ff006e]SELECCIÓN DE PLUGINS Y BINARIOS[/]")
         yield Label(NAV_HINT, id="plugin-nav-hint")
         yield Label("[dim]Usa [bold]Espacio[/] para marcar/desmarcar[/]", id="plugin-hint")
-        context = SystemContext()
+        context = SystemContext.cached()
 
         options = []
         seen_ids = set()
@@ -472,11 +474,10 @@ class PluginSelectScreen(Vertical):
         if is_binary_tool(plugin_id):
             if not binary_supported(plugin_id, context.package_manager_type):
                 return "unsupported"
-            return (
-                "installed"
-                if any(shutil.which(cmd) for cmd in binary_commands(plugin_id))
-                else "missing"
+            available = binary_available(
+                plugin_id, context.package_manager_type, installed_packages_for(context)
             )
+            return "installed" if available else "missing"
         if plugin_id in EXTERNAL_URLS:
             path = context.omz_dir / "custom" / "plugins" / plugin_id
             return "installed" if path.exists() else "missing"
@@ -539,29 +540,14 @@ class ThemeSelectScreen(Horizontal):
 
         preview_box.update(Text("Rendering...", style="yellow"))
 
-        zsh_bin = shutil.which("zsh")
-        if not zsh_bin:
+        pool = default_zsh_pool()
+        if pool is None:
             preview_box.update(Text("Error: Zsh binary not found.", style="bold red"))
             return
 
         try:
-            omz_dir = os.environ.get("ZSH", str(Path.home() / ".oh-my-zsh"))
-            omz_lib = f"{omz_dir}/lib"
-            cmd = (
-                "[[ -f ~/.cargo/env ]] && source ~/.cargo/env 2>/dev/null; "
-                f'export ZSH="{omz_dir}" && '
-                f'fpath=("{omz_dir}/functions" "{omz_dir}/completions" $fpath) && '
-                f"autoload -U colors && colors && "
-                f"autoload -Uz vcs_info && "
-                f"autoload -U compinit && "
-                f"for _f in {omz_lib}/git.zsh {omz_lib}/theme-and-appearance.zsh"
-                f" {omz_lib}/functions.zsh; do [[ -f $_f ]] && source $_f; done && "
-                f"source {theme.path} && "
-                f'print -P "$PROMPT" && print -P "$RPROMPT"'
-            )
-            result = subprocess.run(
-                [zsh_bin, "-c", cmd], capture_output=True, text=True, timeout=1.5
-            )
+            # Worker zsh persistente con las libs de OMZ ya cargadas: sin arranque por clic.
+            result = pool.render_prompt(Path(theme.path), timeout=1.5)
             if result.stdout.strip():
                 try:
                     preview_box.update(Text.from_ansi(result.stdout))
@@ -571,7 +557,7 @@ class ThemeSelectScreen(Horizontal):
                 preview_box.update(Text(f"Preview Error:\n{result.stderr}", style="dim red"))
             else:
                 preview_box.update(Text("Preview vacío (tema sin PROMPT definido)", style="dim"))
-        except subprocess.TimeoutExpired:
+        except TimeoutError:
             preview_box.update(Text("Preview timed out (Theme too slow?)", style="orange"))
         except Exception as e:
             preview_box.update(Text(f"Execution Error: {e}", style="red"))
@@ -583,11 +569,18 @@ class ThemeSelectScreen(Horizontal):
 class HeaderSelectScreen(Vertical):
     """Configuración estética del Banner de bienvenida."""
 
-    def __init__(self, selected_header, header_text, selected_font):
+    def __init__(
+        self,
+        selected_header,
+        header_text,
+        selected_font,
+        header_cache_ttl=DEFAULT_HEADER_CACHE_TTL,
+    ):
         super().__init__()
         self.selected_header = selected_header
         self.header_text = header_text
         self.selected_font = selected_font
+        self.header_cache_ttl = header_cache_ttl
         self.figlet = FigletManager()
 
     def compose(self) -> ComposeResult:
@@ -606,6 +599,13 @@ class HeaderSelectScreen(Vertical):
                     RadioButton("Cowsay", id="h-cow", value=(self.selected_header == "cowsay")),
                     id="header-type-set",
                 )
+                yield Label("Caché Fastfetch (s, 0 = en vivo):")
+                yield Input(
+                    value=str(self.header_cache_ttl),
+                    placeholder=str(DEFAULT_HEADER_CACHE_TTL),
+                    type="integer",
+                    id="header-ttl-input",
+                )
 
             with Vertical(id="header-text-col"):
                 yield Label("Texto / Fuentes (solo Figlet):")
@@ -647,6 +647,13 @@ class HeaderSelectScreen(Vertical):
 
         return h_type, text, font
 
+    def get_cache_ttl(self) -> int:
+        value = self.query_one("#header-ttl-input").value.strip()
+        try:
+            return max(0, int(value))
+        except ValueError:
+            return self.header_cache_ttl
+
     @on(Button.Pressed, "#btn-header-preview")
     @work(exclusive=True, thread=True)
     def update_header_preview(self) -> None:
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Compare per-call `shutil.which` against the shared CommandIndex.
+
+Builds a synthetic PATH with 16 directories and looks up every command alias in
+the catalog, like a PluginSelectScreen redraw does. Pass --with-system-path to
+append the real $PATH as well.
+
+    python scripts/bench_command_index.py [--rounds N] [--with-system-path]
+"""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from omega_zsh.core.commands import benchmark_lookups
+from omega_zsh.core.constants import BINARY_TOOLS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--with-system-path", action="store_true")
+    args = parser.parse_args()
+
+    commands = sorted({cmd for tool in BINARY_TOOLS.values() for cmd in tool.commands})
+    with tempfile.TemporaryDirectory() as tmp:
+        directories = []
+        for i in range(16):
+            directory = Path(tmp) / f"bin{i:02d}"
+            directory.mkdir()
+            for j in range(50):
+                (directory / f"tool-{i}-{j}").touch()
+            directories.append(str(directory))
+        if args.with_system_path:
+            directories.append(os.environ.get("PATH", os.defpath))
+        path = os.pathsep.join(directories)
+        result = benchmark_lookups(commands, path, rounds=args.rounds)
+
+    speedup = result["which_seconds"] / result["index_seconds"] if result["index_seconds"] else 0.0
+    print(f"PATH dirs:     {int(result['directories'])}")
+    print(f"lookups:       {int(result['lookups'])}")
+    print(f"shutil.which:  {result['which_seconds'] * 1000:.1f} ms")
+    print(f"index (cold):  {result['cold_index_seconds'] * 1000:.1f} ms")
+    print(f"index (warm):  {result['index_seconds'] * 1000:.1f} ms")
+    print(f"speedup:       {speedup:.1f}x (warm)")
+
+
+if __name__ == "__main__":
+    main()
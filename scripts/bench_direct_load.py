@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Compare shell startup through oh-my-zsh.sh against the direct-load mode.
+
+Renders every preset twice (standard and `direct_load`) into temporary ZDOTDIRs
+and reports the median `zsh -i -c exit` time of each. Needs zsh and an
+installed Oh My Zsh ($ZSH or ~/.oh-my-zsh).
+
+    python scripts/bench_direct_load.py [--runs N]
+"""
+
+import argparse
+
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.direct_load import benchmark_direct_load
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = benchmark_direct_load(SystemContext.cached(), runs=args.runs)
+
+    print(f"{'preset':<12} {'oh-my-zsh.sh':>14} {'direct':>10} {'speedup':>9}")
+    for preset_id, timings in results.items():
+        standard = timings["standard_seconds"]
+        direct = timings["direct_seconds"]
+        speedup = standard / direct if direct else 0.0
+        print(
+            f"{preset_id:<12} {standard * 1000:>11.1f} ms {direct * 1000:>7.1f} ms {speedup:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,3 +15,24 @@ def patch_textual_work(monkeypatch):
         return decorator
 
     monkeypatch.setattr("textual.work", mock_work)
+
+
+@pytest.fixture
+def fake_bin(tmp_path, monkeypatch):
+    """
+    Fábrica de ejecutables falsos: `fake_bin("zsh", "exit 0\n")` escribe
+    tmp_path/bin/zsh con shebang de /bin/sh, lo marca ejecutable y pone su
+    directorio al frente del PATH. Con `system_path=False` el PATH contiene
+    solo ese directorio, para simular herramientas ausentes.
+    """
+
+    def make(name, body, *, directory="bin", system_path=True):
+        bin_dir = tmp_path / directory
+        bin_dir.mkdir(exist_ok=True)
+        script = bin_dir / name
+        script.write_text("#!/bin/sh\n" + body, encoding="utf-8")
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin" if system_path else str(bin_dir))
+        return script
+
+    return make
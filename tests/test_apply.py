@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from omega_zsh.core import manifest as manifest_module
 from omega_zsh.core.apply import apply_config, build_config_context, preview_config, render_config
 from omega_zsh.core.context import SystemContext
 from omega_zsh.core.state import AppState, safe_minimal_state
@@ -194,3 +195,82 @@ def test_safe_minimal_render_omits_visual_and_heavy_commands(tmp_path):
     assert "omega_zcompile" not in content
     assert "compinit" not in content
     assert not context.zshrc_path.exists()
+
+
+def test_apply_config_short_circuits_when_render_and_links_are_unchanged(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    omz = home / ".oh-my-zsh"
+    (omz / "custom" / "themes").mkdir(parents=True)
+    (omz / "oh-my-zsh.sh").write_text("# omz\n", encoding="utf-8")
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["git"], selected_header="none")
+    monkeypatch.setattr("omega_zsh.core.shell.which", lambda command: None)
+
+    first = apply_config(context, state)
+    assert first.ok and not first.unchanged
+
+    def fail_validate(path):
+        raise AssertionError("unchanged apply must not fork zsh")
+
+    monkeypatch.setattr("omega_zsh.core.generator.validate_zsh_syntax", fail_validate)
+    manifest_before = (context.omega_dir / "manifest.json").read_text(encoding="utf-8")
+
+    second = apply_config(context, state)
+
+    assert second.ok
+    assert second.unchanged
+    assert second.changed == []
+    assert not (home / ".omega-backups").exists()
+    assert (context.omega_dir / "manifest.json").read_text(encoding="utf-8") == manifest_before
+
+
+def test_apply_config_rewrites_when_zshrc_or_theme_links_drift(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    omz = home / ".oh-my-zsh"
+    (omz / "custom" / "themes").mkdir(parents=True)
+    (omz / "oh-my-zsh.sh").write_text("# omz\n", encoding="utf-8")
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["git"], selected_header="none")
+    monkeypatch.setattr("omega_zsh.core.shell.which", lambda command: None)
+    apply_config(context, state)
+
+    context.zshrc_path.write_text("# edited by hand\n", encoding="utf-8")
+    edited = apply_config(context, state)
+    assert not edited.unchanged
+    assert "edited by hand" not in context.zshrc_path.read_text(encoding="utf-8")
+
+    next((omz / "custom" / "themes").glob("*.zsh-theme")).unlink()
+    relinked = apply_config(context, state)
+    assert not relinked.unchanged
+
+    other_state = AppState(selected_plugins=["git", "sudo"], selected_header="none")
+    assert not apply_config(context, other_state).unchanged
+
+
+def test_apply_config_writes_manifest_once_for_all_theme_links(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    omz = home / ".oh-my-zsh"
+    (omz / "custom" / "themes").mkdir(parents=True)
+    (omz / "oh-my-zsh.sh").write_text("# omz\n", encoding="utf-8")
+    (home / ".zshrc").write_text("# previous\n", encoding="utf-8")
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["git"], selected_header="none")
+    monkeypatch.setattr("omega_zsh.core.shell.which", lambda command: None)
+    saves = []
+    real_save = manifest_module.save_manifest
+
+    def counting_save(path, data):
+        saves.append(path)
+        real_save(path, data)
+
+    monkeypatch.setattr(manifest_module, "save_manifest", counting_save)
+
+    result = apply_config(context, state)
+
+    assert result.ok
+    assert saves == [context.omega_dir / "manifest.json"]
+    files = manifest_module.load_manifest(context.omega_dir / "manifest.json")["files"]
+    kinds = [entry["kind"] for entry in files.values()]
+    assert kinds.count("theme_symlink") == len(list((omz / "custom" / "themes").iterdir()))
+    assert kinds.count("config") == 1
+    assert kinds.count("backup") == 1
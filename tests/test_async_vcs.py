@@ -0,0 +1,43 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+THEMES_DIR = Path(__file__).parent.parent / "omega_zsh" / "assets" / "themes"
+ASYNC_LIB = THEMES_DIR / "omega_async_vcs.zsh"
+VCS_THEMES = sorted(
+    path
+    for path in THEMES_DIR.glob("*.zsh-theme")
+    if "git_prompt_info" in path.read_text(encoding="utf-8")
+    or "_git_seg" in path.read_text(encoding="utf-8")
+)
+
+
+def test_bundled_vcs_themes_route_git_through_the_async_worker():
+    assert len(VCS_THEMES) == 10
+    for theme in VCS_THEMES:
+        text = theme.read_text(encoding="utf-8")
+        assert '"${${(%):-%x}:A:h}/omega_async_vcs.zsh"' in text, theme.name
+        assert "='${_omega_vcs_info}'" in text, theme.name
+        # El cálculo síncrono solo queda como respaldo dentro de una variable.
+        prompts = [line for line in text.splitlines() if line.startswith(("PROMPT", "RPROMPT"))]
+        assert not any("git_prompt_info" in line or "_git_seg" in line for line in prompts)
+
+
+def test_async_worker_caches_on_git_index_and_uses_fd_callback():
+    text = ASYNC_LIB.read_text(encoding="utf-8")
+
+    assert "for file in index HEAD" in text
+    assert "zle -F -w $_omega_vcs_fd _omega_vcs_done" in text
+    assert not ASYNC_LIB.name.endswith(".zsh-theme")
+    # Fuera de un repo se sale antes de lanzar el worker.
+    precmd = text[text.index("function _omega_vcs_precmd") :]
+    assert precmd.index("if (( ! $#reply )); then") < precmd.index("exec {_omega_vcs_fd}<")
+
+
+@pytest.mark.skipif(shutil.which("zsh") is None, reason="zsh no disponible")
+def test_async_worker_and_themes_parse():
+    for script in (ASYNC_LIB, *VCS_THEMES):
+        result = subprocess.run(["zsh", "-n", str(script)], capture_output=True, text=True)
+        assert result.returncode == 0, (script.name, result.stderr)
@@ -0,0 +1,282 @@
+import errno
+import json
+import os
+import threading
+
+import pytest
+
+from omega_zsh.core import backup
+from omega_zsh.core.backup import (
+    backup_file,
+    backup_index_path,
+    copy_file,
+    create_backup,
+    file_sha256,
+    iter_valid_backups,
+    list_backups,
+    object_store_dir,
+    prune_backups,
+    restore_backup,
+)
+
+
+def _blobs(store):
+    return sorted(path for path in store.glob("??/*") if path.is_file())
+
+
+def test_identical_backups_share_one_blob(tmp_path):
+    source = tmp_path / ".zshrc"
+    source.write_text("echo one\n", encoding="utf-8")
+    backup_dir = tmp_path / ".omega-backups"
+
+    first = create_backup(source, backup_dir)
+    second = create_backup(source, backup_dir)
+
+    assert first != second
+    assert first.is_symlink() and second.is_symlink()
+    assert not os.path.isabs(os.readlink(first))
+    assert first.read_text(encoding="utf-8") == "echo one\n"
+    blobs = _blobs(object_store_dir(backup_dir))
+    assert [blob.name for blob in blobs] == [file_sha256(source)]
+
+
+def test_prune_collects_only_unreferenced_blobs(tmp_path):
+    source = tmp_path / ".zshrc"
+    backup_dir = tmp_path / ".omega-backups"
+    backups = []
+    for index in range(4):
+        source.write_text(f"echo {index}\n", encoding="utf-8")
+        backups.append(create_backup(source, backup_dir))
+
+    removed = prune_backups(backup_dir, source.name, keep=2)
+
+    assert removed == [backups[1], backups[0]]
+    remaining = {os.path.realpath(backup) for backup in backups[2:]}
+    assert {str(blob) for blob in _blobs(object_store_dir(backup_dir))} == remaining
+
+
+def test_shared_store_keeps_blobs_referenced_from_other_dirs(tmp_path):
+    source = tmp_path / ".zshrc"
+    source.write_text("echo shared\n", encoding="utf-8")
+    backup_dir = tmp_path / ".omega-backups"
+    recovery_dir = tmp_path / ".omega-zsh-recovery"
+    store = object_store_dir(backup_dir)
+
+    recovery_copy = create_backup(source, recovery_dir, store)
+    create_backup(source, backup_dir)
+    source.write_text("echo newer\n", encoding="utf-8")
+    create_backup(source, backup_dir)
+
+    prune_backups(backup_dir, source.name, keep=1)
+
+    assert len(_blobs(store)) == 2
+    target = tmp_path / "restored"
+    assert restore_backup(recovery_copy, target)
+    assert target.read_text(encoding="utf-8") == "echo shared\n"
+    assert not target.is_symlink()
+
+
+def test_backup_falls_back_to_a_copy_without_symlinks(tmp_path, monkeypatch):
+    source = tmp_path / ".zshrc"
+    source.write_text("echo copy\n", encoding="utf-8")
+
+    def deny(self, target):
+        raise PermissionError("symlinks not allowed")
+
+    monkeypatch.setattr("pathlib.Path.symlink_to", deny)
+    backup = create_backup(source, tmp_path / "backups")
+
+    assert not backup.is_symlink()
+    assert backup.read_text(encoding="utf-8") == "echo copy\n"
+
+
+def test_listing_and_pruning_read_the_index_not_the_directory(tmp_path):
+    source = tmp_path / ".zshrc"
+    backup_dir = tmp_path / ".omega-backups"
+    for index in range(3):
+        source.write_text(f"echo {index}\n", encoding="utf-8")
+        create_backup(source, backup_dir)
+    stray = backup_dir / ".zshrc.20200101-000000.bak"
+    stray.write_text("echo stray\n", encoding="utf-8")
+
+    records = list_backups(backup_dir, source.name)
+    assert len(records) == 3
+    assert records[0].sha256 == file_sha256(source)
+    assert stray not in [record.path for record in records]
+    assert records[0].source == str(source)
+    assert records[0].size == len("echo 2\n")
+
+    prune_backups(backup_dir, source.name, keep=2)
+    ops = [
+        json.loads(line)["op"]
+        for line in backup_index_path(backup_dir).read_text(encoding="utf-8").splitlines()
+    ]
+    assert ops == ["add", "add", "add", "remove"]
+    assert len(list_backups(backup_dir, source.name)) == 2
+
+    # Sin índice se reconstruye una vez a partir del directorio.
+    backup_index_path(backup_dir).unlink()
+    rebuilt = list_backups(backup_dir, source.name)
+    assert [record.path for record in rebuilt][-1] == stray
+    assert backup_index_path(backup_dir).exists()
+
+
+def test_validation_verdicts_are_kept_in_the_index(tmp_path, fake_bin):
+    fake_bin("zsh", "exit 0\n")
+    source = tmp_path / ".zshrc"
+    backup_dir = tmp_path / ".omega-backups"
+    for content in ("echo ok\n", "if BROKEN\n", "echo gone\n"):
+        source.write_text(content, encoding="utf-8")
+        create_backup(source, backup_dir)
+    calls = []
+
+    def validator(path):
+        calls.append(path)
+        return "BROKEN" not in path.read_text(encoding="utf-8"), ""
+
+    gone = list_backups(backup_dir, source.name)[0].path
+    gone.unlink()
+
+    def valid_paths():
+        records = list_backups(backup_dir, source.name)
+        return [record.path for record in iter_valid_backups(records, validator)]
+
+    first = valid_paths()
+    second = valid_paths()
+
+    assert first == second
+    assert len(first) == 1
+    assert len(calls) == 2
+    assert gone not in [record.path for record in list_backups(backup_dir, source.name)]
+
+
+@pytest.mark.skipif(backup.fcntl is None, reason="sin fcntl")
+def test_copy_engine_falls_back_from_reflink_to_copy_file_range_to_copy2(tmp_path, monkeypatch):
+    source = tmp_path / "big.zshrc"
+    source.write_bytes(b"# completions\n" * 100_000)
+    source.chmod(0o640)
+
+    def unsupported(*args):
+        raise OSError(errno.EOPNOTSUPP, "no reflink")
+
+    monkeypatch.setattr(backup.fcntl, "ioctl", unsupported)
+    methods = []
+    for name in ("range", "plain"):
+        target = tmp_path / name
+        methods.append(copy_file(source, target))
+        assert target.read_bytes() == source.read_bytes()
+        assert target.stat().st_mode & 0o777 == 0o640
+        monkeypatch.setattr(backup.os, "copy_file_range", unsupported, raising=False)
+
+    expected = "copy_file_range" if hasattr(os, "copy_file_range") else "copy2"
+    assert methods == [expected, "copy2"]
+
+
+@pytest.mark.skipif(backup.fcntl is None, reason="sin fcntl")
+def test_copy_engine_uses_reflink_when_the_filesystem_clones(tmp_path, monkeypatch):
+    source = tmp_path / ".zshrc"
+    source.write_text("echo clone\n", encoding="utf-8")
+    cloned = []
+
+    def fake_ficlone(dst_fd, request, src_fd):
+        assert request == backup.FICLONE
+        cloned.append(request)
+        os.write(dst_fd, os.pread(src_fd, 1024, 0))
+
+    monkeypatch.setattr(backup.fcntl, "ioctl", fake_ficlone)
+    restored = tmp_path / "restored"
+
+    assert copy_file(source, tmp_path / "clone") == "reflink"
+    assert restore_backup(create_backup(source, tmp_path / "backups"), restored)
+    assert restored.read_text(encoding="utf-8") == "echo clone\n"
+    # Blob del almacén y restauración: dos clonados más.
+    assert len(cloned) == 3
+
+
+def test_prune_skips_gc_when_the_roots_file_is_missing(tmp_path):
+    source = tmp_path / ".zshrc"
+    backup_dir = tmp_path / ".omega-backups"
+    for index in range(3):
+        source.write_text(f"echo {index}\n", encoding="utf-8")
+        create_backup(source, backup_dir)
+    (object_store_dir(backup_dir) / "roots").unlink()
+
+    prune_backups(backup_dir, source.name, keep=2)
+
+    kept = list_backups(backup_dir, source.name)
+    assert len(kept) == 2
+    assert all(record.path.exists() for record in kept)
+
+
+def test_blobs_are_read_only_and_restores_are_writable(tmp_path):
+    source = tmp_path / ".zshrc"
+    source.write_text("echo shared\n", encoding="utf-8")
+    source.chmod(0o600)
+    backup_dir = tmp_path / ".omega-backups"
+    first = create_backup(source, backup_dir)
+    create_backup(source, backup_dir)
+
+    assert os.stat(first).st_mode & 0o777 == 0o444
+    target = tmp_path / "restored"
+    assert restore_backup(first, target)
+    assert target.stat().st_mode & 0o777 == 0o644
+    target.write_text("echo edited\n", encoding="utf-8")
+    assert restore_backup(first, source)
+    assert source.stat().st_mode & 0o777 == 0o600
+    assert source.read_text(encoding="utf-8") == "echo shared\n"
+
+
+@pytest.mark.skipif(backup.fcntl is None, reason="sin fcntl")
+def test_gc_waits_for_a_backup_in_progress(tmp_path):
+    source = tmp_path / ".zshrc"
+    source.write_text("echo locked\n", encoding="utf-8")
+    backup_dir = tmp_path / ".omega-backups"
+    create_backup(source, backup_dir)
+    store = object_store_dir(backup_dir)
+
+    with open(store / backup.LOCK_FILE_NAME, "a", encoding="utf-8") as handle:
+        backup.fcntl.flock(handle.fileno(), backup.fcntl.LOCK_EX)
+        worker = threading.Thread(target=backup.collect_garbage, args=(store,))
+        worker.start()
+        worker.join(0.2)
+        assert worker.is_alive()
+        backup.fcntl.flock(handle.fileno(), backup.fcntl.LOCK_UN)
+    worker.join(5)
+
+    assert not worker.is_alive()
+    assert len(_blobs(store)) == 1
+
+
+def test_prune_keeps_n_existing_backups_when_indexed_files_vanished(tmp_path):
+    source = tmp_path / ".zshrc"
+    backup_dir = tmp_path / ".omega-backups"
+    for index in range(4):
+        source.write_text(f"echo {index}\n", encoding="utf-8")
+        create_backup(source, backup_dir)
+    list_backups(backup_dir, source.name)[0].path.unlink()
+
+    prune_backups(backup_dir, source.name, keep=2)
+
+    kept = list_backups(backup_dir, source.name)
+    assert len(kept) == 2
+    assert all(record.path.exists() for record in kept)
+
+
+def test_backup_and_restore_report_the_copy_method(tmp_path):
+    source = tmp_path / ".zshrc"
+    source.write_text("echo method\n", encoding="utf-8")
+    backup_dir = tmp_path / ".omega-backups"
+
+    first = backup_file(source, backup_dir)
+    second = backup_file(source, backup_dir)
+
+    assert first.copy_method in {"reflink", "copy_file_range", "copy2"}
+    assert second.copy_method == "dedup"
+    indexed = {record.path: record.copy_method for record in list_backups(backup_dir, ".zshrc")}
+    assert indexed == {first.path: first.copy_method, second.path: "dedup"}
+    assert restore_backup(first.path, tmp_path / "restored") in {
+        "reflink",
+        "copy_file_range",
+        "copy2",
+    }
+    assert restore_backup(tmp_path / "missing.bak", tmp_path / "restored") is None
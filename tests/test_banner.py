@@ -0,0 +1,71 @@
+from omega_zsh.core.apply import apply_config, render_config
+from omega_zsh.core.banner import banner_path, write_banner
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.figlet import rainbow
+from omega_zsh.core.fork_budget import analyze_fork_budget
+from omega_zsh.core.state import AppState
+
+
+def test_rainbow_colours_every_visible_character():
+    painted = rainbow("ab c\n\nd\n")
+
+    lines = painted.split("\n")
+    assert lines[0].count("\x1b[38;2;") == 3
+    assert lines[0].endswith("c\x1b[0m")
+    assert lines[1] == ""
+    assert painted.endswith("\x1b[0m\n")
+    assert rainbow("ab c\n\nd\n") == painted
+
+
+def test_write_banner_renders_cowsay_once(tmp_path, fake_bin):
+    fake_bin("cowsay", 'echo "< $1 >"\n', system_path=False)
+    omega_dir = tmp_path / ".omega-zsh"
+
+    path = write_banner(omega_dir, AppState(selected_header="cowsay"))
+
+    assert path == banner_path(omega_dir)
+    assert path.read_text(encoding="utf-8") == "< Omega-ZSH >\n"
+
+
+def test_write_banner_drops_stale_banner_when_figlet_is_missing(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    omega_dir = tmp_path / ".omega-zsh"
+    stale = banner_path(omega_dir)
+    stale.parent.mkdir(parents=True)
+    stale.write_text("old text\n", encoding="utf-8")
+
+    assert write_banner(omega_dir, AppState(selected_header="figlet")) is None
+    assert not stale.exists()
+
+
+def test_banner_header_prints_static_file_with_live_fallback(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+    state = AppState(selected_header="figlet", header_text="Hi")
+
+    content = render_config(context, state)
+    zero_fork = render_config(context, AppState(selected_header="figlet", zero_fork=True))
+
+    assert 'print -rn -- "$mapfile[$_omega_banner]"' in content
+    assert "figlet -f" in content
+    assert "figlet -f" not in zero_fork
+    assert analyze_fork_budget(zero_fork)["forks"] == 0
+
+
+def test_zero_fork_apply_rewrites_banner_when_only_the_text_changes(
+    tmp_path, fake_bin, monkeypatch
+):
+    fake_bin("figlet", 'for arg; do text="$arg"; done\necho "$text"\n')
+    monkeypatch.setattr("omega_zsh.core.shell.which", lambda command: None)
+    context = SystemContext(home=tmp_path / "home", env={})
+    banner = banner_path(context.omega_dir)
+
+    first = apply_config(
+        context, AppState(selected_header="figlet", header_text="Alpha", zero_fork=True)
+    )
+    assert first.ok and banner.read_text(encoding="utf-8") == rainbow("Alpha\n")
+
+    second = apply_config(
+        context, AppState(selected_header="figlet", header_text="Beta", zero_fork=True)
+    )
+    assert second.unchanged
+    assert banner.read_text(encoding="utf-8") == rainbow("Beta\n")
@@ -0,0 +1,79 @@
+import os
+import time
+
+from omega_zsh.core import commands
+from omega_zsh.core.commands import CommandIndex, benchmark_lookups, get_command_index
+
+
+def _make_bin(directory, name, executable=True):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text("#!/bin/sh\n", encoding="utf-8")
+    path.chmod(0o755 if executable else 0o644)
+    return path
+
+
+def test_command_index_resolves_first_executable_in_path_order(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    _make_bin(first, "fzf", executable=False)
+    expected = _make_bin(second, "fzf")
+    _make_bin(second, "rg")
+
+    index = CommandIndex(os.pathsep.join([str(first), str(second), str(tmp_path / "missing")]))
+
+    assert index.which("fzf") == str(expected)
+    assert "rg" in index
+    assert not index.has("fdfind")
+    assert index.any_available(["fd", "rg"])
+
+
+def test_command_index_becomes_stale_when_a_path_directory_changes(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    index = CommandIndex(str(bin_dir))
+    assert not index.is_stale()
+
+    _make_bin(bin_dir, "zoxide")
+    stamp = time.time() + 5
+    os.utime(bin_dir, (stamp, stamp))
+
+    assert index.is_stale()
+    assert not index.has("zoxide")
+    assert CommandIndex(str(bin_dir)).has("zoxide")
+
+
+def test_get_command_index_is_shared_and_rebuilt_on_path_change(tmp_path, monkeypatch):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    _make_bin(first, "eza")
+    _make_bin(second, "bat")
+    monkeypatch.setattr(commands, "_SHARED_INDEX", None)
+    monkeypatch.setenv("PATH", str(first))
+
+    index = get_command_index()
+    assert get_command_index() is index
+    assert index.has("eza")
+
+    monkeypatch.setenv("PATH", str(second))
+    rebuilt = get_command_index()
+    assert rebuilt is not index
+    assert rebuilt.has("bat")
+    assert not rebuilt.has("eza")
+
+
+def test_benchmark_lookups_reports_both_strategies(tmp_path):
+    directories = [tmp_path / f"bin{i}" for i in range(16)]
+    for directory in directories:
+        directory.mkdir()
+    _make_bin(directories[-1], "fzf")
+
+    result = benchmark_lookups(
+        ["fzf", "rg", "fdfind"], os.pathsep.join(map(str, directories)), rounds=2
+    )
+
+    assert result["directories"] == 16
+    assert result["lookups"] == 6
+    assert result["which_seconds"] >= 0
+    assert result["cold_index_seconds"] >= 0
+    assert result["index_seconds"] >= 0
@@ -0,0 +1,90 @@
+from dataclasses import replace
+
+from omega_zsh.core.apply import apply_config, render_config
+from omega_zsh.core.compdump import compdump_path, refresh_compdump
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.direct_load import resolve_direct_load
+from omega_zsh.core.manifest import ManifestTransaction
+from omega_zsh.core.state import AppState
+
+
+def _fake_zsh(tmp_path, fake_bin):
+    """A `zsh` that reports a default fpath and 'dumps' by writing the dump file."""
+    system = tmp_path / "functions"
+    system.mkdir()
+    (system / "_ls").write_text("#compdef ls\n", encoding="utf-8")
+    calls = tmp_path / "zsh-calls"
+    fake_bin(
+        "zsh",
+        f'echo "$@" >> "{calls}"\n'
+        f'case "$3" in print*) echo "{system}" ;; dump=*) echo "#files: 1" > "$5" ;; esac\n',
+    )
+    return calls
+
+
+def test_refresh_compdump_rebuilds_only_when_fpath_changes(tmp_path, fake_bin):
+    calls = _fake_zsh(tmp_path, fake_bin)
+    plugin = tmp_path / "plugin"
+    plugin.mkdir()
+    omega_dir = tmp_path / ".omega-zsh"
+
+    assert refresh_compdump(omega_dir, [str(plugin)]) == compdump_path(omega_dir)
+    assert compdump_path(omega_dir).read_text(encoding="utf-8") == "#files: 1\n"
+    assert len(calls.read_text(encoding="utf-8").splitlines()) == 2
+
+    # Vigente: ni siquiera se consulta el fpath de zsh.
+    assert refresh_compdump(omega_dir, [str(plugin)]) is None
+    assert len(calls.read_text(encoding="utf-8").splitlines()) == 2
+
+    (plugin / "_tool").write_text("#compdef tool\n", encoding="utf-8")
+    assert refresh_compdump(omega_dir, [str(plugin)]) == compdump_path(omega_dir)
+    (tmp_path / "functions" / "_new").write_text("#compdef new\n", encoding="utf-8")
+    assert refresh_compdump(omega_dir, [str(plugin)]) == compdump_path(omega_dir)
+
+
+def test_refresh_compdump_needs_zsh(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+
+    assert refresh_compdump(tmp_path / ".omega-zsh", []) is None
+    assert not compdump_path(tmp_path / ".omega-zsh").exists()
+
+
+def _omz(home):
+    omz = home / ".oh-my-zsh"
+    (omz / "lib").mkdir(parents=True)
+    (omz / "oh-my-zsh.sh").write_text("# omz\n", encoding="utf-8")
+    completions = omz / "custom" / "plugins" / "zsh-completions"
+    (completions / "src").mkdir(parents=True)
+    (completions / "zsh-completions.plugin.zsh").write_text("# plugin\n", encoding="utf-8")
+    (completions / "src" / "_tool").write_text("#compdef tool\n", encoding="utf-8")
+    return omz
+
+
+def test_render_emits_a_single_compinit_on_the_managed_dump(tmp_path):
+    home = tmp_path / "home"
+    omz = _omz(home)
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["git"], selected_header="none")
+
+    standard = render_config(context, state)
+    direct = render_config(context, replace(state, direct_load=True))
+
+    assert "compinit" not in standard
+    assert direct.count("compinit -C") == 1
+    assert f'compinit -C -d "{compdump_path(context.omega_dir)}"' in direct
+    plan = resolve_direct_load(omz, ["zsh-completions"], [])
+    assert plan["fpath"][0] == str(omz / "custom" / "plugins" / "zsh-completions" / "src")
+
+
+def test_apply_builds_and_records_compdump_in_direct_mode(tmp_path, fake_bin):
+    _fake_zsh(tmp_path, fake_bin)
+    home = tmp_path / "home"
+    omz = _omz(home)
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["zsh-completions"], selected_header="none", direct_load=True)
+
+    assert apply_config(context, state).ok
+
+    manifest = ManifestTransaction(context.omega_dir / "manifest.json")
+    manifest.load()
+    assert manifest.get(compdump_path(context.omega_dir))["kind"] == "compdump"
@@ -153,3 +153,42 @@ def test_run_cmd_error(mock_check_output):
     # Forzar ejecución de _run_cmd
     result = ctx._run_cmd("invalid-command")
     assert result == ""
+
+
+def test_probes_are_lazy_until_accessed(tmp_path):
+    env = {"ANDROID_ROOT": "/system", "PREFIX": "/data/data/com.termux/files/usr"}
+
+    with patch("omega_zsh.core.context.subprocess.check_output") as mock_check:
+        ctx = SystemContext(home=tmp_path, env=env)
+        mock_check.assert_not_called()
+        assert ctx.distro_id == "android"
+        mock_check.assert_not_called()
+        assert ctx.is_gsi is False
+        assert mock_check.call_count == 2
+
+
+def test_cached_context_reuses_probes_until_path_changes(tmp_path):
+    (tmp_path / ".omega-zsh").mkdir()
+    env = {"PATH": "/usr/bin", "ZSH": str(tmp_path / ".oh-my-zsh")}
+    cache_path = tmp_path / ".omega-zsh" / "cache" / "context.json"
+
+    with patch.object(SystemContext, "_detect_package_manager", return_value="pacman"):
+        first = SystemContext.cached(home=tmp_path, env=env)
+        assert first.package_manager_type == "pacman"
+    assert cache_path.exists()
+
+    with patch.object(SystemContext, "_detect_package_manager", return_value="apt") as probe:
+        second = SystemContext.cached(home=tmp_path, env=env)
+        assert second.package_manager_type == "pacman"
+        probe.assert_not_called()
+
+        changed = SystemContext.cached(home=tmp_path, env={**env, "PATH": "/opt/bin:/usr/bin"})
+        assert changed.package_manager_type == "apt"
+        probe.assert_called_once()
+
+
+def test_cached_context_does_not_create_omega_dir(tmp_path):
+    ctx = SystemContext.cached(home=tmp_path, env={"PATH": "/usr/bin"})
+
+    assert ctx.distro_id
+    assert not (tmp_path / ".omega-zsh").exists()
@@ -0,0 +1,82 @@
+from dataclasses import replace
+
+from omega_zsh.core.apply import render_config
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.direct_load import benchmark_direct_load, resolve_direct_load
+from omega_zsh.core.fork_budget import analyze_fork_budget
+from omega_zsh.core.state import PRESETS, AppState, normalize_app_state
+
+
+def _omz(home):
+    omz = home / ".oh-my-zsh"
+    (omz / "lib").mkdir(parents=True)
+    (omz / "oh-my-zsh.sh").write_text("# omz\n", encoding="utf-8")
+    for name in ("git.zsh", "history.zsh"):
+        (omz / "lib" / name).write_text("# lib\n", encoding="utf-8")
+    (omz / "custom" / "lib").mkdir(parents=True)
+    (omz / "custom" / "lib" / "history.zsh").write_text("# override\n", encoding="utf-8")
+    (omz / "plugins" / "git").mkdir(parents=True)
+    (omz / "plugins" / "git" / "git.plugin.zsh").write_text("# git\n", encoding="utf-8")
+    (omz / "plugins" / "docker").mkdir()
+    (omz / "plugins" / "docker" / "_docker").write_text("#compdef docker\n", encoding="utf-8")
+    (omz / "themes").mkdir()
+    (omz / "themes" / "robbyrussell.zsh-theme").write_text("# theme\n", encoding="utf-8")
+    return omz
+
+
+def test_resolve_direct_load_mirrors_oh_my_zsh_lookup(tmp_path):
+    omz = _omz(tmp_path)
+    planned = omz / "custom" / "themes" / "root_p10k_red.zsh-theme"
+
+    plan = resolve_direct_load(
+        omz, ["git", "docker", "nope"], ["robbyrussell", "root_p10k_red"], [planned]
+    )
+
+    assert plan["libs"] == [str(omz / "lib" / "git.zsh"), str(omz / "custom/lib/history.zsh")]
+    assert plan["plugins"] == [str(omz / "plugins" / "git" / "git.plugin.zsh")]
+    assert plan["fpath"][:2] == [str(omz / "plugins" / "docker"), str(omz / "plugins" / "git")]
+    assert plan["themes"] == [
+        {"name": "robbyrussell", "path": str(omz / "themes" / "robbyrussell.zsh-theme")},
+        {"name": "root_p10k_red", "path": str(planned)},
+    ]
+    assert plan["missing"] == ["nope"]
+
+
+def test_direct_load_render_skips_oh_my_zsh_sh(tmp_path):
+    home = tmp_path / "home"
+    omz = _omz(home)
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["git"], selected_header="none", direct_load=True)
+
+    content = render_config(context, state)
+
+    assert 'source "$ZSH/oh-my-zsh.sh"' not in content
+    assert f'source "{omz}/plugins/git/git.plugin.zsh"' in content
+    assert content.index("compinit") < content.index(f'source "{omz}/lib/git.zsh"')
+    assert content.count("autoload -Uz compinit") == 1
+    zero_fork = render_config(context, replace(state, zero_fork=True))
+    assert analyze_fork_budget(zero_fork)["forks"] == 0
+
+
+def test_direct_load_falls_back_without_oh_my_zsh(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+    state = AppState(selected_plugins=["git"], direct_load=True)
+
+    assert 'source "$ZSH/oh-my-zsh.sh"' in render_config(context, state)
+    assert normalize_app_state({"direct_load": True}).direct_load is True
+
+
+def test_benchmark_direct_load_times_every_preset(tmp_path, fake_bin):
+    dumps = tmp_path / "dumps"
+    fake_bin("zsh", f'grep -h "compinit -C -d" "$ZDOTDIR/.zshrc" >> "{dumps}"\n')
+    home = tmp_path / "home"
+    context = SystemContext(home=home, env={"ZSH": str(_omz(home))})
+
+    results = benchmark_direct_load(context, runs=1)
+
+    assert list(results) == list(PRESETS)
+    assert set(results["fast"]) == {"standard_seconds", "direct_seconds"}
+    assert not context.zshrc_path.exists()
+    # El compdump de cada ejecución vive en el HOME temporal, nunca en el real.
+    lines = dumps.read_text(encoding="utf-8").splitlines()
+    assert lines and not any(str(home) in line for line in lines)
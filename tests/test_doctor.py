@@ -150,11 +150,13 @@ def test_doctor_binary_tools_accept_known_command_aliases(tmp_path, monkeypatch)
         encoding="utf-8",
     )
     context = SystemContext(home=home, env={})
-
-    def fake_which(command):
-        return f"/usr/bin/{command}" if command in {"rg", "fdfind"} else None
-
-    monkeypatch.setattr("omega_zsh.core.doctor.which", fake_which)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for command in ("rg", "fdfind"):
+        (bin_dir / command).write_text("#!/bin/sh\n", encoding="utf-8")
+        (bin_dir / command).chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setattr("omega_zsh.core.doctor.which", lambda command: None)
 
     report = run_doctor(context)
 
@@ -0,0 +1,93 @@
+import json
+
+from omega_zsh.core.apply import preview_config, render_config
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.doctor import run_doctor
+from omega_zsh.core.fork_budget import analyze_fork_budget, format_fork_budget
+from omega_zsh.core.state import AppState, normalize_app_state
+
+
+def _section(report, name):
+    return next(section for section in report["sections"] if section["name"] == name)
+
+
+def test_analyze_counts_substitutions_externals_and_called_functions():
+    content = "\n".join(
+        [
+            "# --- Core ---",
+            "helper() {",
+            "    uname -r",
+            "}",
+            "unused() {",
+            "    curl example.com",
+            "}",
+            "if [[ $(id -u) -eq 0 ]]; then echo root >&2; fi",
+            "plugins=(git docker)",
+            "(( $+commands[fzf] )) && helper",
+            'eval "$(zoxide init zsh)"',
+        ]
+    )
+
+    report = analyze_fork_budget(content)
+
+    core = _section(report, "Core")
+    assert core["command_substitutions"] == 2
+    assert core["evals"] == 1
+    assert core["external_commands"] == ["id", "uname", "zoxide"]
+    assert report["forks"] == 3
+    assert format_fork_budget(report) == "3 forks (Core: 3 [id, uname, zoxide])"
+
+
+def test_default_render_reports_startup_forks(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+
+    report = analyze_fork_budget(render_config(context, AppState()))
+
+    assert _section(report, "Core")["external_commands"] == ["id"]
+    # Solo el refresco en segundo plano del snapshot de fastfetch.
+    assert "fastfetch" in _section(report, "Header")["external_commands"]
+    assert report["forks"] > 0
+
+
+def test_zero_fork_render_uses_only_builtins(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+    state = AppState(zero_fork=True, selected_plugins=["git"])
+
+    content = render_config(context, state)
+    report = analyze_fork_budget(content)
+
+    assert report["forks"] == 0
+    assert format_fork_budget(report) == "0 forks"
+    assert "(( EUID == 0 ))" in content
+    assert "compinit" not in content
+    assert "fastfetch --pipe" not in content
+
+
+def test_zero_fork_is_normalized_as_strict_bool():
+    assert normalize_app_state({"zero_fork": True}).zero_fork is True
+    assert normalize_app_state({"zero_fork": "yes"}).zero_fork is False
+
+
+def test_preview_exposes_fork_budget(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+
+    result = preview_config(context, AppState(zero_fork=True))
+
+    assert result.fork_budget["forks"] == 0
+    assert "0 forks" in result.message
+
+
+def test_doctor_warns_when_zero_fork_config_still_forks(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    omega_dir = home / ".omega-zsh"
+    omega_dir.mkdir(parents=True)
+    (omega_dir / "state.json").write_text(
+        json.dumps({"zero_fork": True, "selected_plugins": ["zoxide"]}), encoding="utf-8"
+    )
+    context = SystemContext(home=home, env={})
+    monkeypatch.setattr("omega_zsh.core.doctor.which", lambda command: None)
+
+    check = next(c for c in run_doctor(context)["checks"] if c["id"] == "fork-budget")
+
+    assert check["status"] == "warning"
+    assert "zoxide" in check["detail"]
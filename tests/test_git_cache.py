@@ -0,0 +1,75 @@
+import shutil
+import subprocess
+
+import pytest
+
+from omega_zsh.core.git_cache import GitMirrorCache, default_git_cache_dir, mirror_name
+from omega_zsh.core.installer import PluginInstaller
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git no disponible")
+
+
+def _make_remote(tmp_path):
+    remote = tmp_path / "remote" / "zsh-plugin"
+    remote.mkdir(parents=True)
+    git = ["git", "-C", str(remote)]
+    subprocess.run([*git, "init", "-q"], check=True)
+    (remote / "plugin.zsh").write_text("echo plugin\n", encoding="utf-8")
+    subprocess.run([*git, "add", "."], check=True)
+    subprocess.run(
+        [*git, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"], check=True
+    )
+    return remote
+
+
+def test_default_git_cache_dir_prefers_env_override(tmp_path):
+    assert default_git_cache_dir(tmp_path, {"OMEGA_GIT_CACHE": "/srv/git"}).as_posix() == (
+        "/srv/git"
+    )
+    assert mirror_name("https://github.com/ohmyzsh/ohmyzsh.git").startswith("ohmyzsh-")
+
+
+def test_installs_clone_from_mirror_and_work_offline(tmp_path):
+    remote = _make_remote(tmp_path)
+    url = str(remote)
+    cache = GitMirrorCache(tmp_path / "cache")
+    first = PluginInstaller(None, tmp_path / "home1", git_cache=cache)
+    messages = []
+
+    assert first._git_clone(url, tmp_path / "home1" / "plugin", messages.append)
+    assert (cache.mirror_path(url) / "HEAD").exists()
+
+    shutil.rmtree(remote)  # Sin red: solo queda el mirror local
+    cache.refresh_seconds = 0
+    second = PluginInstaller(None, tmp_path / "home2", git_cache=cache)
+    target = tmp_path / "home2" / "plugin"
+
+    assert second._git_clone(url, target, messages.append)
+    assert (target / "plugin.zsh").read_text(encoding="utf-8") == "echo plugin\n"
+    origin = subprocess.run(
+        ["git", "-C", str(target), "remote", "get-url", "origin"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    assert origin == url
+    assert any("se usa la copia local" in message for message in messages)
+
+
+def test_without_a_shared_cache_installs_keep_shallow_network_clones(tmp_path, monkeypatch):
+    monkeypatch.setattr("omega_zsh.core.git_cache.SYSTEM_GIT_CACHE_DIR", tmp_path / "missing")
+    home = tmp_path / "home"
+    assert default_git_cache_dir(home, {}) is None
+    user_cache = home / ".omega-zsh" / "cache" / "git"
+    user_cache.mkdir(parents=True)
+    assert default_git_cache_dir(home, {}) == user_cache
+    user_cache.rmdir()
+
+    remote = _make_remote(tmp_path)
+    installer = PluginInstaller(None, home)
+    target = home / "plugin"
+
+    assert installer.git_cache is None
+    assert installer._git_clone(remote.as_uri(), target, lambda message: None)
+    assert (target / ".git" / "shallow").exists()
+    assert not user_cache.exists()
@@ -0,0 +1,86 @@
+import os
+import time
+
+from omega_zsh.core.apply import apply_config, build_config_context, render_config
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.header_cache import header_cache_path, refresh_header_cache
+from omega_zsh.core.state import AppState, normalize_app_state
+
+
+def _fake_fastfetch(tmp_path, fake_bin):
+    calls = tmp_path / "calls"
+    fake_bin(
+        "fastfetch",
+        f'echo "$@" >> "{calls}"\nprintf "\\033[1mOmega\\033[0m\\n"\n',
+        system_path=False,
+    )
+    return calls
+
+
+def test_refresh_header_cache_writes_snapshot_only_when_stale(tmp_path, fake_bin):
+    calls = _fake_fastfetch(tmp_path, fake_bin)
+    omega_dir = tmp_path / ".omega-zsh"
+    snapshot = header_cache_path(omega_dir)
+
+    assert refresh_header_cache(omega_dir, 60) == snapshot
+    assert snapshot.read_text(encoding="utf-8") == "\x1b[1mOmega\x1b[0m\n"
+    assert refresh_header_cache(omega_dir, 60) is None
+
+    old = time.time() - 120
+    os.utime(snapshot, (old, old))
+    assert refresh_header_cache(omega_dir, 60) == snapshot
+    assert calls.read_text(encoding="utf-8").splitlines() == ["--pipe false"] * 2
+
+
+def test_fastfetch_header_prints_cached_snapshot(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+    state = AppState(selected_header="fastfetch", header_cache_ttl=900)
+
+    data = build_config_context(context, state)
+    content = render_config(context, state)
+
+    assert data["header_cache"]["path"] == str(tmp_path / "home/.omega-zsh/cache/header.ansi")
+    assert 'print -rn -- "$mapfile[$_omega_header]"' in content
+    assert "<= 900 ))" in content
+    assert "fastfetch --pipe false >|" in content
+    assert ") &!" in content
+    assert "&& fastfetch\n" not in content
+
+
+def test_zero_ttl_keeps_live_fastfetch(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+
+    content = render_config(context, AppState(selected_header="fastfetch", header_cache_ttl=0))
+
+    assert "(( $+commands[fastfetch] )) && fastfetch" in content
+    assert "mapfile" not in content
+
+
+def test_header_cache_ttl_is_normalized():
+    assert normalize_app_state({"header_cache_ttl": 120}).header_cache_ttl == 120
+    assert normalize_app_state({"header_cache_ttl": -5}).header_cache_ttl == 3600
+    assert normalize_app_state({"header_cache_ttl": "60"}).header_cache_ttl == 3600
+
+
+def test_unchanged_apply_still_refreshes_a_stale_or_missing_snapshot(
+    tmp_path, fake_bin, monkeypatch
+):
+    calls = _fake_fastfetch(tmp_path, fake_bin)
+    monkeypatch.setattr("omega_zsh.core.shell.which", lambda command: None)
+    context = SystemContext(home=tmp_path / "home", env={})
+    state = AppState(selected_header="fastfetch", header_cache_ttl=60, zero_fork=True)
+    snapshot = header_cache_path(context.omega_dir)
+
+    assert apply_config(context, state).ok
+    assert apply_config(context, state).unchanged
+    assert len(calls.read_text(encoding="utf-8").splitlines()) == 1
+
+    old = time.time() - 120
+    os.utime(snapshot, (old, old))
+    assert apply_config(context, state).unchanged
+    assert snapshot.stat().st_mtime > old
+
+    snapshot.unlink()
+    assert apply_config(context, state).unchanged
+    assert snapshot.exists()
+    assert len(calls.read_text(encoding="utf-8").splitlines()) == 3
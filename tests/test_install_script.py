@@ -56,7 +56,7 @@ def test_bootstrap_ensures_omz_before_installing_plugins(monkeypatch, tmp_path):
     monkeypatch.setattr(bootstrap, "install_core_packages", lambda os_id: None)
     monkeypatch.setattr(bootstrap, "setup_venv", lambda project_dir: tmp_path / ".venv")
     monkeypatch.setattr(bootstrap.subprocess, "run", MagicMock())
-    monkeypatch.setattr(bootstrap, "SystemContext", lambda: ctx)
+    monkeypatch.setattr(bootstrap, "SystemContext", SimpleNamespace(cached=lambda: ctx))
     monkeypatch.setattr(bootstrap, "PluginInstaller", MagicMock(return_value=installer))
     monkeypatch.setattr(
         bootstrap, "StateManager", MagicMock(return_value=SimpleNamespace(load=lambda: state))
@@ -83,7 +83,7 @@ def test_bootstrap_aborts_when_ensure_omz_fails(monkeypatch, tmp_path):
     monkeypatch.setattr(bootstrap, "install_core_packages", lambda os_id: None)
     monkeypatch.setattr(bootstrap, "setup_venv", lambda project_dir: tmp_path / ".venv")
     monkeypatch.setattr(bootstrap.subprocess, "run", MagicMock())
-    monkeypatch.setattr(bootstrap, "SystemContext", lambda: ctx)
+    monkeypatch.setattr(bootstrap, "SystemContext", SimpleNamespace(cached=lambda: ctx))
     monkeypatch.setattr(bootstrap, "PluginInstaller", MagicMock(return_value=installer))
     monkeypatch.setattr(
         bootstrap, "StateManager", MagicMock(return_value=SimpleNamespace(load=lambda: state))
@@ -113,7 +113,7 @@ def test_bootstrap_sync_themes_and_apply_config(monkeypatch, tmp_path):
     monkeypatch.setattr(bootstrap, "install_core_packages", lambda os_id: None)
     monkeypatch.setattr(bootstrap, "setup_venv", lambda project_dir: tmp_path / ".venv")
     monkeypatch.setattr(bootstrap.subprocess, "run", MagicMock())
-    monkeypatch.setattr(bootstrap, "SystemContext", lambda: ctx)
+    monkeypatch.setattr(bootstrap, "SystemContext", SimpleNamespace(cached=lambda: ctx))
     monkeypatch.setattr(bootstrap, "PluginInstaller", MagicMock(return_value=installer))
     monkeypatch.setattr(
         bootstrap, "StateManager", MagicMock(return_value=SimpleNamespace(load=lambda: state))
@@ -164,3 +164,31 @@ def test_install_script_separation_smoke_does_not_write_shell_files(tmp_path):
     assert not (home / ".zshrc").exists()
     assert not (home / ".oh-my-zsh" / "custom" / "themes").exists()
     assert not (home / ".config" / "omega-zsh").exists()
+
+
+def test_bootstrap_passes_jobs_and_repo_ttl_to_plugin_installer(monkeypatch, tmp_path):
+    ctx = _ctx(tmp_path)
+    state = SimpleNamespace(selected_plugins=[])
+    installer = MagicMock()
+    installer.ensure_omz.return_value = True
+    installer.install_all_result.return_value = SimpleNamespace(ok=True)
+    installer_cls = MagicMock(return_value=installer)
+
+    monkeypatch.setattr(
+        sys, "argv", ["bootstrap", "--unattended", "--jobs", "2", "--repo-ttl", "60"]
+    )
+    monkeypatch.setattr(bootstrap, "detect_os", lambda: "debian")
+    monkeypatch.setattr(bootstrap, "install_core_packages", lambda os_id: None)
+    monkeypatch.setattr(bootstrap, "setup_venv", lambda project_dir: tmp_path / ".venv")
+    monkeypatch.setattr(bootstrap.subprocess, "run", MagicMock())
+    monkeypatch.setattr(bootstrap, "SystemContext", SimpleNamespace(cached=lambda: ctx))
+    monkeypatch.setattr(bootstrap, "PluginInstaller", installer_cls)
+    monkeypatch.setattr(
+        bootstrap, "StateManager", MagicMock(return_value=SimpleNamespace(load=lambda: state))
+    )
+
+    bootstrap.main()
+
+    installer_cls.assert_called_once_with(
+        installer_cls.call_args[0][0], ctx.home, jobs=2, repo_ttl=60
+    )
@@ -1,3 +1,4 @@
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -153,3 +154,83 @@ def test_install_all_keeps_bool_compatibility(tmp_path):
     installer = PluginInstaller(platform, home_dir=tmp_path)
 
     assert installer.install_all(["zoxide"], lambda message: None)
+
+
+def test_install_all_result_clones_git_plugins_in_parallel(tmp_path, monkeypatch):
+    monkeypatch.setitem(EXTERNAL_URLS, "zsh-autosuggestions", "https://example.invalid/a.git")
+    monkeypatch.setitem(EXTERNAL_URLS, "zsh-syntax-highlighting", "https://example.invalid/b.git")
+    platform = MockPlatform()
+    platform.pkg_mgr = "apt-get"
+    install_threads = []
+    platform.install_package = MagicMock(
+        side_effect=lambda package, on_progress=None: (
+            install_threads.append(threading.current_thread()) or True
+        )
+    )
+    installer = PluginInstaller(platform, home_dir=tmp_path, jobs=4)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_clone(url, target, on_progress):
+        barrier.wait()  # Ambos clones deben estar en curso a la vez
+        on_progress(f"[git] cloned {url}")
+        return "b.git" not in url
+
+    installer._git_clone = fake_clone
+    messages = []
+
+    result = installer.install_all_result(
+        ["zsh-syntax-highlighting", "zoxide", "git", "zsh-autosuggestions"], messages.append
+    )
+
+    assert result.installed == ["zoxide", "zsh-autosuggestions"]
+    assert result.failed == ["zsh-syntax-highlighting"]
+    assert result.skipped == ["git"]
+    assert install_threads == [threading.main_thread()]
+    assert "[zsh-autosuggestions] [git] cloned https://example.invalid/a.git" in messages
+    assert messages[-1] == "Fallaron: zsh-syntax-highlighting"
+
+
+def test_install_all_result_batches_binary_packages(tmp_path):
+    platform = MockPlatform()
+    platform.pkg_mgr = "apt-get"
+    platform.install_packages = MagicMock(return_value={"zoxide": True, "fd-find": False})
+    installer = PluginInstaller(platform, home_dir=tmp_path)
+
+    result = installer.install_all_result(["zoxide", "git", "fd"], lambda message: None)
+
+    platform.install_packages.assert_called_once()
+    assert platform.install_packages.call_args[0][0] == ["zoxide", "fd-find"]
+    assert result.installed == ["zoxide"]
+    assert result.failed == ["fd"]
+
+
+def test_get_missing_binaries_prefers_installed_package_list(tmp_path, monkeypatch):
+    platform = MockPlatform()
+    platform.pkg_mgr = "apt-get"
+    platform.installed_packages = MagicMock(return_value=frozenset({"fd-find", "ripgrep"}))
+    monkeypatch.setenv("PATH", str(tmp_path / "empty-bin"))
+    installer = PluginInstaller(platform, home_dir=tmp_path)
+
+    missing = installer.get_missing_binaries(["fd", "ripgrep", "zoxide", "git"])
+
+    assert missing == ["zoxide"]
+    platform.installed_packages.assert_called_once()
+
+
+def test_install_all_result_logs_repo_freshness_decision(tmp_path):
+    platform = MockPlatform()
+    platform.pkg_mgr = "pacman"
+    platform.update_repos_if_stale = MagicMock(
+        return_value={"action": "skipped", "age_seconds": 42.0, "ttl_seconds": 3600}
+    )
+    platform.install_packages = MagicMock(return_value={"zoxide": True})
+    installer = PluginInstaller(platform, home_dir=tmp_path, repo_ttl=3600)
+    messages = []
+
+    installer.install_all_result(["zoxide"], messages.append)
+
+    platform.update_repos_if_stale.assert_called_once_with(3600)
+    log = (tmp_path / ".omega-zsh" / "logs" / "update-repos.log").read_text(encoding="utf-8")
+    assert "action=skipped" in log
+    assert "age=42s" in log
+    assert any("se omite update" in message for message in messages)
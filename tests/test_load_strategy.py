@@ -0,0 +1,65 @@
+from dataclasses import replace
+
+from omega_zsh.core.apply import build_config_context, render_config
+from omega_zsh.core.constants import default_load_strategy, load_strategy
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.fork_budget import analyze_fork_budget
+from omega_zsh.core.state import AppState, normalize_app_state
+
+
+def test_default_strategy_follows_startup_impact():
+    assert default_load_strategy("git") == "eager"
+    assert default_load_strategy("zsh-syntax-highlighting") == "eager"
+    assert default_load_strategy("zsh-autosuggestions") == "eager"
+    assert default_load_strategy("zsh-navigation-tools") == "deferred"
+    assert default_load_strategy("zsh-completions") == "eager"
+
+
+def test_overrides_are_validated():
+    assert load_strategy("zsh-autosuggestions", {"zsh-autosuggestions": "eager"}) == "eager"
+    assert load_strategy("k", {"k": "on-first-use"}) == "on-first-use"
+    assert load_strategy("git", {"git": "on-first-use"}) == "deferred"
+    assert load_strategy("zsh-completions", {"zsh-completions": "deferred"}) == "eager"
+    state = normalize_app_state(
+        {"plugin_load_strategies": {"K": "on-first-use", "git": "later", "fzf-tab": 3}}
+    )
+    assert state.plugin_load_strategies == {"k": "on-first-use"}
+
+
+def test_render_defers_heavy_plugins_until_after_first_prompt(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+    state = AppState(
+        selected_plugins=["zsh-syntax-highlighting", "git", "zsh-autosuggestions", "k"],
+        selected_header="none",
+        plugin_load_strategies={
+            "k": "on-first-use",
+            "zsh-autosuggestions": "deferred",
+            "zsh-syntax-highlighting": "deferred",
+        },
+    )
+
+    data = build_config_context(context, state)
+    content = render_config(context, state)
+
+    assert data["eager_plugins"] == ["git"]
+    assert data["deferred_plugins"] == ["zsh-autosuggestions", "zsh-syntax-highlighting"]
+    assert "plugins=(git )" in content
+    assert "_omega_deferred_plugins=(zsh-autosuggestions zsh-syntax-highlighting )" in content
+    assert "add-zle-hook-widget line-init _omega_load_deferred" in content
+    assert "function k() {" in content
+    assert content.index('"$ZSH/plugins/k"') < content.index('source "$ZSH/oh-my-zsh.sh"')
+    zero_fork = render_config(context, replace(state, zero_fork=True))
+    assert analyze_fork_budget(zero_fork)["forks"] == 0
+
+
+def test_all_eager_render_has_no_deferred_section(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+    state = AppState(
+        selected_plugins=["git", "zsh-autosuggestions"],
+        plugin_load_strategies={"zsh-autosuggestions": "eager"},
+    )
+
+    content = render_config(context, state)
+
+    assert "plugins=(git zsh-autosuggestions )" in content
+    assert "Deferred Plugins" not in content
@@ -0,0 +1,119 @@
+import json
+
+from omega_zsh.core import manifest as manifest_module
+from omega_zsh.core.manifest import (
+    ManifestTransaction,
+    compact_manifest,
+    is_managed_file,
+    load_manifest,
+    manifest_journal_path,
+    record_managed_file,
+)
+
+
+def test_manifest_transaction_batches_records_into_one_journal_append(tmp_path, monkeypatch):
+    manifest_path = tmp_path / "manifest.json"
+    record_managed_file(manifest_path, tmp_path / ".zshrc", "config", "generated")
+    saves = []
+    real_save = manifest_module.save_manifest
+
+    def counting_save(path, data):
+        saves.append(path)
+        real_save(path, data)
+
+    monkeypatch.setattr(manifest_module, "save_manifest", counting_save)
+
+    with ManifestTransaction(manifest_path) as manifest:
+        for i in range(24):
+            link = tmp_path / f"theme-{i}.zsh-theme"
+            assert manifest.require_managed_or_absent(link, "theme_symlink")
+            manifest.record(link, "theme_symlink", "created", {"source": f"src-{i}"})
+        assert manifest.is_managed(tmp_path / "theme-3.zsh-theme", "theme_symlink")
+        assert manifest.is_managed(tmp_path / ".zshrc", "config")
+
+    assert saves == []
+    journal = manifest_journal_path(manifest_path).read_text(encoding="utf-8").splitlines()
+    assert len(journal) == 24
+    data = load_manifest(manifest_path)
+    assert len(data["files"]) == 25
+    assert is_managed_file(
+        manifest_path, tmp_path / "theme-7.zsh-theme", "theme_symlink", {"source": "src-7"}
+    )
+
+
+def test_manifest_transaction_without_changes_does_not_write(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+
+    with ManifestTransaction(manifest_path) as manifest:
+        assert manifest.get(tmp_path / ".zshrc") is None
+
+    assert not manifest_path.exists()
+
+
+def test_manifest_transaction_commits_records_when_block_raises(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+
+    try:
+        with ManifestTransaction(manifest_path) as manifest:
+            manifest.record(tmp_path / "link", "theme_symlink", "created")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    data = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert str(tmp_path / "link") in data["files"]
+
+
+def test_manifest_journal_replays_records_and_removals(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    record_managed_file(manifest_path, tmp_path / ".zshrc", "config", "generated")
+    record_managed_file(manifest_path, tmp_path / "a.bak", "backup", "created")
+    with ManifestTransaction(manifest_path) as manifest:
+        manifest.forget(tmp_path / "a.bak")
+    with open(manifest_journal_path(manifest_path), "a", encoding="utf-8") as journal:
+        journal.write('{"op": "set", "key": "trunc')
+
+    manifest_module._INDEX_CACHE.clear()
+    files = load_manifest(manifest_path)["files"]
+
+    assert set(files) == {str(tmp_path / ".zshrc")}
+    snapshot = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert str(tmp_path / "a.bak") not in snapshot["files"]
+
+
+def test_manifest_compacts_past_threshold_and_drops_pruned_backups(tmp_path, monkeypatch):
+    manifest_path = tmp_path / "manifest.json"
+    kept = tmp_path / ".zshrc.1.bak"
+    kept.write_text("keep", encoding="utf-8")
+    record_managed_file(manifest_path, kept, "backup", "created")
+    record_managed_file(manifest_path, tmp_path / ".zshrc.0.bak", "backup", "created")
+    monkeypatch.setattr(manifest_module, "JOURNAL_COMPACT_BYTES", 1)
+
+    record_managed_file(manifest_path, tmp_path / ".zshrc", "config", "generated")
+
+    assert not manifest_journal_path(manifest_path).exists()
+    files = json.loads(manifest_path.read_text(encoding="utf-8"))["files"]
+    assert set(files) == {str(kept), str(tmp_path / ".zshrc")}
+
+    record_managed_file(manifest_path, tmp_path / "x.bak", "backup", "created")
+    compact_manifest(manifest_path)
+    assert str(tmp_path / "x.bak") not in load_manifest(manifest_path)["files"]
+
+
+def test_is_managed_file_lookups_reuse_the_replayed_index(tmp_path, monkeypatch):
+    manifest_path = tmp_path / "manifest.json"
+    with ManifestTransaction(manifest_path) as manifest:
+        for i in range(20000):
+            manifest.record(tmp_path / f"file-{i}", "theme_symlink", "created")
+    reads = []
+    real_read = manifest_module._read_snapshot
+    monkeypatch.setattr(
+        manifest_module, "_read_snapshot", lambda path: reads.append(path) or real_read(path)
+    )
+
+    for i in range(0, 20000, 100):
+        assert is_managed_file(manifest_path, tmp_path / f"file-{i}", "theme_symlink")
+    record_managed_file(manifest_path, tmp_path / "new", "config", "generated")
+
+    assert is_managed_file(manifest_path, tmp_path / "new", "config")
+    assert reads == []
@@ -1,5 +1,9 @@
+import os
+import subprocess
+import time
 from unittest.mock import patch
 
+from omega_zsh.platforms.arch import ArchPlatform
 from omega_zsh.platforms.debian import DebianPlatform
 from omega_zsh.platforms.termux import TermuxPlatform
 
@@ -58,3 +62,124 @@ def test_debian_install_command_nala():
         call_args = mock_popen.call_args[0][0]
         assert "nala" in call_args
         assert "install" in call_args
+
+
+def test_debian_install_packages_uses_one_transaction():
+    plat = DebianPlatform(use_nala=False)
+
+    with patch.object(plat, "_run_command", return_value=True) as run:
+        results = plat.install_packages(["fd", "bat", "fd"])
+
+    assert results == {"fd": True, "bat": True}
+    run.assert_called_once()
+    cmd = run.call_args[0][0]
+    assert cmd[-2:] == ["fd-find", "bat"]
+    assert "install" in cmd
+
+
+def test_arch_install_packages_falls_back_per_package_on_batch_failure():
+    plat = ArchPlatform()
+    commands = []
+
+    def run(cmd, on_progress=None):
+        commands.append(cmd)
+        return len(cmd) == 6 and cmd[-1] != "eza"
+
+    with patch.object(plat, "_run_command", side_effect=run):
+        results = plat.install_packages(["bat", "eza"])
+
+    assert results == {"bat": True, "eza": False}
+    assert commands[0][-2:] == ["bat", "eza"]
+    assert [cmd[-1] for cmd in commands[1:]] == ["bat", "eza"]
+
+
+def test_termux_install_packages_keeps_lolcat_out_of_pkg_batch():
+    plat = TermuxPlatform()
+    commands = []
+
+    def run(cmd, on_progress=None):
+        commands.append(cmd)
+        return True
+
+    with patch.object(plat, "_run_command", side_effect=run):
+        with patch("omega_zsh.platforms.termux.which", return_value="/usr/bin/gem"):
+            results = plat.install_packages(["lolcat", "fzf", "bat"])
+
+    assert list(results) == ["lolcat", "fzf", "bat"]
+    assert all(results.values())
+    assert commands == [
+        ["pkg", "install", "-y", "fzf", "bat"],
+        ["gem", "install", "lolcat", "--no-document"],
+    ]
+
+
+def test_installed_packages_runs_one_query_per_session(monkeypatch):
+    from omega_zsh.platforms import base
+
+    monkeypatch.setattr(base, "_INSTALLED_PACKAGES_CACHE", {})
+    output = "installed fd-find\nconfig-files zoxide\ninstalled bat\n"
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=output)
+
+    monkeypatch.setattr(base.subprocess, "run", fake_run)
+
+    assert DebianPlatform().installed_packages() == {"fd-find", "bat"}
+    assert DebianPlatform(use_nala=True).installed_packages() == {"fd-find", "bat"}
+    assert calls[0][0] == "dpkg-query"
+    assert len(calls) == 1
+
+
+def test_termux_and_arch_parse_installed_package_lists():
+    listing = "Listing... Done\nzsh/stable,now 5.9 aarch64 [installed]\nfd/stable 10.1 aarch64\n"
+
+    assert TermuxPlatform()._parse_installed_packages(listing) == {"zsh", "fd"}
+    assert ArchPlatform()._parse_installed_packages("zsh\nbat\n") == {"zsh", "bat"}
+
+
+def test_update_repos_if_stale_skips_fresh_lists_and_refreshes_old_ones(tmp_path):
+    lists = tmp_path / "lists"
+    lists.mkdir()
+    plat = DebianPlatform()
+    plat.package_lists_paths = lambda: [lists]
+
+    with patch.object(plat, "_run_command", return_value=True) as update:
+        fresh = plat.update_repos_if_stale(ttl_seconds=3600)
+        update.assert_not_called()
+
+        stamp = time.time() - 7200
+        os.utime(lists, (stamp, stamp))
+        stale = plat.update_repos_if_stale(ttl_seconds=3600)
+
+    assert fresh["action"] == "skipped"
+    assert stale["action"] == "updated"
+    assert stale["age_seconds"] >= 7200
+    update.assert_called_once()
+    assert "update" in update.call_args.args[0]
+
+
+def test_stale_lists_never_trigger_a_system_upgrade(tmp_path):
+    commands = []
+
+    def run(cmd, on_progress=None):
+        commands.append(cmd)
+        return True
+
+    for plat in (ArchPlatform(), TermuxPlatform(), TermuxPlatform(use_nala=True)):
+        plat.package_lists_paths = lambda: []
+        with patch.object(plat, "_run_command", side_effect=run):
+            decision = plat.update_repos_if_stale(ttl_seconds=3600)
+        assert decision["action"] == ("manual" if isinstance(plat, ArchPlatform) else "updated")
+
+    assert commands == [["pkg", "update"], ["nala", "update"]]
+    assert not any("upgrade" in cmd or "-Syu" in cmd for cmd in commands)
+
+
+def test_package_list_paths_ignore_pkgcache(monkeypatch):
+    monkeypatch.setenv("PREFIX", "/prefix")
+
+    for plat in (DebianPlatform(), TermuxPlatform()):
+        paths = [path.name for path in plat.package_lists_paths()]
+        assert paths == ["lists", "update-success-stamp"]
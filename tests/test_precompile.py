@@ -0,0 +1,103 @@
+import os
+
+from omega_zsh.core.apply import apply_config, render_config
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.manifest import ManifestTransaction
+from omega_zsh.core.precompile import zcompile_targets
+from omega_zsh.core.shell import zcompile_files, zcompile_is_fresh, zwc_path
+from omega_zsh.core.state import AppState
+
+
+def _fake_zsh(tmp_path, fake_bin):
+    """A `zsh` that 'compiles' by touching `<file>.zwc` and logs each invocation."""
+    calls = tmp_path / "zsh-calls"
+    fake_bin("zsh", f'echo "$@" >> "{calls}"\nshift 4\nfor f; do : > "$f.zwc"; done\n')
+    return calls
+
+
+def _omz(home):
+    omz = home / ".oh-my-zsh"
+    (omz / "lib").mkdir(parents=True)
+    (omz / "oh-my-zsh.sh").write_text("# omz\n", encoding="utf-8")
+    for name in ("git.zsh", "history.zsh"):
+        (omz / "lib" / name).write_text("# lib\n", encoding="utf-8")
+    plugin = omz / "custom" / "plugins" / "zsh-autosuggestions"
+    plugin.mkdir(parents=True)
+    (plugin / "zsh-autosuggestions.plugin.zsh").write_text("# plugin\n", encoding="utf-8")
+    (plugin / "zsh-autosuggestions.zsh").write_text("# impl\n", encoding="utf-8")
+    (omz / "plugins" / "git").mkdir(parents=True)
+    (omz / "plugins" / "git" / "git.plugin.zsh").write_text("# git\n", encoding="utf-8")
+    (omz / "themes").mkdir()
+    (omz / "themes" / "robbyrussell.zsh-theme").write_text("# theme\n", encoding="utf-8")
+    return omz
+
+
+def test_zcompile_files_batches_stale_scripts_into_few_processes(tmp_path, fake_bin):
+    calls = _fake_zsh(tmp_path, fake_bin)
+    scripts = []
+    for index in range(5):
+        script = tmp_path / f"s{index}.zsh"
+        script.write_text("# s\n", encoding="utf-8")
+        scripts.append(script)
+
+    compiled = zcompile_files(scripts, jobs=2)
+
+    assert sorted(compiled) == sorted(zwc_path(script) for script in scripts)
+    assert len(calls.read_text(encoding="utf-8").splitlines()) == 2
+    assert zcompile_files(scripts, jobs=2) == []
+
+    stale_zwc = zwc_path(scripts[0])
+    os.utime(stale_zwc, (scripts[0].stat().st_mtime - 10,) * 2)
+    assert not zcompile_is_fresh(scripts[0])
+    assert zcompile_files(scripts, jobs=2) == [stale_zwc]
+
+
+def test_zcompile_files_without_zsh_is_a_no_op(tmp_path, monkeypatch):
+    script = tmp_path / "a.zsh"
+    script.write_text("# a\n", encoding="utf-8")
+    monkeypatch.setattr("omega_zsh.core.shell.which", lambda command: None)
+
+    assert zcompile_files([script]) == []
+    assert not zwc_path(script).exists()
+
+
+def test_zcompile_targets_follow_selected_plugins_and_themes(tmp_path):
+    home = tmp_path / "home"
+    omz = _omz(home)
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["git", "zsh-autosuggestions", "zoxide"])
+
+    targets = zcompile_targets(context, state)
+
+    assert targets == [
+        omz / "oh-my-zsh.sh",
+        omz / "lib" / "git.zsh",
+        omz / "lib" / "history.zsh",
+        omz / "plugins" / "git" / "git.plugin.zsh",
+        omz / "custom" / "plugins" / "zsh-autosuggestions" / "zsh-autosuggestions.plugin.zsh",
+        omz / "custom" / "plugins" / "zsh-autosuggestions" / "zsh-autosuggestions.zsh",
+        omz / "themes" / "robbyrussell.zsh-theme",
+    ]
+
+
+def test_apply_compiles_startup_files_and_records_them(tmp_path, monkeypatch, fake_bin):
+    _fake_zsh(tmp_path, fake_bin)
+    home = tmp_path / "home"
+    omz = _omz(home)
+    context = SystemContext(home=home, env={"ZSH": str(omz)})
+    state = AppState(selected_plugins=["git"], selected_header="none")
+    monkeypatch.setattr("omega_zsh.core.generator.validate_zsh_syntax", lambda path: (True, "ok"))
+
+    result = apply_config(context, state)
+
+    assert result.ok
+    assert "zcompile" not in render_config(context, state)
+    manifest = ManifestTransaction(context.omega_dir / "manifest.json")
+    manifest.load()
+    for source in (
+        context.zshrc_path,
+        omz / "lib" / "git.zsh",
+        omz / "plugins" / "git" / "git.plugin.zsh",
+    ):
+        assert zcompile_is_fresh(source)
+        assert manifest.get(zwc_path(source))["kind"] == "zcompile"
@@ -1,5 +1,8 @@
 import os
+import shutil
+from pathlib import Path
 
+from omega_zsh.core.backup import create_backup
 from omega_zsh.core.context import SystemContext
 from omega_zsh.core.recovery import (
     cleanup_shell_files,
@@ -27,6 +30,11 @@ def test_recovery_restore_latest_valid_zshrc_backup(tmp_path, monkeypatch):
     assert result.ok
     assert str(current) in result.changed
     assert result.backups
+    # El método de copia queda visible en el resultado.
+    methods = ("(reflink)", "(copy_file_range)", "(copy2)")
+    assert any(message.startswith("Backed up") for message in result.messages)
+    restored = [message for message in result.messages if message.startswith("Restored")]
+    assert restored and restored[0].endswith(methods)
     assert current.read_text(encoding="utf-8") == "# restored\n"
 
 
@@ -145,3 +153,53 @@ def test_recovery_dry_run_does_not_modify_files(tmp_path):
     assert "Would remove Omega references" in "\n".join(result.messages)
     assert zshrc.read_text(encoding="utf-8") == "# omega-zsh\n"
     assert not (home / ".omega-zsh-recovery").exists()
+
+
+def test_recovery_snapshots_survive_removing_omega_backups(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    (home / ".zshrc").write_text("# mine\n", encoding="utf-8")
+    monkeypatch.setattr("omega_zsh.core.recovery.validate_zsh_syntax", lambda path: (True, "ok"))
+    context = SystemContext(home=home, env={})
+
+    result = nuclear_fix_shell(context)
+    shutil.rmtree(home / ".omega-backups", ignore_errors=True)
+
+    snapshot = Path(next(path for path in result.backups if ".zshrc." in path))
+    assert snapshot.parent == home / ".omega-zsh-recovery"
+    assert snapshot.read_text(encoding="utf-8") == "# mine\n"
+
+
+def test_recovery_keeps_older_copy_when_newest_duplicate_vanished(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    zshrc = home / ".zshrc"
+    zshrc.write_text("# same\n", encoding="utf-8")
+    backup_dir = home / ".omega-backups"
+    older = create_backup(zshrc, backup_dir)
+    newer = create_backup(zshrc, backup_dir)
+    monkeypatch.setattr("omega_zsh.core.recovery.validate_zsh_syntax", lambda path: (True, "ok"))
+    newer.unlink()
+
+    assert list_zshrc_backups(SystemContext(home=home, env={})) == [older]
+
+
+def test_restore_drops_the_compiled_zshrc_of_the_replaced_config(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    backup_dir = home / ".omega-backups"
+    backup_dir.mkdir(parents=True)
+    selected = backup_dir / ".zshrc.20010101-000000.bak"
+    selected.write_text("# working\n", encoding="utf-8")
+    os.utime(selected, (978307200, 978307200))
+    current = home / ".zshrc"
+    current.write_text("# broken\n", encoding="utf-8")
+    compiled = home / ".zshrc.zwc"
+    compiled.write_bytes(b"compiled broken config")
+    context = SystemContext(home=home, env={})
+    monkeypatch.setattr("omega_zsh.core.recovery.validate_zsh_syntax", lambda path: (True, ""))
+
+    assert restore_zshrc_backup(selected, context).ok
+
+    # zsh cargaría el .zwc, más nuevo que el .zshrc restaurado con su mtime original.
+    assert current.read_text(encoding="utf-8") == "# working\n"
+    assert not compiled.exists()
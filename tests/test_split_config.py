@@ -0,0 +1,69 @@
+from omega_zsh.core.apply import apply_config, render_config, split_config_paths
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.manifest import ManifestTransaction
+from omega_zsh.core.state import AppState, apply_preset, normalize_app_state
+
+
+def _context(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    omz = home / ".oh-my-zsh"
+    (omz / "custom" / "themes").mkdir(parents=True)
+    (omz / "oh-my-zsh.sh").write_text("# omz\n", encoding="utf-8")
+    monkeypatch.setattr("omega_zsh.core.shell.which", lambda command: None)
+    return SystemContext(home=home, env={"ZSH": str(omz)})
+
+
+def test_split_config_moves_environment_out_of_zshrc(tmp_path):
+    context = SystemContext(home=tmp_path / "home", env={})
+
+    joined = render_config(context, AppState(selected_header="none"))
+    split = render_config(context, AppState(selected_header="none", split_config=True))
+
+    assert 'export PATH="$HOME/.local/bin:$PATH"' in joined
+    assert "export EDITOR='nano'" in joined
+    assert "export PATH=" not in split
+    assert "export EDITOR=" not in split
+
+
+def test_apply_writes_and_records_split_files(tmp_path, monkeypatch):
+    context = _context(tmp_path, monkeypatch)
+    state = AppState(selected_plugins=["git"], selected_header="none", split_config=True)
+    zshenv, zprofile = split_config_paths(context)
+
+    result = apply_config(context, state)
+
+    assert result.ok
+    assert result.changed[:2] == [str(zshenv), str(zprofile)]
+    assert "export EDITOR='nano'" in zshenv.read_text(encoding="utf-8")
+    assert "skip_global_compinit=1" in zshenv.read_text(encoding="utf-8")
+    assert 'path=("$HOME/.local/bin" $path)' in zprofile.read_text(encoding="utf-8")
+    manifest = ManifestTransaction(context.omega_dir / "manifest.json")
+    manifest.load()
+    for path in (zshenv, zprofile, context.zshrc_path):
+        assert manifest.get(path)["kind"] == "config"
+
+    assert apply_config(context, state).unchanged
+    zshenv.write_text("# edited by hand\n", encoding="utf-8")
+    assert not apply_config(context, state).unchanged
+    assert "edited by hand" not in zshenv.read_text(encoding="utf-8")
+    assert list((context.home / ".omega-backups").glob(".zshenv.*"))
+
+
+def test_apply_keeps_environment_in_zshrc_when_user_owns_zshenv(tmp_path, monkeypatch):
+    context = _context(tmp_path, monkeypatch)
+    zshenv, zprofile = split_config_paths(context)
+    zshenv.write_text("export MINE=1\n", encoding="utf-8")
+
+    result = apply_config(context, AppState(selected_header="none", split_config=True))
+
+    assert result.ok
+    assert any(".zshenv" in warning for warning in result.warnings)
+    assert zshenv.read_text(encoding="utf-8") == "export MINE=1\n"
+    assert not zprofile.exists()
+    assert "export EDITOR='nano'" in context.zshrc_path.read_text(encoding="utf-8")
+
+
+def test_split_config_survives_normalize_and_presets():
+    assert normalize_app_state({"split_config": True}).split_config is True
+    assert normalize_app_state({"split_config": "yes"}).split_config is False
+    assert apply_preset("fast", AppState(split_config=True)).split_config is True
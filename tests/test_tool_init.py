@@ -0,0 +1,41 @@
+import os
+import time
+
+from omega_zsh.core.apply import render_config
+from omega_zsh.core.context import SystemContext
+from omega_zsh.core.state import AppState
+from omega_zsh.core.tool_init import refresh_tool_init_cache, tool_init_cache_dir
+
+
+def _fake_zoxide(tmp_path, fake_bin):
+    counter = tmp_path / "calls"
+    zoxide = fake_bin("zoxide", f'echo x >> "{counter}"\necho "# zoxide hook"\n', system_path=False)
+    return zoxide, counter
+
+
+def test_refresh_tool_init_cache_runs_hook_only_when_binary_changes(tmp_path, fake_bin):
+    zoxide, counter = _fake_zoxide(tmp_path, fake_bin)
+    omega_dir = tmp_path / ".omega-zsh"
+    cache = tool_init_cache_dir(omega_dir) / "zoxide.zsh"
+
+    assert refresh_tool_init_cache(omega_dir, ["zoxide", "eza"]) == [cache]
+    assert cache.read_text(encoding="utf-8") == "# zoxide hook\n"
+    assert refresh_tool_init_cache(omega_dir, ["zoxide"]) == []
+
+    stamp = time.time() + 10
+    os.utime(zoxide, (stamp, stamp))
+    assert refresh_tool_init_cache(omega_dir, ["zoxide"]) == [cache]
+    assert len(counter.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_render_sources_cached_init_instead_of_eval_on_every_start(tmp_path):
+    home = tmp_path / "home"
+    context = SystemContext(home=home, env={"ZSH": str(home / ".oh-my-zsh")})
+    state = AppState(selected_plugins=["zoxide"])
+
+    content = render_config(context, state)
+
+    cache = tool_init_cache_dir(home / ".omega-zsh") / "zoxide.zsh"
+    assert f'_omega_init="{cache}"' in content
+    assert 'source "$_omega_init"' in content
+    assert '"$commands[zoxide]" -nt "$_omega_init"' in content
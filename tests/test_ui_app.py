@@ -218,9 +218,11 @@ def test_plugin_select_status_labels(tmp_path, monkeypatch):
     context.omz_dir = tmp_path / ".oh-my-zsh"
     (context.omz_dir / "custom" / "plugins" / "zsh-autosuggestions").mkdir(parents=True)
     screen = PluginSelectScreen([], [], [])
-    monkeypatch.setattr(
-        "omega_zsh.ui.screens.shutil.which", lambda cmd: "/bin/fd" if cmd == "fdfind" else None
-    )
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "fdfind").write_text("#!/bin/sh\n", encoding="utf-8")
+    (bin_dir / "fdfind").chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
 
     assert "installed" in screen._label_for("zsh-autosuggestions", context)
     assert "impact: medium" in screen._label_for("zsh-autosuggestions", context)
@@ -53,6 +53,19 @@ def test_save_state_preserves_allowed_custom_plugins(mock_app):
     assert saved_state.allowed_custom_plugins == ["mi-plugin"]
 
 
+def test_save_state_keeps_fields_without_tui_controls(mock_app):
+    mock_app.state.zero_fork = True
+    mock_app.state.plugin_load_strategies = {"zsh-autosuggestions": "eager"}
+    mock_app.state.header_cache_ttl = 120
+
+    mock_app.save_state()
+
+    saved_state = mock_app.state_manager.save.call_args.args[0]
+    assert saved_state.zero_fork is True
+    assert saved_state.plugin_load_strategies == {"zsh-autosuggestions": "eager"}
+    assert saved_state.header_cache_ttl == 120
+
+
 def test_apply_action_reports_structured_core_failure(mock_app):
     with patch("omega_zsh.ui.app.apply_config") as mock_apply:
         mock_apply.return_value.ok = False
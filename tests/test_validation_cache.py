@@ -0,0 +1,137 @@
+import json
+from pathlib import Path
+
+from omega_zsh.core.generator import ConfigGenerator
+from omega_zsh.core.validation_cache import ValidationCache, validation_cache_path
+
+
+def _fake_zsh(fake_bin, name="bin"):
+    fake_bin("zsh", f"# {name}\nexit 0\n", directory=name)
+
+
+def _counting_validator(verdicts):
+    calls = []
+
+    def validator(path):
+        calls.append(path)
+        return verdicts.get(path.read_text(encoding="utf-8"), (True, "zsh syntax ok"))
+
+    return validator, calls
+
+
+def test_cache_skips_zsh_for_known_content_and_zsh_build(tmp_path, fake_bin):
+    _fake_zsh(fake_bin)
+    script = tmp_path / "script.zsh"
+    validator, calls = _counting_validator({"if\n": (False, "parse error")})
+    cache = ValidationCache.for_omega_dir(tmp_path / ".omega-zsh")
+
+    script.write_text("echo hi\n", encoding="utf-8")
+    assert cache.validate(script, validator) == (True, "zsh syntax ok")
+    assert cache.validate(script, validator) == (True, "zsh syntax ok")
+    script.write_text("if\n", encoding="utf-8")
+    assert cache.validate(script, validator) == (False, "parse error")
+    assert len(calls) == 2
+
+    # Persistente entre instancias; otro binario de zsh invalida el veredicto.
+    fresh = ValidationCache(validation_cache_path(tmp_path / ".omega-zsh"))
+    assert fresh.validate(script, validator) == (False, "parse error")
+    assert len(calls) == 2
+    _fake_zsh(fake_bin, name="other-bin")
+    fresh.validate(script, validator)
+    assert len(calls) == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path, fake_bin):
+    _fake_zsh(fake_bin)
+    validator, calls = _counting_validator({})
+    cache = ValidationCache(tmp_path / "validation.json", max_entries=2)
+    scripts = []
+    for name in ("a", "b", "c"):
+        script = tmp_path / f"{name}.zsh"
+        script.write_text(f"echo {name}\n", encoding="utf-8")
+        scripts.append(script)
+    a, b, c = scripts
+
+    cache.validate(a, validator)
+    cache.validate(b, validator)
+    cache.validate(a, validator)
+    cache.validate(c, validator)
+    assert len(calls) == 3
+    assert len(json.loads((tmp_path / "validation.json").read_text(encoding="utf-8"))) == 2
+
+    cache.validate(a, validator)
+    assert len(calls) == 3
+    cache.validate(b, validator)
+    assert calls[-1] == b
+
+
+def test_cache_is_bypassed_without_zsh(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    script = tmp_path / "script.zsh"
+    script.write_text("echo hi\n", encoding="utf-8")
+    validator, calls = _counting_validator({})
+    cache = ValidationCache.for_omega_dir(tmp_path / ".omega-zsh")
+
+    cache.validate(script, validator)
+    cache.validate(script, validator)
+
+    assert len(calls) == 2
+    assert not cache.path.exists()
+
+
+def test_generator_validates_identical_output_once(tmp_path, monkeypatch, fake_bin):
+    _fake_zsh(fake_bin)
+    home = tmp_path / "home"
+    home.mkdir()
+    validator, calls = _counting_validator({})
+    monkeypatch.setattr("omega_zsh.core.generator.validate_zsh_syntax", validator)
+    templates = Path(__file__).parent.parent / "omega_zsh" / "assets" / "templates"
+    generator = ConfigGenerator(templates)
+
+    for _ in range(3):
+        assert generator.generate_config_file(home / ".zshrc", "echo hi\n")
+
+    assert len(calls) == 1
+    assert validation_cache_path(home / ".omega-zsh").exists()
+
+
+def test_cache_hits_reorder_in_memory_and_flush_once(tmp_path, monkeypatch, fake_bin):
+    _fake_zsh(fake_bin)
+    validator, _ = _counting_validator({})
+    cache = ValidationCache(tmp_path / "validation.json")
+    scripts = []
+    for name in ("a", "b", "c"):
+        script = tmp_path / f"{name}.zsh"
+        script.write_text(f"echo {name}\n", encoding="utf-8")
+        cache.validate(script, validator)
+        scripts.append(script)
+    saves = []
+    original_save = cache._save
+    monkeypatch.setattr(cache, "_save", lambda: (saves.append(1), original_save()))
+
+    for script in scripts:
+        cache.validate(script, validator)
+    assert saves == []
+    cache.flush()
+    cache.flush()
+
+    assert saves == [1]
+    on_disk = json.loads((tmp_path / "validation.json").read_text(encoding="utf-8"))
+    assert list(on_disk) == list(cache._load())
+
+
+def test_generator_keeps_the_cache_in_the_given_omega_dir(tmp_path, monkeypatch, fake_bin):
+    _fake_zsh(fake_bin)
+    zdotdir = tmp_path / "zdotdir"
+    zdotdir.mkdir()
+    omega_dir = tmp_path / "home" / ".omega-zsh"
+    validator, _ = _counting_validator({})
+    monkeypatch.setattr("omega_zsh.core.generator.validate_zsh_syntax", validator)
+    templates = Path(__file__).parent.parent / "omega_zsh" / "assets" / "templates"
+
+    assert ConfigGenerator(templates).generate_config_file(
+        zdotdir / ".zshrc", "echo hi\n", omega_dir=omega_dir
+    )
+
+    assert validation_cache_path(omega_dir).exists()
+    assert not validation_cache_path(zdotdir / ".omega-zsh").exists()
@@ -0,0 +1,143 @@
+import shutil
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from omega_zsh.core import shell
+from omega_zsh.core.shell import ZshWorkerError, ZshWorkerPool, validate_zsh_syntax
+
+FAKE_WORKER = textwrap.dedent(
+    """\
+    import sys, time
+    with open(sys.argv[1], "a") as log:
+        log.write("spawn\\n")
+    data = b""
+    while True:
+        chunk = sys.stdin.buffer.read1(65536)
+        if not chunk:
+            break
+        data += chunk
+        while data.count(b"\\0") >= 3:
+            request_id, kind, payload, data = data.split(b"\\0", 3)
+            status, out, err = b"0", b"", b""
+            if kind == b"syntax" and b"BROKEN" in payload:
+                status, err = b"1", b"parse error near BROKEN"
+            elif kind == b"prompt":
+                if b"slow" in payload:
+                    time.sleep(5)
+                out = b"PROMPT " + payload
+            sys.stdout.buffer.write(b"\\0".join([request_id, status, out, err]) + b"\\0")
+            sys.stdout.buffer.flush()
+    """
+)
+
+
+def _fake_zsh(tmp_path, fake_bin, body=None):
+    """`zsh` that speaks the pool protocol (a Python loop) and logs each spawn."""
+    log = tmp_path / "spawns"
+    worker = tmp_path / "worker.py"
+    worker.write_text(FAKE_WORKER, encoding="utf-8")
+    zsh = fake_bin("zsh", body or f'exec "{sys.executable}" "{worker}" "{log}"\n')
+    return str(zsh), log
+
+
+def _spawns(log):
+    return len(log.read_text(encoding="utf-8").splitlines()) if log.exists() else 0
+
+
+def test_pool_answers_many_checks_from_one_worker(tmp_path, fake_bin):
+    zsh, log = _fake_zsh(tmp_path, fake_bin)
+
+    with ZshWorkerPool(zsh_bin=zsh) as pool:
+        results = [pool.check_syntax(f"echo {index}\n") for index in range(20)]
+        broken = pool.check_syntax("if BROKEN\n")
+
+    assert results == [(True, "zsh syntax ok")] * 20
+    assert broken == (False, "parse error near BROKEN")
+    assert _spawns(log) == 1
+
+
+def test_pool_recycles_workers_on_timeout_and_request_limit(tmp_path, fake_bin):
+    zsh, log = _fake_zsh(tmp_path, fake_bin)
+
+    with ZshWorkerPool(zsh_bin=zsh, max_requests=3) as pool:
+        with pytest.raises(TimeoutError):
+            pool.render_prompt(tmp_path / "slow.zsh-theme", timeout=0.2)
+        reply = pool.render_prompt(tmp_path / "fast.zsh-theme")
+        for _ in range(4):
+            pool.check_syntax("true\n")
+
+    assert reply.ok
+    assert reply.stdout == f"PROMPT {tmp_path / 'fast.zsh-theme'}"
+    # Timeout -> worker nuevo; después, uno más al llegar a max_requests.
+    assert _spawns(log) == 3
+
+
+def test_pool_marks_itself_broken_when_zsh_does_not_speak_the_protocol(tmp_path, fake_bin):
+    zsh, _ = _fake_zsh(tmp_path, fake_bin, body="exit 0\n")
+
+    with ZshWorkerPool(zsh_bin=zsh) as pool:
+        with pytest.raises(ZshWorkerError):
+            pool.check_syntax("true\n")
+        assert pool.broken
+
+
+def test_pool_respawns_after_noisy_first_worker_and_retries_later(tmp_path, monkeypatch, fake_bin):
+    # El primer arranque escribe basura en stdout (p. ej. un ~/.cargo/env ruidoso).
+    flag = tmp_path / "noisy-once"
+    zsh, log = _fake_zsh(tmp_path, fake_bin)
+    worker = tmp_path / "worker.py"
+    body = (
+        f'#!/bin/sh\nif [ ! -e "{flag}" ]; then touch "{flag}"; echo noise; exit 0; fi\n'
+        f'exec "{sys.executable}" "{worker}" "{log}"\n'
+    )
+    Path(zsh).write_text(body, encoding="utf-8")
+
+    with ZshWorkerPool(zsh_bin=zsh) as pool:
+        assert pool.check_syntax("true\n") == (True, "zsh syntax ok")
+        assert not pool.broken
+
+    monkeypatch.setattr(shell, "ZSH_POOL_RETRY_SECONDS", 0)
+    flag.unlink()
+    Path(zsh).write_text("#!/bin/sh\nexit 0\n", encoding="utf-8")
+    with ZshWorkerPool(zsh_bin=zsh) as pool:
+        with pytest.raises(ZshWorkerError):
+            pool.check_syntax("true\n")
+        Path(zsh).write_text(body, encoding="utf-8")
+        flag.touch()
+        assert not pool.broken
+        assert pool.check_syntax("true\n") == (True, "zsh syntax ok")
+
+
+def test_worker_script_silences_startup_output():
+    script = shell._WORKER_SCRIPT
+    assert "} >/dev/null 2>&1" in script
+    assert "source ~/.cargo/env >/dev/null 2>&1" in script
+
+
+def test_validate_zsh_syntax_falls_back_to_zsh_n(tmp_path, fake_bin):
+    _fake_zsh(
+        tmp_path,
+        fake_bin,
+        body='[ "$1" = "-n" ] || exit 0\necho "bad syntax" >&2\nexit 1\n',
+    )
+    script = tmp_path / "script.zsh"
+    script.write_text("echo hi\n", encoding="utf-8")
+
+    try:
+        assert validate_zsh_syntax(script) == (False, "bad syntax")
+    finally:
+        shell.close_default_zsh_pool()
+
+
+@pytest.mark.skipif(shutil.which("zsh") is None, reason="zsh no disponible")
+def test_real_zsh_worker_matches_zsh_n(tmp_path):
+    with ZshWorkerPool() as pool:
+        assert pool.check_syntax("if true; then\n  echo ok\nfi\n")[0]
+        assert not pool.check_syntax("if true; then\n  echo ok\n")[0]
+        # noexec: nada del buffer llega a ejecutarse dentro del worker.
+        marker = tmp_path / "ran"
+        assert pool.check_syntax(f"touch {marker}\n")[0]
+        assert not marker.exists()